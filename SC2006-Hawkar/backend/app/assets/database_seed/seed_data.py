@@ -900,12 +900,18 @@ DATABASE_SEED_DATA = {
         {
             "stallID": 7,
             "stallName": "Alice's Delights",
-            "images": "http://localhost:9000/stall/7_3c48cfab_stall-image, http://localhost:9000/stall/7_29670325_stall-image, http://localhost:9000/stall/7_96e85524_stall-image, http://localhost:9000/stall/7_0197699f_stall-image, http://localhost:9000/stall/7_5179e270_stall-image",
+            "images": [
+                "http://localhost:9000/stall/7_3c48cfab_stall-image",
+                "http://localhost:9000/stall/7_29670325_stall-image",
+                "http://localhost:9000/stall/7_96e85524_stall-image",
+                "http://localhost:9000/stall/7_0197699f_stall-image",
+                "http://localhost:9000/stall/7_5179e270_stall-image",
+            ],
             "unitNumber": "01-23",
             "startTime": time(9, 0, 0),
             "endTime": time(21, 0, 0),
             "hygieneRating": "A",
-            "cuisineType": "Chinese, Indian",
+            "cuisineType": ["Chinese", "Indian"],
             "estimatedWaitTime": 15,
             "priceRange": "$5 - $8",
             "hawkerID": 14,
@@ -914,12 +920,18 @@ DATABASE_SEED_DATA = {
         {
             "stallID": 8,
             "stallName": "Bob's Gourmet",
-            "images": "http://localhost:9000/stall/8_5a9fd136_stall-image, http://localhost:9000/stall/8_fbb18120_stall-image, http://localhost:9000/stall/8_5f1ab4fa_stall-image, http://localhost:9000/stall/8_b8af80bc_stall-image, http://localhost:9000/stall/8_83f0e7f3_stall-image",
+            "images": [
+                "http://localhost:9000/stall/8_5a9fd136_stall-image",
+                "http://localhost:9000/stall/8_fbb18120_stall-image",
+                "http://localhost:9000/stall/8_5f1ab4fa_stall-image",
+                "http://localhost:9000/stall/8_b8af80bc_stall-image",
+                "http://localhost:9000/stall/8_83f0e7f3_stall-image",
+            ],
             "unitNumber": "01-23",
             "startTime": time(9, 0, 0),
             "endTime": time(21, 0, 0),
             "hygieneRating": "A",
-            "cuisineType": "Indian, Korean",
+            "cuisineType": ["Indian", "Korean"],
             "estimatedWaitTime": 15,
             "priceRange": "$10 - $15",
             "hawkerID": 15,
@@ -5,10 +5,12 @@ from sqlalchemy.orm import Session
 import services.admin as admin_services
 import services.hawker as hawker_services
 import services.review as review_services
+import services.hawkerCenter as hawkerCenter_services
+import services.storageSweeper as storageSweeper_services
+import services.responseCache as cache_services
 
 import schemas.admin as admin_schemas
 import schemas.hawker as hawker_schemas
-from controllers.review import convert_db_review_to_list
 
 
 class AdminController:
@@ -64,11 +66,21 @@ class AdminController:
         )
         if reported_reviews is None:
             raise HTTPException(status_code=404, detail="No reported reviews found")
-        for review in reported_reviews:
-            review = convert_db_review_to_list(review)
 
         return reported_reviews
 
+    def getReportedReviewsPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of reported reviews using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of reported reviews and the cursor of the next page.
+        """
+        return review_services.get_reported_reviews_page(db, limit=limit, cursor=cursor)
+
     def ignoreReportedReview(db: Session, reviewID: int):
         """Ignore a reported review by setting isReported to False.
 
@@ -80,15 +92,55 @@ class AdminController:
         Returns:
             Review: The updated review object.
         """
-        review = review_services.get_review_by_review_id(db, reviewID=reviewID)
+        review = review_services.ignore_reported_review(db, reviewID=reviewID)
         if review is None:
             raise HTTPException(status_code=404, detail="Review not found")
 
-        review.isReported = False
+        return review
 
-        db.commit()
+    def importHawkerCenters(db: Session, geojson_file=None):
+        """Import hawker centers from an NEA GeoJSON file.
 
-        return review
+        Args:
+            db (Session): Database session.
+            geojson_file (file, optional): GeoJSON file to import. Defaults to
+                the dataset shipped in assets/data.
+        Raises:
+            HTTPException: If the file is not a GeoJSON FeatureCollection.
+        Returns:
+            dict: Number of hawker centers inserted, updated and skipped.
+        """
+        try:
+            if geojson_file is None:
+                with open(hawkerCenter_services.DEFAULT_GEOJSON_PATH, "rb") as file:
+                    features = hawkerCenter_services.load_hawker_center_features(file)
+            else:
+                features = hawkerCenter_services.load_hawker_center_features(
+                    geojson_file
+                )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid GeoJSON file")
+
+        return hawkerCenter_services.import_hawker_centers(db, features)
+
+    def sweepStorage(db: Session, dryRun: bool):
+        """Delete objects in object storage that no database row references.
+
+        Args:
+            db (Session): Database session.
+            dryRun (bool): Only count the orphaned objects.
+        Returns:
+            dict: Per-bucket sweep statistics.
+        """
+        return storageSweeper_services.sweep_orphaned_objects(db, dry_run=dryRun)
+
+    def getCacheStats():
+        """Get the response cache's hits and misses per route.
+
+        Returns:
+            dict: Cache backend, size, invalidations, errors and per-route hit rates.
+        """
+        return cache_services.get_cache_stats()
 
     # ------------------------------------------------------------ #
     # -------------------- Admin (CRUD) -------------------------- #
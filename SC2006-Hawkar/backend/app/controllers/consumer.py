@@ -97,6 +97,18 @@ class ConsumerController:
 
         return consumers
 
+    def getConsumersPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of consumers using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of consumers and the cursor of the next page.
+        """
+        return consumer_services.get_consumers_page(db, limit=limit, cursor=cursor)
+
     def updateConsumer(db: Session, updated_consumer: consumer_schemas.ConsumerUpdate):
         """Update a consumer's information.
 
@@ -1,4 +1,5 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 import services.dish as dish_services
@@ -73,13 +74,24 @@ class DishController:
         Raises:
             HTTPException: If no dishes are found.
         Returns:
-            list: List of dishes for the stall.
+            list: List of MenuItems for the stall.
         """
         dishes = dish_services.get_dishes_by_stall_id(db, stallID=stallID)
         if dishes is None:
             raise HTTPException(status_code=404, detail="Dish not found")
         return dishes
 
+    async def getDishesByStallIdAsync(db: AsyncSession, stallID: int):
+        """Get all dishes for a given stall ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            stallID (int): ID of the stall.
+        Returns:
+            list: List of MenuItems for the stall.
+        """
+        return await dish_services.get_dishes_by_stall_id_async(db, stallID=stallID)
+
     def getDishByDishId(db: Session, dishID: int):
         """Get a dish by its dish ID.
 
@@ -96,6 +108,19 @@ class DishController:
             raise HTTPException(status_code=404, detail="Dish not found")
         return dish
 
+    async def getDishByDishIdAsync(db: AsyncSession, dishID: int):
+        """Get a dish by its dish ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            dishID (int): ID of the dish.
+        Raises:
+            HTTPException: If the dish is not found.
+        Returns:
+            Dish: The dish object.
+        """
+        return await dish_services.get_dish_by_dish_id_async(db, dishID=dishID)
+
     def getAllDishes(db: Session, skip: int, limit: int):
         """Get all dishes with pagination.
 
@@ -109,6 +134,18 @@ class DishController:
         dishs = dish_services.get_all_dishes(db, skip=skip, limit=limit)
         return dishs
 
+    def getDishesPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of dishes using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of dishes and the cursor of the next page.
+        """
+        return dish_services.get_dishes_page(db, limit=limit, cursor=cursor)
+
     def updateDish(db: Session, updated_dish: dish_schemas.DishUpdate):
         """Update a dish by its ID.
 
@@ -124,3 +161,53 @@ class DishController:
         if dish is None:
             raise HTTPException(status_code=404, detail="Dish not found")
         return dish
+
+    def updateDishPhoto(db: Session, dishID: int, photo: UploadFile):
+        """Replace a dish's photo with an uploaded file.
+
+        Args:
+            db (Session): Database session.
+            dishID (int): ID of the dish.
+            photo (UploadFile): Uploaded image.
+        Raises:
+            HTTPException: If the dish is not found.
+        Returns:
+            Dish: The updated dish object.
+        """
+        dish = dish_services.update_dish_photo(db, dishID, photo)
+        if dish is None:
+            raise HTTPException(status_code=404, detail="Dish not found")
+        return dish
+
+    def presignDishPhoto(db: Session, dishID: int):
+        """Mint a presigned URL to upload a dish photo to directly.
+
+        Args:
+            db (Session): Database session.
+            dishID (int): ID of the dish.
+        Raises:
+            HTTPException: If the dish is not found.
+        Returns:
+            dict: The presigned upload.
+        """
+        upload = dish_services.presign_dish_photo(db, dishID)
+        if upload is None:
+            raise HTTPException(status_code=404, detail="Dish not found")
+        return upload
+
+    def confirmDishPhoto(db: Session, dishID: int, key: str):
+        """Replace a dish's photo with an image uploaded with a presigned URL.
+
+        Args:
+            db (Session): Database session.
+            dishID (int): ID of the dish.
+            key (str): Key of the presigned upload.
+        Raises:
+            HTTPException: If the dish is not found, or the upload is invalid.
+        Returns:
+            Dish: The updated dish object.
+        """
+        dish = dish_services.confirm_dish_photo(db, dishID, key)
+        if dish is None:
+            raise HTTPException(status_code=404, detail="Dish not found")
+        return dish
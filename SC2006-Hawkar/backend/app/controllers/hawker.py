@@ -1,4 +1,5 @@
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import json
 
@@ -45,6 +46,19 @@ class HawkerController:
 
         return hawker
 
+    async def getHawkerByUserIdAsync(db: AsyncSession, userID: int):
+        """Get a hawker by their user ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            userID (int): User ID of the hawker.
+        Raises:
+            HTTPException: If the hawker is not found.
+        Returns:
+            Hawker: The hawker object.
+        """
+        return await hawker_services.get_hawker_by_user_id_async(db, userID=userID)
+
     def getHawkerByHawkerId(db: Session, hawkerID: int):
         """Get a hawker by their hawker ID.
 
@@ -62,6 +76,19 @@ class HawkerController:
 
         return hawker
 
+    async def getHawkerByHawkerIdAsync(db: AsyncSession, hawkerID: int):
+        """Get a hawker by their hawker ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            hawkerID (int): Hawker ID.
+        Raises:
+            HTTPException: If the hawker is not found.
+        Returns:
+            Hawker: The hawker object.
+        """
+        return await hawker_services.get_hawker_by_hawker_id_async(db, hawkerID=hawkerID)
+
     def getAllHawkers(db: Session, skip: int, limit: int):
         """Get all hawkers with pagination.
 
@@ -76,6 +103,18 @@ class HawkerController:
 
         return hawkers
 
+    def getHawkersPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of hawkers using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of hawkers and the cursor of the next page.
+        """
+        return hawker_services.get_hawkers_page(db, limit=limit, cursor=cursor)
+
     def updateHawker(db: Session, updated_hawker: hawker_schemas.HawkerUpdate):
         """Update a hawker's information.
 
@@ -60,6 +60,47 @@ class PromotionController:
         promotions = promotion_services.get_all_promotions(db, skip=skip, limit=limit)
         return promotions
 
+    def getActivePromotionsByHawkerCenterId(db: Session, hawkerCenterID: int):
+        """Get the promotions running now at the stalls of a hawker center.
+
+        Args:
+            db (Session): Database session.
+            hawkerCenterID (int): ID of the hawker center.
+        Returns:
+            list: List of active promotions.
+        """
+        return promotion_services.get_active_promotions_by_hawker_center_id(
+            db, hawkerCenterID=hawkerCenterID
+        )
+
+    def getActiveDeals(
+        db: Session, latitude: float, longitude: float, radius: float, limit: int
+    ):
+        """Get the promotions running now near a location.
+
+        Args:
+            db (Session): Database session.
+            latitude (float): Latitude of the search location.
+            longitude (float): Longitude of the search location.
+            radius (float): Search radius in kilometres.
+            limit (int): Maximum number of deals to return.
+        Returns:
+            list: Deals with the largest discount first, then the nearest first.
+        """
+        return promotion_services.get_active_deals(db, latitude, longitude, radius, limit)
+
+    def getPromotionsPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of promotions using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of promotions and the cursor of the next page.
+        """
+        return promotion_services.get_promotions_page(db, limit=limit, cursor=cursor)
+
     def updatePromotion(
         db: Session, updated_promotion: promotion_schemas.PromotionUpdate
     ):
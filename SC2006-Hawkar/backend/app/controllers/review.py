@@ -1,34 +1,10 @@
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 import services.review as review_services
 import schemas.review as review_schemas
 
-from services.consumer import convert_favorite_stalls_to_list
-from services.stall import convert_str_to_list
-
-
-def convert_db_review_to_list(review):
-    """Convert DB review object fields to appropriate list types for API response.
-
-    Args:
-        review: The review object from the database.
-    Returns:
-        The review object with converted fields.
-    """
-    # if review.consumer and hasattr(review.consumer, "favoriteStalls"):
-    #     review.consumer.favoriteStalls = convert_favorite_stalls_to_list(
-    #         review.consumer.favoriteStalls
-    #     )
-
-    if review.stall:
-        if hasattr(review.stall, "images"):
-            review.stall.images = convert_str_to_list(review.stall.images)
-        if hasattr(review.stall, "cuisineType"):
-            review.stall.cuisineType = convert_str_to_list(review.stall.cuisineType)
-
-    return review
-
 
 class ReviewController:
     """Controller for review-related operations, including CRUD for reviews."""
@@ -49,7 +25,22 @@ class ReviewController:
             Review: The review object.
         """
         review = review_services.get_review_by_review_id(db, reviewID=reviewID)
-        review = convert_db_review_to_list(review)
+        if review is None:
+            raise HTTPException(status_code=404, detail="Review not found")
+        return review
+
+    async def getReviewByReviewIdAsync(db: AsyncSession, reviewID: int):
+        """Get a review by its review ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            reviewID (int): ID of the review.
+        Raises:
+            HTTPException: If the review is not found.
+        Returns:
+            Review: The review object.
+        """
+        review = await review_services.get_review_by_review_id_async(db, reviewID=reviewID)
         if review is None:
             raise HTTPException(status_code=404, detail="Review not found")
         return review
@@ -68,8 +59,6 @@ class ReviewController:
         reviews = review_services.get_reviews_by_consumer_id(db, consumerID=consumerID)
         if not reviews:
             return []
-        for review in reviews:
-            review = convert_db_review_to_list(review)
         return reviews
 
     def getReviewsByStallId(db: Session, stallID: int):
@@ -84,12 +73,19 @@ class ReviewController:
             list: List of reviews.
         """
         reviews = review_services.get_reviews_by_stall_id(db, stallID=stallID)
-        if reviews == []:
-            return reviews
-        for review in reviews:
-            review = convert_db_review_to_list(review)
         return reviews
 
+    async def getReviewsByStallIdAsync(db: AsyncSession, stallID: int):
+        """Get all reviews by a stall ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            stallID (int): Stall ID.
+        Returns:
+            list: List of reviews.
+        """
+        return await review_services.get_reviews_by_stall_id_async(db, stallID=stallID)
+
     def getAllReviews(db: Session, skip: int, limit: int):
         """Get all reviews with pagination.
 
@@ -101,10 +97,20 @@ class ReviewController:
             list: List of reviews.
         """
         reviews = review_services.get_all_reviews(db, skip=skip, limit=limit)
-        for review in reviews:
-            review = convert_db_review_to_list(review)
         return reviews
 
+    def getReviewsPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of reviews using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of reviews and the cursor of the next page.
+        """
+        return review_services.get_reviews_page(db, limit=limit, cursor=cursor)
+
     def createReview(db: Session, review: review_schemas.ReviewCreate):
         """Create a new review.
 
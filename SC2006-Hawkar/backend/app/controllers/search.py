@@ -7,15 +7,16 @@ import services.search as search_services
 class SearchController:
     """Controller for handling search operations."""
 
-    def getSearchResult(db: Session, query: str):
+    def getSearchResult(db: Session, query: str, limit: int = 10):
         """Get search results for a given query string.
 
         Args:
             db (Session): Database session.
             query (str): The search query string.
+            limit (int, optional): Maximum number of results of each type.
 
         Returns:
-            list: List of search results.
+            dict: Matching hawkers, stalls, dishes and reviews, best matches first.
         """
-        results = search_services.search_all(db, query)
+        results = search_services.search_all(db, query, limit)
         return results
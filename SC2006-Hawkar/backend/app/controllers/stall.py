@@ -1,5 +1,7 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from datetime import time
 
 import services.stall as stall_services
 import services.dish as dish_services
@@ -71,6 +73,17 @@ class StallController:
             raise HTTPException(status_code=404, detail="Stall not found")
         return stall
 
+    async def getStallByHawkerIdAsync(db: AsyncSession, hawkerID: int):
+        """Get the stalls of a hawker without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            hawkerID (int): ID of the hawker.
+        Returns:
+            list: List of stalls for the hawker.
+        """
+        return await stall_services.get_stalls_by_hawker_id_async(db, hawkerID=hawkerID)
+
     def getStallByStallId(db: Session, stallID: int):
         """Get a stall by its stall ID.
 
@@ -87,19 +100,60 @@ class StallController:
             raise HTTPException(status_code=404, detail="Stall not found")
         return stall
 
-    def getAllStalls(db: Session, skip: int, limit: int):
-        """Get all stalls with pagination.
+    async def getStallByStallIdAsync(db: AsyncSession, stallID: int):
+        """Get a stall by its stall ID without blocking the event loop.
+
+        Args:
+            db (AsyncSession): Async database session.
+            stallID (int): ID of the stall.
+        Raises:
+            HTTPException: If the stall is not found.
+        Returns:
+            Stall: The stall object.
+        """
+        return await stall_services.get_stall_by_stall_id_async(db, stallID=stallID)
+
+    def getAllStalls(
+        db: Session,
+        skip: int,
+        limit: int,
+        filters: stall_schemas.StallFilter = None,
+    ):
+        """Get all stalls matching the given filters with pagination.
 
         Args:
             db (Session): Database session.
             skip (int): Number of records to skip.
             limit (int): Maximum number of records to return.
+            filters (StallFilter, optional): Filter and sort options.
         Returns:
             list: List of stalls.
         """
-        stalls = stall_services.get_all_stalls(db, skip=skip, limit=limit)
+        stalls = stall_services.get_all_stalls(
+            db, skip=skip, limit=limit, filters=filters
+        )
         return stalls
 
+    def getStallsPage(
+        db: Session,
+        limit: int,
+        cursor: str = None,
+        filters: stall_schemas.StallFilter = None,
+    ):
+        """Get one page of the stalls matching the given filters using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+            filters (StallFilter, optional): Filter and sort options.
+        Returns:
+            dict: Page of stalls and the cursor of the next page.
+        """
+        return stall_services.get_stalls_page(
+            db, limit=limit, cursor=cursor, filters=filters
+        )
+
     def getAllHawkerCenters(db: Session, skip: int, limit: int):
         """Get all hawker centers with pagination.
 
@@ -115,6 +169,30 @@ class StallController:
         )
         return hawker_centers
 
+    def getNearbyHawkerCenters(
+        db: Session,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        k: int,
+        openAt: time = None,
+    ):
+        """Get the hawker centers nearest to a location, with their open stalls.
+
+        Args:
+            db (Session): Database session.
+            latitude (float): Latitude of the search location.
+            longitude (float): Longitude of the search location.
+            radius (float): Search radius in kilometres.
+            k (int): Maximum number of hawker centers to return.
+            openAt (time, optional): Time the stalls must be open at. Defaults to now.
+        Returns:
+            list: Hawker centers nearest first, each with its distance and open stalls.
+        """
+        return stall_services.get_nearby_hawker_centers(
+            db, latitude, longitude, radius, k, time_of_day=openAt
+        )
+
     def addStall(db: Session, stall: stall_schemas.StallCreate):
         """Add a new stall.
 
@@ -146,6 +224,56 @@ class StallController:
             raise HTTPException(status_code=404, detail="Stall not found")
         return stall
 
+    def addStallImages(db: Session, stallID: int, images: list[UploadFile]):
+        """Add uploaded image files to a stall.
+
+        Args:
+            db (Session): Database session.
+            stallID (int): ID of the stall.
+            images (list[UploadFile]): Uploaded images.
+        Raises:
+            HTTPException: If the stall is not found.
+        Returns:
+            Stall: The updated stall object.
+        """
+        stall = stall_services.add_stall_images(db, stallID, images)
+        if stall is None:
+            raise HTTPException(status_code=404, detail="Stall not found")
+        return stall
+
+    def presignStallImage(db: Session, stallID: int):
+        """Mint a presigned URL to upload a stall image to directly.
+
+        Args:
+            db (Session): Database session.
+            stallID (int): ID of the stall.
+        Raises:
+            HTTPException: If the stall is not found.
+        Returns:
+            dict: The presigned upload.
+        """
+        upload = stall_services.presign_stall_image(db, stallID)
+        if upload is None:
+            raise HTTPException(status_code=404, detail="Stall not found")
+        return upload
+
+    def confirmStallImage(db: Session, stallID: int, key: str):
+        """Add an image uploaded with a presigned URL to a stall.
+
+        Args:
+            db (Session): Database session.
+            stallID (int): ID of the stall.
+            key (str): Key of the presigned upload.
+        Raises:
+            HTTPException: If the stall is not found, or the upload is invalid.
+        Returns:
+            Stall: The updated stall object.
+        """
+        stall = stall_services.confirm_stall_image(db, stallID, key)
+        if stall is None:
+            raise HTTPException(status_code=404, detail="Stall not found")
+        return stall
+
     def deleteStall(db: Session, stallID: int):
         """Delete a stall by its ID.
 
@@ -191,3 +319,15 @@ class StallController:
             list: List of liked stalls.
         """
         return likeStall_services.get_liked_stalls(db, userID)
+
+    def getLikedStallIDs(db: Session, userID: int, stallIDs: list):
+        """Find which of the given stalls a user has liked.
+
+        Args:
+            db (Session): Database session.
+            userID (int): User ID.
+            stallIDs (list): Stall IDs to check.
+        Returns:
+            list: IDs of the given stalls liked by the user, in ascending order.
+        """
+        return sorted(likeStall_services.get_liked_stall_ids(db, userID, stallIDs))
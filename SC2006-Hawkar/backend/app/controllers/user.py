@@ -1,5 +1,5 @@
 import json
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 
@@ -92,6 +92,18 @@ class UserController:
         users = user_services.get_all_users(db, skip=skip, limit=limit)
         return users
 
+    def getUsersPage(db: Session, limit: int, cursor: str = None):
+        """Get one page of users using cursor pagination.
+
+        Args:
+            db (Session): Database session.
+            limit (int): Maximum number of records to return.
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            dict: Page of users and the cursor of the next page.
+        """
+        return user_services.get_users_page(db, limit=limit, cursor=cursor)
+
     def getUserById(db: Session, userID: int):
         """Get a user by their user ID.
 
@@ -140,6 +152,56 @@ class UserController:
             raise HTTPException(status_code=404, detail="User not found")
         return user
 
+    def updateProfilePhoto(db: Session, userID: int, photo: UploadFile):
+        """Replace a user's profile photo with an uploaded file.
+
+        Args:
+            db (Session): Database session.
+            userID (int): ID of the user.
+            photo (UploadFile): Uploaded image.
+        Raises:
+            HTTPException: If the user is not found.
+        Returns:
+            User: The updated user object.
+        """
+        user = user_services.update_profile_photo(db, userID, photo)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+    def presignProfilePhoto(db: Session, userID: int):
+        """Mint a presigned URL to upload a user's profile photo to directly.
+
+        Args:
+            db (Session): Database session.
+            userID (int): ID of the user.
+        Raises:
+            HTTPException: If the user is not found.
+        Returns:
+            dict: The presigned upload.
+        """
+        upload = user_services.presign_profile_photo(db, userID)
+        if upload is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return upload
+
+    def confirmProfilePhoto(db: Session, userID: int, key: str):
+        """Replace a user's profile photo with an image uploaded with a presigned URL.
+
+        Args:
+            db (Session): Database session.
+            userID (int): ID of the user.
+            key (str): Key of the presigned upload.
+        Raises:
+            HTTPException: If the user is not found, or the upload is invalid.
+        Returns:
+            User: The updated user object.
+        """
+        user = user_services.confirm_profile_photo(db, userID, key)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
     def createUser(db: Session, new_user: user_schemas.UserCreate):
         """Create a new user.
 
@@ -1,11 +1,23 @@
-from factory.database import DatabaseFactory
+import time
+from fastapi import Request
+from factory.database import DatabaseConfig, DatabaseFactory, use_primary
 
-database = DatabaseFactory.getDatabase("sqlite")
+# Pool sizes, SQLite pragmas etc. can be set with environment variables
+database = DatabaseFactory.getDatabase(DatabaseConfig.fromEnv())
 database.connect()  # connect to database
+database.connectAsync()  # asyncio engine for async def endpoints
 
 engine = database.engine
 Base = database.Base
 SessionLocal = database.SessionLocal
+async_engine = database.asyncEngine
+AsyncSessionLocal = database.AsyncSessionLocal
+replica_engines = database.replicaEngines
+
+# Requests with these methods only read, so they may use a replica
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+# Time until which the client's reads go to the primary
+PRIMARY_UNTIL_COOKIE = "primary_until"
 
 
 # Dependency
@@ -15,3 +27,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency for async def endpoints, which must not block the event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Middleware routing each request's reads to a replica or the primary
+async def route_reads(request: Request, call_next):
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    token = use_primary.set(
+        request.method not in READ_METHODS or primary_until > time.time()
+    )
+    try:
+        response = await call_next(request)
+    finally:
+        use_primary.reset(token)
+
+    # Read your writes: replicas may lag behind the write just made
+    if replica_engines and request.method not in READ_METHODS and response.status_code < 400:
+        window = database.config.readYourWritesWindow
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            str(time.time() + window),
+            max_age=max(1, round(window)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
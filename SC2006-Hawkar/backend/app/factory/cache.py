@@ -0,0 +1,165 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+
+class CacheInterface(ABC):
+    """
+    Abstract base class defining the interface for response cache backends.
+
+    Entries are never invalidated one by one. Instead, every tag has a
+    version that is part of the keys of the entries it covers; invalidating
+    a tag increments its version, so those keys are never read again and
+    age out through their TTL or the LRU.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Abstract method to read an entry.
+
+        Returns:
+            bytes: The cached value, or None if missing or expired
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: int):
+        """
+        Abstract method to store an entry for ttl seconds.
+        """
+        pass
+
+    @abstractmethod
+    def getVersions(self, tags: list) -> list:
+        """
+        Abstract method to read the current version of each tag.
+
+        Returns:
+            list: Versions in the order of tags, 0 for tags never invalidated
+        """
+        pass
+
+    @abstractmethod
+    def invalidate(self, tags: list):
+        """
+        Abstract method to increment the version of each tag.
+        """
+        pass
+
+    def size(self) -> Optional[int]:
+        """
+        Number of entries held, or None if the backend cannot tell cheaply.
+        """
+        return None
+
+
+class MemoryCache(CacheInterface):
+    """
+    In-process implementation of the CacheInterface: an LRU of at most
+    maxEntries entries, each expiring after its TTL. Every worker process
+    has its own cache, so an invalidation only reaches the process it ran in.
+    """
+
+    def __init__(self, maxEntries: int = 1024):
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expiresAt, value = entry
+            if expiresAt <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+
+    def getVersions(self, tags: list) -> list:
+        with self.lock:
+            return [self.versions.get(tag, 0) for tag in tags]
+
+    def invalidate(self, tags: list):
+        with self.lock:
+            for tag in tags:
+                self.versions[tag] = self.versions.get(tag, 0) + 1
+
+    def size(self) -> Optional[int]:
+        return len(self.entries)
+
+
+class RedisCache(CacheInterface):
+    """
+    Implementation of the CacheInterface on a Redis-compatible server, e.g.
+    Redis, Valkey or KeyDB, shared by every worker process. Requires the
+    redis package, which is only imported when this backend is used.
+    """
+
+    def __init__(self, url: str, prefix: str = "hawkar:cache:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=1)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def getVersions(self, tags: list) -> list:
+        if not tags:
+            return []
+        versions = self.client.mget([f"{self.prefix}tag:{tag}" for tag in tags])
+        return [int(version or 0) for version in versions]
+
+    def invalidate(self, tags: list):
+        pipeline = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.incr(f"{self.prefix}tag:{tag}")
+        pipeline.execute()
+
+
+class CacheFactory:
+    """
+    Factory class for creating response cache backends.
+
+    Provides a static method to get a cache instance for a backend type.
+    """
+
+    @staticmethod
+    def getCache(type: str, url: str = None, maxEntries: int = 1024) -> Optional[CacheInterface]:
+        """
+        Creates and returns a cache instance for the specified backend type.
+
+        Args:
+            type (str): The type of backend ("memory", "redis" or "none")
+            url (str, optional): URL of the Redis-compatible server
+            maxEntries (int, optional): Size of the in-process LRU
+
+        Returns:
+            CacheInterface: An instance of the matching cache implementation,
+                            or None if caching is disabled
+        """
+        match type:
+            case "memory":
+                return MemoryCache(maxEntries)
+            case "redis":
+                return RedisCache(url)
+            case "none":
+                return None
+            case _:
+                return MemoryCache(maxEntries)  # default
@@ -0,0 +1,320 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+
+class SearchInterface(ABC):
+    """
+    Abstract base class defining the interface for database full-text search.
+
+    Implementations keep a full-text index of hawker names, stall names and
+    cuisines, dish names and review text inside the database itself. Triggers
+    keep the index up to date, so every worker process shares the same index
+    and no application code has to maintain it.
+
+    Attributes:
+        ready (bool): Whether setup() has been run on this database
+    """
+
+    ready: bool
+
+    @abstractmethod
+    def setup(self, engine: Engine):
+        """
+        Abstract method to create the index and its triggers if missing.
+        Must be idempotent, and must index existing rows on first run.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, db: Session, terms: list, limit: int) -> dict:
+        """
+        Abstract method to rank the rows matching every term as a prefix.
+
+        Args:
+            db (Session): Database session
+            terms (list): Normalized query terms
+            limit (int): Maximum number of results per kind
+
+        Returns:
+            dict: {kind: [id, ...]} with the best matches first
+        """
+        pass
+
+
+class SQLiteFTSSearch(SearchInterface):
+    """
+    SQLite implementation of the SearchInterface using FTS5 virtual tables.
+
+    Each searchable kind has its own FTS5 table whose rowid is the primary
+    key of the indexed row, ranked with bm25().
+    """
+
+    # kind: (FTS table, indexed columns, bm25 column weights)
+    TABLES = {
+        "hawkers": ("hawkers_fts", ("name",), (1.0,)),
+        "stalls": ("stalls_fts", ("stallName", "cuisineType"), (1.0, 0.7)),
+        "dishes": ("dishes_fts", ("dishName",), (1.0,)),
+        "reviews": ("reviews_fts", ("reviewText",), (1.0,)),
+    }
+
+    # Content tables: (table, primary key, indexed columns)
+    SOURCES = {
+        "stalls": ("stalls", "stallID", ("stallName", "cuisineType")),
+        "dishes": ("dishes", "dishID", ("dishName",)),
+        "reviews": ("reviews", "reviewID", ("reviewText",)),
+    }
+
+    def __init__(self):
+        """
+        Initialize SQLiteFTSSearch; the tables are created by setup().
+        """
+        self.ready = False
+
+    def setup(self, engine: Engine):
+        """
+        Creates the FTS5 tables and their triggers, and indexes existing rows
+        when a table is first created.
+        """
+        with engine.begin() as connection:
+            existing = {
+                row[0]
+                for row in connection.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table'")
+                )
+            }
+            for kind, (table, columns, _) in self.TABLES.items():
+                if table in existing:
+                    continue
+                connection.execute(
+                    text(
+                        f"CREATE VIRTUAL TABLE {table} USING fts5("
+                        f"{', '.join(columns)}, tokenize = 'unicode61 remove_diacritics 2')"
+                    )
+                )
+                if kind == "hawkers":
+                    connection.execute(
+                        text(
+                            "INSERT INTO hawkers_fts (rowid, name) SELECT hawkers.hawkerID, users.name "
+                            "FROM hawkers JOIN users ON users.userID = hawkers.userID"
+                        )
+                    )
+                else:
+                    source, key, _ = self.SOURCES[kind]
+                    connection.execute(
+                        text(
+                            f"INSERT INTO {table} (rowid, {', '.join(columns)}) "
+                            f"SELECT {key}, {', '.join(columns)} FROM {source}"
+                        )
+                    )
+
+            for kind, (source, key, columns) in self.SOURCES.items():
+                table = self.TABLES[kind][0]
+                new_values = ", ".join(f"NEW.{column}" for column in columns)
+                insert = (
+                    f"INSERT INTO {table} (rowid, {', '.join(columns)}) "
+                    f"VALUES (NEW.{key}, {new_values});"
+                )
+                delete = f"DELETE FROM {table} WHERE rowid = OLD.{key};"
+                for name, event, body in (
+                    ("ai", "AFTER INSERT", insert),
+                    ("au", f"AFTER UPDATE OF {', '.join(columns)}", delete + " " + insert),
+                    ("ad", "AFTER DELETE", delete),
+                ):
+                    connection.execute(
+                        text(
+                            f"CREATE TRIGGER IF NOT EXISTS {table}_{name} {event} ON {source} "
+                            f"BEGIN {body} END"
+                        )
+                    )
+
+            # Hawker names live on the user
+            insert_hawker = (
+                "INSERT INTO hawkers_fts (rowid, name) "
+                "SELECT NEW.hawkerID, name FROM users WHERE userID = NEW.userID;"
+            )
+            delete_hawker = "DELETE FROM hawkers_fts WHERE rowid = OLD.hawkerID;"
+            for name, event, source, body in (
+                ("ai", "AFTER INSERT", "hawkers", insert_hawker),
+                ("au", "AFTER UPDATE OF userID", "hawkers", delete_hawker + " " + insert_hawker),
+                ("ad", "AFTER DELETE", "hawkers", delete_hawker),
+                (
+                    "user_au",
+                    "AFTER UPDATE OF name",
+                    "users",
+                    "UPDATE hawkers_fts SET name = NEW.name WHERE rowid IN "
+                    "(SELECT hawkerID FROM hawkers WHERE userID = NEW.userID);",
+                ),
+            ):
+                connection.execute(
+                    text(
+                        f"CREATE TRIGGER IF NOT EXISTS hawkers_fts_{name} {event} ON {source} "
+                        f"BEGIN {body} END"
+                    )
+                )
+        self.ready = True
+
+    def search(self, db: Session, terms: list, limit: int) -> dict:
+        """
+        Ranks matches with FTS5 prefix queries, e.g. "gour"* "bur"*.
+        """
+        match = " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        results = {}
+        for kind, (table, _, weights) in self.TABLES.items():
+            rows = db.execute(
+                text(
+                    f"SELECT rowid FROM {table} WHERE {table} MATCH :match "
+                    f"ORDER BY bm25({table}, {', '.join(map(str, weights))}), rowid "
+                    "LIMIT :limit"
+                ),
+                {"match": match, "limit": limit},
+            )
+            results[kind] = [row[0] for row in rows]
+        return results
+
+
+class PostgresFullTextSearch(SearchInterface):
+    """
+    PostgreSQL implementation of the SearchInterface using tsvector columns.
+
+    Each searchable table gets a "searchVector" tsvector column with a GIN
+    index. BEFORE INSERT/UPDATE triggers compute the vector, with names
+    weighted A and cuisines B, and rows are ranked with ts_rank.
+    """
+
+    # kind: (table, primary key, tsvector expression over NEW)
+    TABLES = {
+        "hawkers": (
+            "hawkers",
+            "hawkerID",
+            "setweight(to_tsvector('simple', coalesce("
+            "(SELECT name FROM users WHERE \"userID\" = NEW.\"userID\"), '')), 'A')",
+        ),
+        "stalls": (
+            "stalls",
+            "stallID",
+            "setweight(to_tsvector('simple', coalesce(NEW.\"stallName\", '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(NEW.\"cuisineType\", '[]'::jsonb)), 'B')",
+        ),
+        "dishes": (
+            "dishes",
+            "dishID",
+            "setweight(to_tsvector('simple', coalesce(NEW.\"dishName\", '')), 'A')",
+        ),
+        "reviews": (
+            "reviews",
+            "reviewID",
+            "setweight(to_tsvector('simple', coalesce(NEW.\"reviewText\", '')), 'A')",
+        ),
+    }
+
+    def __init__(self):
+        """
+        Initialize PostgresFullTextSearch; the columns are created by setup().
+        """
+        self.ready = False
+
+    def setup(self, engine: Engine):
+        """
+        Adds the tsvector columns, GIN indexes and triggers, and fills the
+        column for existing rows when it is first added.
+        """
+        with engine.begin() as connection:
+            for table, key, vector in self.TABLES.values():
+                added = connection.execute(
+                    text(
+                        "SELECT 1 FROM information_schema.columns "
+                        "WHERE table_name = :table AND column_name = 'searchVector'"
+                    ),
+                    {"table": table},
+                ).first() is None
+                connection.execute(
+                    text(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "searchVector" tsvector')
+                )
+                connection.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+                        f'ON {table} USING GIN ("searchVector")'
+                    )
+                )
+                connection.execute(
+                    text(
+                        f"CREATE OR REPLACE FUNCTION {table}_search_vector() RETURNS trigger AS $$ "
+                        f'BEGIN NEW."searchVector" := {vector}; RETURN NEW; END $$ LANGUAGE plpgsql'
+                    )
+                )
+                connection.execute(
+                    text(
+                        f"CREATE OR REPLACE TRIGGER {table}_search_vector "
+                        f"BEFORE INSERT OR UPDATE ON {table} "
+                        f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector()"
+                    )
+                )
+                if added:
+                    # Touch every row so the trigger fills in the new column
+                    connection.execute(text(f'UPDATE {table} SET "{key}" = "{key}"'))
+
+            # Recompute a hawker's vector when the user's name changes
+            connection.execute(
+                text(
+                    "CREATE OR REPLACE FUNCTION users_hawker_search_vector() RETURNS trigger AS $$ "
+                    'BEGIN UPDATE hawkers SET "userID" = "userID" WHERE "userID" = NEW."userID"; '
+                    "RETURN NULL; END $$ LANGUAGE plpgsql"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE OR REPLACE TRIGGER users_hawker_search_vector "
+                    "AFTER UPDATE OF name ON users "
+                    "FOR EACH ROW EXECUTE FUNCTION users_hawker_search_vector()"
+                )
+            )
+        self.ready = True
+
+    def search(self, db: Session, terms: list, limit: int) -> dict:
+        """
+        Ranks matches with a prefix tsquery, e.g. gour:* & bur:*.
+        """
+        query = " & ".join(
+            "'{}':*".format(term.replace("'", "''").replace("\\", "\\\\")) for term in terms
+        )
+        results = {}
+        for table, key, _ in self.TABLES.values():
+            rows = db.execute(
+                text(
+                    f'SELECT "{key}" FROM {table}, to_tsquery(\'simple\', :query) AS query '
+                    f'WHERE "searchVector" @@ query '
+                    f'ORDER BY ts_rank("searchVector", query) DESC, "{key}" LIMIT :limit'
+                ),
+                {"query": query, "limit": limit},
+            )
+            results[table] = [row[0] for row in rows]
+        return results
+
+
+class SearchFactory:
+    """
+    Factory class for creating database search instances.
+
+    Provides a static method to get a search instance for a database type.
+    """
+
+    @staticmethod
+    def getSearch(type: str) -> SearchInterface:
+        """
+        Creates and returns a search instance for the specified database type.
+
+        Args:
+            type (str): The type of database to search ("sqlite" or "postgresql")
+
+        Returns:
+            SearchInterface: An instance of the matching search implementation,
+                             defaulting to SQLiteFTSSearch if type is not recognized
+        """
+        match type:
+            case "sqlite":
+                return SQLiteFTSSearch()
+            case "postgresql":
+                return PostgresFullTextSearch()
+            case _:
+                return SQLiteFTSSearch()  # default
@@ -0,0 +1,57 @@
+"""Import hawker centers from an NEA hawker centres GeoJSON file.
+
+Run from the backend/app directory:
+
+    python import_hawker_centers.py [path/to/HawkerCentresGEOJSON.geojson]
+"""
+
+import argparse
+import time
+
+from assets.database_seed.helper import add_event_listener_to_seed_database
+from database import Base, engine, SessionLocal
+from migrations import run_migrations
+from services.hawkerCenter import (
+    DEFAULT_GEOJSON_PATH,
+    IMPORT_BATCH_SIZE,
+    import_hawker_centers,
+    load_hawker_center_features,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=DEFAULT_GEOJSON_PATH,
+        help="GeoJSON file to import (default: the bundled NEA dataset)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=IMPORT_BATCH_SIZE,
+        help="number of records written per transaction",
+    )
+    args = parser.parse_args()
+
+    # Create and seed the database the same way main.py does if it doesn't exist yet
+    add_event_listener_to_seed_database()
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    started = time.perf_counter()
+    with open(args.path, "rb") as geojson_file, SessionLocal() as db:
+        report = import_hawker_centers(
+            db, load_hawker_center_features(geojson_file), args.batch_size
+        )
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Imported {args.path} in {elapsed:.2f}s: {report['inserted']} inserted, "
+        f"{report['updated']} updated, {report['skipped']} skipped"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -11,17 +13,48 @@ from routers import (
     stall,
     promotion,
     dish,
+    search,
 )
-from database import Base, engine, SessionLocal
+from database import Base, engine, SessionLocal, route_reads
+from migrations import run_migrations
+from services.spatialIndex import build_hawker_center_index
+from services.objectStorage import ObjectStorage
+from services.search import setup_search
+from services.storageSweeper import start_storage_sweeper
+from services.promotionScheduler import start_promotion_scheduler
 from assets.database_seed.helper import add_event_listener_to_seed_database
 
 # Seed database
 # Uncomment the line below if you want to seed the database
 add_event_listener_to_seed_database()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the MinIO buckets without delaying startup; an upload creates
+    # them itself if MinIO is still unreachable by then. Then render the
+    # variants of images stored without them, e.g. the seeded ones.
+    def prepare_storage():
+        storage = ObjectStorage()
+        if storage.ensure_buckets():
+            print(f"Image variants backfilled: {storage.backfill_variants()}")
+
+    threading.Thread(target=prepare_storage, name="minio-buckets", daemon=True).start()
+    # Deletes orphaned images every STORAGE_SWEEP_INTERVAL seconds, if set
+    start_storage_sweeper(SessionLocal)
+    # Flips promotions on and off at their start and end dates
+    start_promotion_scheduler(SessionLocal)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+with SessionLocal() as db:
+    build_hawker_center_index(db)
+    setup_search(db)
 
 
 origins = ["http://localhost:3000"]
@@ -33,6 +66,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(route_reads)
 
 app.include_router(auth.router)
 app.include_router(user.router)
@@ -43,7 +77,7 @@ app.include_router(review.router)
 app.include_router(stall.router)
 app.include_router(promotion.router)
 app.include_router(dish.router)
-# app.include_router(search.router)
+app.include_router(search.router)
 
 
 @app.get("/")
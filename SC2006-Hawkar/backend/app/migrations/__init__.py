@@ -0,0 +1,57 @@
+from sqlalchemy import Engine, text
+
+from migrations import (
+    stall_list_columns,
+    stall_filter_indexes,
+    hawker_center_inc_crc,
+    stall_rating_aggregates,
+    stall_like_count,
+    updated_at_columns,
+    menu_indexes,
+    promotion_is_active,
+)
+
+
+# Ordered list of (name, upgrade) pairs. Each upgrade runs once per database
+# and receives a connection inside its own transaction.
+MIGRATIONS = [
+    ("stall_list_columns", stall_list_columns.upgrade),
+    ("stall_filter_indexes", stall_filter_indexes.upgrade),
+    ("hawker_center_inc_crc", hawker_center_inc_crc.upgrade),
+    ("stall_rating_aggregates", stall_rating_aggregates.upgrade),
+    ("stall_like_count", stall_like_count.upgrade),
+    ("updated_at_columns", updated_at_columns.upgrade),
+    ("menu_indexes", menu_indexes.upgrade),
+    ("promotion_is_active", promotion_is_active.upgrade),
+]
+
+
+def run_migrations(engine: Engine):
+    """
+    Apply every migration that has not yet been recorded in schema_migrations.
+
+    Migrations bring databases created by older versions of the application
+    up to date with the current models. Databases freshly created by
+    create_all() already match the models, so each migration must be a no-op
+    on them.
+
+    Args:
+        engine (Engine): SQLAlchemy engine of the database to migrate
+    """
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE IF NOT EXISTS schema_migrations (name VARCHAR PRIMARY KEY)")
+        )
+        applied = {
+            row[0] for row in connection.execute(text("SELECT name FROM schema_migrations"))
+        }
+
+    for name, upgrade in MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as connection:
+            upgrade(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (name) VALUES (:name)"),
+                {"name": name},
+            )
@@ -0,0 +1,20 @@
+from sqlalchemy import Connection, inspect, text
+
+
+def upgrade(connection: Connection):
+    """
+    Add hawkerCenters.incCrc, the NEA dataset record checksum used by the
+    GeoJSON importer to recognise unchanged hawker centers.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("hawkerCenters")}
+    if "incCrc" not in columns:
+        connection.execute(text('ALTER TABLE "hawkerCenters" ADD COLUMN "incCrc" VARCHAR'))
+    connection.execute(
+        text(
+            'CREATE UNIQUE INDEX IF NOT EXISTS "ix_hawkerCenters_incCrc" '
+            'ON "hawkerCenters" ("incCrc")'
+        )
+    )
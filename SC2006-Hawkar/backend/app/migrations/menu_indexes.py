@@ -0,0 +1,22 @@
+from sqlalchemy import Connection, text
+
+
+INDEXES = {
+    "ix_dishes_stallID": ("dishes", ("stallID",)),
+    "ix_promotions_dishID_startDate_endDate": ("promotions", ("dishID", "startDate", "endDate")),
+}
+
+
+def upgrade(connection: Connection):
+    """
+    Create the indexes backing the menu of a stall, i.e. its dishes and their
+    active promotions.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    for name, (table, columns) in INDEXES.items():
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        connection.execute(
+            text(f'CREATE INDEX IF NOT EXISTS "{name}" ON {table} ({column_list})')
+        )
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import Connection, inspect, text
+
+
+def upgrade(connection: Connection):
+    """
+    Add promotions.isActive, and set it and dishes.onPromotion from the
+    promotions' dates.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("promotions")}
+    if "isActive" not in columns:
+        connection.execute(
+            text('ALTER TABLE promotions ADD COLUMN "isActive" BOOLEAN NOT NULL DEFAULT FALSE')
+        )
+    connection.execute(
+        text(
+            'CREATE INDEX IF NOT EXISTS "ix_promotions_isActive_dishID" '
+            'ON promotions ("isActive", "dishID")'
+        )
+    )
+    connection.execute(
+        text(
+            'UPDATE promotions SET "isActive" = CASE WHEN "startDate" <= :now '
+            'AND "endDate" > :now THEN TRUE ELSE FALSE END'
+        ),
+        {"now": datetime.now()},
+    )
+    connection.execute(
+        text(
+            'UPDATE dishes SET "onPromotion" = EXISTS (SELECT 1 FROM promotions '
+            'WHERE promotions."dishID" = dishes."dishID" AND promotions."isActive")'
+        )
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Connection, text
+
+
+INDEXES = {
+    "ix_stalls_hawkerCenterID_hygieneRating": ("hawkerCenterID", "hygieneRating"),
+    "ix_stalls_startTime_endTime": ("startTime", "endTime"),
+    "ix_stalls_priceRange_estimatedWaitTime": ("priceRange", "estimatedWaitTime"),
+}
+
+
+def upgrade(connection: Connection):
+    """
+    Create the composite indexes backing the stall listing filters.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    for name, columns in INDEXES.items():
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        connection.execute(
+            text(f'CREATE INDEX IF NOT EXISTS "{name}" ON stalls ({column_list})')
+        )
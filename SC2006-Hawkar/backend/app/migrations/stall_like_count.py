@@ -0,0 +1,21 @@
+from sqlalchemy import Connection, inspect, text
+
+
+def upgrade(connection: Connection):
+    """
+    Add stalls.likeCount and count the existing likes of every stall.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("stalls")}
+    if "likeCount" not in columns:
+        connection.execute(
+            text('ALTER TABLE stalls ADD COLUMN "likeCount" INTEGER NOT NULL DEFAULT 0')
+        )
+    connection.execute(
+        text(
+            'UPDATE stalls SET "likeCount" = (SELECT COUNT(*) FROM like_stalls '
+            'WHERE like_stalls."stallID" = stalls."stallID")'
+        )
+    )
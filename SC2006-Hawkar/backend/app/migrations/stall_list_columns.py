@@ -0,0 +1,86 @@
+import json
+
+from sqlalchemy import Connection, text
+
+
+def split_list(value):
+    """
+    Parse a legacy comma-separated column value into a list.
+
+    Args:
+        value (str or None): Stored column value, either legacy comma-separated
+            text or an already migrated JSON array
+
+    Returns:
+        list: List of stripped, non-empty items
+    """
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+        if isinstance(parsed, list):
+            return parsed
+    except ValueError:
+        pass
+    # "TEMPORARY" was written by create_stall before its images were uploaded
+    return [
+        item.strip()
+        for item in value.split(",")
+        if item.strip() and item.strip() != "TEMPORARY"
+    ]
+
+
+def upgrade(connection: Connection):
+    """
+    Convert stalls.images and stalls.cuisineType from comma-separated strings
+    to JSON arrays.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    if connection.dialect.name == "postgresql":
+        for column in ("images", "cuisineType"):
+            data_type = connection.execute(
+                text(
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_name = 'stalls' AND column_name = :column"
+                ),
+                {"column": column},
+            ).scalar()
+            if data_type == "jsonb":
+                continue
+            # Drop empty items and "TEMPORARY" placeholders, like split_list
+            items = f'regexp_split_to_array(btrim("{column}"), \'\\s*,\\s*\')'
+            connection.execute(
+                text(
+                    f'ALTER TABLE stalls ALTER COLUMN "{column}" TYPE JSONB USING '
+                    f'CASE WHEN btrim(coalesce("{column}", \'\')) = \'\' THEN \'[]\'::jsonb '
+                    f"ELSE to_jsonb(array_remove(array_remove({items}, 'TEMPORARY'), '')) END"
+                )
+            )
+        return
+
+    rows = connection.execute(
+        text('SELECT "stallID", images, "cuisineType" FROM stalls')
+    ).all()
+    updates = []
+    for stall_id, images, cuisine_type in rows:
+        migrated_images = json.dumps(split_list(images))
+        migrated_cuisine_type = json.dumps(split_list(cuisine_type))
+        if (migrated_images, migrated_cuisine_type) != (images, cuisine_type):
+            updates.append(
+                {
+                    "stallID": stall_id,
+                    "images": migrated_images,
+                    "cuisineType": migrated_cuisine_type,
+                }
+            )
+
+    if updates:
+        connection.execute(
+            text(
+                'UPDATE stalls SET images = :images, "cuisineType" = :cuisineType '
+                'WHERE "stallID" = :stallID'
+            ),
+            updates,
+        )
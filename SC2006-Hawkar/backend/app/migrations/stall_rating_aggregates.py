@@ -0,0 +1,56 @@
+from sqlalchemy import Connection, inspect, text
+
+
+COLUMNS = {
+    "ratingCount": "INTEGER NOT NULL DEFAULT 0",
+    "ratingSum": "FLOAT NOT NULL DEFAULT 0",
+    "averageRating": "FLOAT NOT NULL DEFAULT 0",
+    "rating1Count": "INTEGER NOT NULL DEFAULT 0",
+    "rating2Count": "INTEGER NOT NULL DEFAULT 0",
+    "rating3Count": "INTEGER NOT NULL DEFAULT 0",
+    "rating4Count": "INTEGER NOT NULL DEFAULT 0",
+    "rating5Count": "INTEGER NOT NULL DEFAULT 0",
+    "lastReviewedAt": "TIMESTAMP",
+}
+
+
+def upgrade(connection: Connection):
+    """
+    Add the per-stall rating aggregates and compute them from the existing
+    reviews. Reviews have no timestamp, so lastReviewedAt starts out empty.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    existing = {column["name"] for column in inspect(connection).get_columns("stalls")}
+    for column, definition in COLUMNS.items():
+        if column not in existing:
+            connection.execute(text(f'ALTER TABLE stalls ADD COLUMN "{column}" {definition}'))
+    connection.execute(
+        text('CREATE INDEX IF NOT EXISTS "ix_stalls_averageRating" ON stalls ("averageRating")')
+    )
+
+    # Same rounding as services.review.rating_bucket (half up, clamped to 1-5)
+    bucket = "MIN(5, MAX(1, CAST(ROUND(reviews.rating) AS INTEGER)))"
+    if connection.dialect.name == "postgresql":
+        bucket = "LEAST(5, GREATEST(1, ROUND(reviews.rating)::INTEGER))"
+    histogram = ", ".join(
+        f'"rating{stars}Count" = (SELECT COUNT(*) FROM reviews '
+        f'WHERE reviews."stallID" = stalls."stallID" AND {bucket} = {stars})'
+        for stars in range(1, 6)
+    )
+    connection.execute(
+        text(
+            'UPDATE stalls SET "ratingCount" = (SELECT COUNT(rating) FROM reviews '
+            'WHERE reviews."stallID" = stalls."stallID"), '
+            '"ratingSum" = (SELECT COALESCE(SUM(rating), 0) FROM reviews '
+            'WHERE reviews."stallID" = stalls."stallID"), '
+            f"{histogram}"
+        )
+    )
+    connection.execute(
+        text(
+            'UPDATE stalls SET "averageRating" = CASE WHEN "ratingCount" > 0 '
+            'THEN "ratingSum" / "ratingCount" ELSE 0 END'
+        )
+    )
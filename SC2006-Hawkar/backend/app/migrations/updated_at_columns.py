@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import Connection, inspect, text
+
+
+TABLES = ("stalls", "dishes", "promotions", "reviews", "hawkerCenters")
+
+
+def upgrade(connection: Connection):
+    """
+    Add the updatedAt version column to the tables served with ETags. Existing
+    rows count as changed now, as their last change is unknown.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction
+    """
+    now = datetime.now()
+    for table in TABLES:
+        columns = {column["name"] for column in inspect(connection).get_columns(table)}
+        if "updatedAt" not in columns:
+            connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "updatedAt" TIMESTAMP'))
+        connection.execute(
+            text(f'UPDATE "{table}" SET "updatedAt" = :now WHERE "updatedAt" IS NULL'),
+            {"now": now},
+        )
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship, Mapped
+from datetime import datetime
 
 from database import Base
+from services.imageVariants import variant_urls
 
 
 class Dish(Base):
@@ -16,7 +18,9 @@ class Dish(Base):
         dishName (str): Name of the dish.
         price (float): Price of the dish.
         photo (str): URL or path to the dish's photo.
-        onPromotion (bool): Flag indicating if the dish is currently on promotion.
+        onPromotion (bool): Flag indicating if the dish is currently on promotion,
+            maintained by services.promotionScheduler.
+        updatedAt (DateTime): When the dish was last changed, the version behind its ETag.
         stallID (int): Foreign key linking to the stall that sells this dish.
         
     Relationships:
@@ -30,8 +34,17 @@ class Dish(Base):
     price = Column(Float)
     photo = Column(String)
     onPromotion = Column(Boolean)
+    updatedAt = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     stallID = Column(Integer, ForeignKey("stalls.stallID"))
     stall: Mapped["Stall"] = relationship("Stall", back_populates="dishes")
 
     promotions: Mapped["Promotion"] = relationship("Promotion", back_populates="dishes")
+
+    @property
+    def photoVariants(self):
+        """Resized variant URLs of the photo, or None for an external photo."""
+        return variant_urls(self.photo)
+
+    # Backs the menu of a stall
+    __table_args__ = (Index("ix_dishes_stallID", "stallID"),)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime
 from sqlalchemy.orm import relationship, Mapped
+from datetime import datetime
 from typing import List
 
 from database import Base
@@ -19,6 +20,9 @@ class HawkerCenter(Base):
         address (str): Physical address of the hawker center.
         latitude (float): Geographic latitude coordinate of the hawker center.
         longitude (float): Geographic longitude coordinate of the hawker center.
+        incCrc (str): INC_CRC checksum of the NEA dataset record the hawker center was
+            imported from, or None if it was not imported.
+        updatedAt (DateTime): When the hawker center was last changed, the version behind its ETag.
 
     Relationships:
         stalls: One-to-many relationship with Stall models located in this hawker center.
@@ -31,5 +35,7 @@ class HawkerCenter(Base):
     address = Column(String)
     latitude = Column(Float)
     longitude = Column(Float)
+    incCrc = Column(String, unique=True, index=True, nullable=True)
+    updatedAt = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     stalls: Mapped[List["Stall"]] = relationship("Stall", back_populates="hawkerCenter")
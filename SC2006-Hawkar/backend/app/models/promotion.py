@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index, Boolean
 from sqlalchemy.orm import relationship, Mapped
+from datetime import datetime
 
 from database import Base
 
@@ -17,6 +18,8 @@ class Promotion(Base):
         startDate (DateTime): Date and time when the promotion starts.
         endDate (DateTime): Date and time when the promotion ends.
         discountedPrice (float): The special promotional price for the dish.
+        isActive (bool): Whether the promotion is running now, maintained by services.promotionScheduler.
+        updatedAt (DateTime): When the promotion was last changed, the version behind its ETag.
         dishID (int): Foreign key linking to the dish on promotion.
         
     Relationships:
@@ -28,6 +31,14 @@ class Promotion(Base):
     startDate = Column(DateTime)
     endDate = Column(DateTime)
     discountedPrice = Column(Float)
+    isActive = Column(Boolean, default=False, nullable=False)
+    updatedAt = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     dishID = Column(Integer, ForeignKey("dishes.dishID"))
     dishes: Mapped["Dish"] = relationship("Dish", back_populates="promotions")
+
+    # Back the lookup of a dish's promotions, and of the active promotions
+    __table_args__ = (
+        Index("ix_promotions_dishID_startDate_endDate", "dishID", "startDate", "endDate"),
+        Index("ix_promotions_isActive_dishID", "isActive", "dishID"),
+    )
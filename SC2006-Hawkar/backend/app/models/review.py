@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Enum, DateTime
 from sqlalchemy.orm import relationship, Mapped
+from datetime import datetime
 
 from database import Base
 from schemas.review import ReportType
@@ -20,6 +21,7 @@ class Review(Base):
         isReported (bool): Flag indicating if the review has been reported.
         reportType (ReportType): The type/reason for the report if reported.
         reportText (str): Additional text explaining the report reason.
+        updatedAt (DateTime): When the review was last changed, the version behind its ETag.
         consumerID (int): Foreign key linking to the consumer who wrote the review.
         stallID (int): Foreign key linking to the stall being reviewed.
 
@@ -36,6 +38,7 @@ class Review(Base):
     isReported = Column(Boolean)
     reportType = Column(Enum(ReportType))
     reportText = Column(String)
+    updatedAt = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     consumerID = Column(Integer, ForeignKey("consumers.consumerID"))
     consumer: Mapped["Consumer"] = relationship("Consumer", back_populates="reviews")
@@ -1,11 +1,30 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, Enum, ForeignKey, Time
-from sqlalchemy.orm import relationship, Mapped
-from typing import List
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    Float,
+    Enum,
+    ForeignKey,
+    Time,
+    DateTime,
+    JSON,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from sqlalchemy.orm import relationship, Mapped, query_expression
+from typing import List, Optional
 
 from database import Base
+from services.imageVariants import variant_urls
 from schemas.user import CuisineType, HygieneRating
 
 
+# JSON array column, stored as JSONB on PostgreSQL and JSON1 text on SQLite
+ListType = JSON().with_variant(JSONB(), "postgresql")
+
+
 class Stall(Base):
     """
     Stall model representing food stalls in hawker centers.
@@ -17,14 +36,23 @@ class Stall(Base):
     Attributes:
         stallID (int): Primary key and unique identifier for the stall.
         stallName (str): Name of the food stall.
-        images (str): URLs or paths to stall images.
+        images (list[str]): URLs or paths to stall images.
         unitNumber (str): Physical unit number of the stall in the hawker center.
         startTime (Time): Daily opening time of the stall.
         endTime (Time): Daily closing time of the stall.
         hygieneRating (HygieneRating): Official hygiene rating of the stall.
-        cuisineType (CuisineType): Type of cuisine served by the stall.
+        cuisineType (list[str]): CuisineType values served by the stall.
         estimatedWaitTime (int): Estimated waiting time in minutes.
         priceRange (str): Indication of the price range of dishes.
+        ratingCount (int): Number of reviews of the stall.
+        ratingSum (float): Sum of the ratings of those reviews.
+        averageRating (float): ratingSum / ratingCount, or 0 if there are no reviews.
+        rating1Count..rating5Count (int): Number of reviews per rating, rounded to 1-5 stars.
+        lastReviewedAt (DateTime): When a review of the stall was last submitted.
+        likeCount (int): Number of users who liked the stall, maintained by services.likeStall.
+        likedByMe (bool): Whether a given user liked the stall; only loaded by queries
+            that request it with services.likeStall.with_liked_by_me, None otherwise.
+        updatedAt (DateTime): When the stall was last changed, the version behind its ETag.
         hawkerID (int): Foreign key linking to the hawker who owns the stall.
         hawkerCenterID (int): Foreign key linking to the hawker center where the stall is located.
 
@@ -39,15 +67,31 @@ class Stall(Base):
 
     stallID = Column(Integer, primary_key=True, index=True)
     stallName = Column(String)
-    images = Column(String)
+    images = Column(ListType, default=list)
     unitNumber = Column(String)
     startTime = Column(Time)
     endTime = Column(Time)
     hygieneRating = Column(Enum(HygieneRating))
-    cuisineType = Column(String, Enum(CuisineType))
+    cuisineType = Column(ListType, default=list)
     estimatedWaitTime = Column(Integer)
     priceRange = Column(String)
 
+    # Rating aggregates, maintained by services.review in the review's transaction
+    ratingCount = Column(Integer, default=0, nullable=False)
+    ratingSum = Column(Float, default=0, nullable=False)
+    averageRating = Column(Float, default=0, nullable=False, index=True)
+    rating1Count = Column(Integer, default=0, nullable=False)
+    rating2Count = Column(Integer, default=0, nullable=False)
+    rating3Count = Column(Integer, default=0, nullable=False)
+    rating4Count = Column(Integer, default=0, nullable=False)
+    rating5Count = Column(Integer, default=0, nullable=False)
+    lastReviewedAt = Column(DateTime)
+
+    likeCount = Column(Integer, default=0, nullable=False)
+    likedByMe = query_expression()
+
+    updatedAt = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
     hawkerID = Column(Integer, ForeignKey("hawkers.hawkerID"))
     hawker: Mapped["Hawker"] = relationship("Hawker", back_populates="stall")
 
@@ -58,3 +102,26 @@ class Stall(Base):
 
     reviews: Mapped[List["Review"]] = relationship("Review", back_populates="stall")
     dishes: Mapped[List["Dish"]] = relationship("Dish", back_populates="stall")
+
+    @property
+    def ratingHistogram(self) -> List[int]:
+        """Number of reviews with a rating of 1, 2, 3, 4 and 5 stars."""
+        return [
+            self.rating1Count or 0,
+            self.rating2Count or 0,
+            self.rating3Count or 0,
+            self.rating4Count or 0,
+            self.rating5Count or 0,
+        ]
+
+    @property
+    def imageVariants(self) -> List[Optional[dict]]:
+        """Resized variant URLs of each image, or None for external images."""
+        return [variant_urls(image) for image in self.images or []]
+
+    # Composite indexes backing the filters of the stall listing
+    __table_args__ = (
+        Index("ix_stalls_hawkerCenterID_hygieneRating", "hawkerCenterID", "hygieneRating"),
+        Index("ix_stalls_startTime_endTime", "startTime", "endTime"),
+        Index("ix_stalls_priceRange_estimatedWaitTime", "priceRange", "estimatedWaitTime"),
+    )
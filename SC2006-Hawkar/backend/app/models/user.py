@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Enum, Boolean
 from sqlalchemy.orm import relationship, Mapped
 
 from database import Base
+from services.imageVariants import variant_urls
 from schemas.user import Role
 
 
@@ -44,6 +45,11 @@ class User(Base):
     consumer: Mapped["Consumer"] = relationship("Consumer", back_populates="user")
     hawker: Mapped["Hawker"] = relationship("Hawker", back_populates="user")
 
+    @property
+    def profilePhotoVariants(self):
+        """Resized variant URLs of the profile photo, or None for an external photo."""
+        return variant_urls(self.profilePhoto)
+
     # notifications: Mapped["Notification"] = relationship(
     #     "Notification", back_populates="receiver"
     # )
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, Query, UploadFile
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from database import get_db
 from controllers.admin import AdminController
 
 import schemas.admin as admin_schemas
 import schemas.hawker as hawker_schemas
+import schemas.hawkerCenter as hawkerCenter_schemas
 import schemas.review as review_schemas
-from schemas.response import StandardResponse
+import schemas.storage as storage_schemas
+import schemas.cache as cache_schemas
+from schemas.response import StandardResponse, Page
 
 router = APIRouter()
 
@@ -29,7 +33,7 @@ tags_metadata = [
     response_model=StandardResponse,
     tags=["Admin-Hawker"],
 )
-async def verify_hawker(hawkerID: int, db: Session = Depends(get_db)):
+def verify_hawker(hawkerID: int, db: Session = Depends(get_db)):
     """Approve a hawker by their ID.
 
     Args:
@@ -62,6 +66,28 @@ def get_all_reported_reviews(
     return AdminController.getAllReportedReviews(db, skip, limit)
 
 
+@router.get(
+    "/admin/reported_reviews/page",
+    response_model=Page[review_schemas.Review],
+    tags=["Admin-Review"],
+)
+def get_reported_reviews_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of reported reviews using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of reported reviews and the cursor of the next page.
+    """
+    return AdminController.getReportedReviewsPage(db, limit, cursor)
+
+
 @router.put(
     "/admin/reports/{reviewID}/ignore",
     response_model=StandardResponse,
@@ -83,6 +109,57 @@ def ignore_reported_review(reviewID: int, db: Session = Depends(get_db)):
     )
 
 
+@router.post(
+    "/admin/hawker-centers/import",
+    response_model=hawkerCenter_schemas.HawkerCenterImportReport,
+    tags=["Admin-HawkerCenter"],
+)
+def import_hawker_centers(
+    file: Optional[UploadFile] = File(None), db: Session = Depends(get_db)
+):
+    """Import hawker centers from an NEA hawker centres GeoJSON file.
+
+    Hawker centers are upserted by name, and records whose INC_CRC has
+    already been imported are skipped, so the import can be re-run safely.
+
+    Args:
+        file (UploadFile, optional): GeoJSON file. Defaults to the bundled dataset.
+        db (Session, optional): Database session dependency.
+    Returns:
+        HawkerCenterImportReport: Number of hawker centers inserted, updated and skipped.
+    """
+    return AdminController.importHawkerCenters(db, file.file if file else None)
+
+
+@router.post(
+    "/admin/storage/sweep",
+    response_model=storage_schemas.StorageSweepReport,
+    tags=["Admin-Storage"],
+)
+def sweep_storage(dryRun: bool = True, db: Session = Depends(get_db)):
+    """Delete stall images, dish photos and profile photos no longer referenced.
+
+    Objects uploaded within the last STORAGE_SWEEP_MIN_AGE seconds are kept.
+
+    Args:
+        dryRun (bool, optional): Only count the orphaned objects. Defaults to True.
+        db (Session, optional): Database session dependency.
+    Returns:
+        StorageSweepReport: Number of objects scanned, orphaned and deleted per bucket.
+    """
+    return AdminController.sweepStorage(db, dryRun)
+
+
+@router.get("/admin/cache", response_model=cache_schemas.CacheStats, tags=["Admin-Cache"])
+def get_cache_stats():
+    """Get the hit and miss counts of the response cache in this worker process.
+
+    Returns:
+        CacheStats: Cache backend, size, invalidations, errors and per-route hit rates.
+    """
+    return AdminController.getCacheStats()
+
+
 # ------------------------------------------------------------ #
 # -------------------- Admin (CRUD) -------------------------- #
 # ------------------------------------------------------------ #
@@ -103,7 +180,7 @@ def get_all_admins(skip: int = 0, limit: int = 100, db: Session = Depends(get_db
 @router.get(
     "/admin/{admin_id}", response_model=admin_schemas.Admin, tags=["Admin (CRUD)"]
 )
-async def get_admin_by_admin_id(admin_id: str, db: Session = Depends(get_db)):
+def get_admin_by_admin_id(admin_id: str, db: Session = Depends(get_db)):
     """Get an admin user by their admin ID.
 
     Args:
@@ -118,7 +195,7 @@ async def get_admin_by_admin_id(admin_id: str, db: Session = Depends(get_db)):
 @router.get(
     "/admin/userid/{user_id}", response_model=admin_schemas.Admin, tags=["Admin (CRUD)"]
 )
-async def get_admin_by_user_id(user_id: str, db: Session = Depends(get_db)):
+def get_admin_by_user_id(user_id: str, db: Session = Depends(get_db)):
     """Get an admin user by their user ID.
 
     Args:
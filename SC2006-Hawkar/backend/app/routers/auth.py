@@ -35,7 +35,7 @@ tags_metadata = [
     ],
     tags=["Auth Controller"],
 )
-async def signup(user_signup: user_schemas.UserSignup, db: Session = Depends(get_db)):
+def signup(user_signup: user_schemas.UserSignup, db: Session = Depends(get_db)):
     """Register a new user (admin, consumer, or hawker).
 
     Args:
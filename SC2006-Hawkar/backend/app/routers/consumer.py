@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from database import get_db
 from controllers.consumer import ConsumerController
 
 import schemas.consumer as consumer_schemas
 import schemas.review as review_schemas
+from schemas.response import Page
 
 router = APIRouter()
 
@@ -61,12 +63,34 @@ def get_all_consumers(skip: int = 0, limit: int = 100, db: Session = Depends(get
     return ConsumerController.getAllConsumers(db, skip, limit)
 
 
+@router.get(
+    "/consumers/page",
+    response_model=Page[consumer_schemas.Consumer],
+    tags=["Consumer (CRUD)"],
+)
+def get_consumers_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of consumers using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of consumers and the cursor of the next page.
+    """
+    return ConsumerController.getConsumersPage(db, limit, cursor)
+
+
 @router.get(
     "/consumer/{consumer_id}",
     response_model=consumer_schemas.Consumer,
     tags=["Consumer (CRUD)"],
 )
-async def get_consumer_by_consumer_id(consumer_id: str, db: Session = Depends(get_db)):
+def get_consumer_by_consumer_id(consumer_id: str, db: Session = Depends(get_db)):
     """Get a consumer by their consumer ID.
 
     Args:
@@ -83,7 +107,7 @@ async def get_consumer_by_consumer_id(consumer_id: str, db: Session = Depends(ge
     response_model=consumer_schemas.Consumer,
     tags=["Consumer (CRUD)"],
 )
-async def get_consumer_by_user_id(user_id: str, db: Session = Depends(get_db)):
+def get_consumer_by_user_id(user_id: str, db: Session = Depends(get_db)):
     """Get a consumer by their user ID.
 
     Args:
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 
-from database import get_db
+from database import get_db, get_async_db
 from controllers.dish import DishController
 import schemas.dish as dish_schemas
 import schemas.promotion as promotion_schemas
+from schemas.response import Page
+from schemas.storage import PresignedUpload, UploadConfirmation
+import services.etag as etag_services
+from services.etag import conditional_response
 
 router = APIRouter()
 
@@ -85,6 +91,7 @@ def delete_promotion(promotion_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/dishes", response_model=list[dish_schemas.Dish], tags=["Dish (CRUD)"])
+@conditional_response(list[dish_schemas.Dish], etag_services.dishes_version)
 def get_all_dishes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get all dishes with pagination.
 
@@ -98,17 +105,43 @@ def get_all_dishes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db
     return DishController.getAllDishes(db, skip, limit)
 
 
+@router.get(
+    "/dishes/page",
+    response_model=Page[dish_schemas.Dish],
+    tags=["Dish (CRUD)"],
+)
+@conditional_response(Page[dish_schemas.Dish], etag_services.dishes_version)
+def get_dishes_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of dishes using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of dishes and the cursor of the next page.
+    """
+    return DishController.getDishesPage(db, limit, cursor)
+
+
 @router.get("/dish/{dish_id}", response_model=dish_schemas.Dish, tags=["Dish (CRUD)"])
-async def get_dish_by_dish_id(dish_id: str, db: Session = Depends(get_db)):
+@conditional_response(dish_schemas.Dish, etag_services.dish_version, last_modified=True)
+async def get_dish_by_dish_id(
+    dish_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get a dish by its dish ID.
 
     Args:
-        dish_id (str): Dish ID from the path.
-        db (Session, optional): Database session dependency.
+        dish_id (int): Dish ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         Dish: The dish object.
     """
-    return DishController.getDishByDishId(db, dish_id)
+    return await DishController.getDishByDishIdAsync(db, dish_id)
 
 
 # @router.get(
@@ -131,3 +164,55 @@ def update_dish(dish: dish_schemas.DishUpdate, db: Session = Depends(get_db)):
         Dish: The updated dish object.
     """
     return DishController.updateDish(db, dish)
+
+
+@router.put("/dish/{dish_id}/photo", response_model=dish_schemas.Dish, tags=["Dish (CRUD)"])
+def update_dish_photo(dish_id: int, photo: UploadFile, db: Session = Depends(get_db)):
+    """Replace a dish's photo with a multipart/form-data upload.
+
+    The file is streamed to object storage instead of being sent as base64 in JSON.
+
+    Args:
+        dish_id (int): Dish ID from the path.
+        photo (UploadFile): Image file from the form.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Dish: The updated dish object.
+    """
+    return DishController.updateDishPhoto(db, dish_id, photo)
+
+
+@router.post(
+    "/dish/{dish_id}/photo/presign", response_model=PresignedUpload, tags=["Dish (CRUD)"]
+)
+def presign_dish_photo(dish_id: int, db: Session = Depends(get_db)):
+    """Mint a presigned URL to upload a dish photo to object storage directly.
+
+    PUT the image to uploadUrl, then confirm it with its key at
+    /dish/{dish_id}/photo/confirm, so the image never passes through the API.
+
+    Args:
+        dish_id (int): Dish ID from the path.
+        db (Session, optional): Database session dependency.
+    Returns:
+        PresignedUpload: The URL to upload to and the key to confirm.
+    """
+    return DishController.presignDishPhoto(db, dish_id)
+
+
+@router.put(
+    "/dish/{dish_id}/photo/confirm", response_model=dish_schemas.Dish, tags=["Dish (CRUD)"]
+)
+def confirm_dish_photo(
+    dish_id: int, upload: UploadConfirmation, db: Session = Depends(get_db)
+):
+    """Replace a dish's photo with an image uploaded with a presigned URL.
+
+    Args:
+        dish_id (int): Dish ID from the path.
+        upload (UploadConfirmation): Key of the presigned upload from the request body.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Dish: The updated dish object.
+    """
+    return DishController.confirmDishPhoto(db, dish_id, upload.key)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 
-from database import get_db
+from database import get_db, get_async_db
 from controllers.user import UserController
 from controllers.hawker import HawkerController
 import schemas.hawker as hawker_schemas
 import schemas.stall as stall_schemas
+from schemas.response import Page
 
 router = APIRouter()
 
@@ -39,7 +42,7 @@ def add_hawker(hawker: hawker_schemas.HawkerCreate, db: Session = Depends(get_db
 
 
 @router.get("/hawkers/public", tags=["Hawker (CRUD)"])
-async def getAllPublicHawkers():
+def getAllPublicHawkers():
     """Get all public hawker locations.
 
     Returns:
@@ -69,19 +72,43 @@ def get_all_hawkers(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
     return HawkerController.getAllHawkers(db, skip, limit)
 
 
+@router.get(
+    "/hawkers/page",
+    response_model=Page[hawker_schemas.Hawker],
+    tags=["Hawker (CRUD)"],
+)
+def get_hawkers_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of hawkers using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of hawkers and the cursor of the next page.
+    """
+    return HawkerController.getHawkersPage(db, limit, cursor)
+
+
 @router.get(
     "/hawker/{hawker_id}", response_model=hawker_schemas.Hawker, tags=["Hawker (CRUD)"]
 )
-async def get_hawker_by_hawker_id(hawker_id: str, db: Session = Depends(get_db)):
+async def get_hawker_by_hawker_id(
+    hawker_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get a hawker by their hawker ID.
 
     Args:
-        hawker_id (str): Hawker ID from the path.
-        db (Session, optional): Database session dependency.
+        hawker_id (int): Hawker ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         Hawker: The hawker object.
     """
-    return HawkerController.getHawkerByHawkerId(db, hawker_id)
+    return await HawkerController.getHawkerByHawkerIdAsync(db, hawker_id)
 
 
 @router.get(
@@ -89,16 +116,18 @@ async def get_hawker_by_hawker_id(hawker_id: str, db: Session = Depends(get_db))
     response_model=hawker_schemas.Hawker,
     tags=["Hawker (CRUD)"],
 )
-async def get_hawker_by_user_id(user_id: str, db: Session = Depends(get_db)):
+async def get_hawker_by_user_id(
+    user_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get a hawker by their user ID.
 
     Args:
-        user_id (str): User ID from the path.
-        db (Session, optional): Database session dependency.
+        user_id (int): User ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         Hawker: The hawker object.
     """
-    return HawkerController.getHawkerByUserId(db, user_id)
+    return await HawkerController.getHawkerByUserIdAsync(db, user_id)
 
 
 @router.put(
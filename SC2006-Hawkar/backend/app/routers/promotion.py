@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from database import get_db
 from controllers.promotion import PromotionController
 import schemas.promotion as promotion_schemas
+from schemas.response import Page
 
 router = APIRouter()
 
@@ -43,12 +45,61 @@ def get_all_promotions(skip: int = 0, limit: int = 100, db: Session = Depends(ge
     return PromotionController.getAllPromotions(db, skip, limit)
 
 
+@router.get(
+    "/promotions/page",
+    response_model=Page[promotion_schemas.Promotion],
+    tags=["Promotion (CRUD)"],
+)
+def get_promotions_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of promotions using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of promotions and the cursor of the next page.
+    """
+    return PromotionController.getPromotionsPage(db, limit, cursor)
+
+
+@router.get(
+    "/promotions/active",
+    response_model=list[promotion_schemas.ActiveDeal],
+    tags=["Promotion (CRUD)"],
+)
+def get_active_deals(
+    lat: float = Query(ge=-90, le=90),
+    lng: float = Query(ge=-180, le=180),
+    radius: float = Query(2.0, gt=0, le=50),
+    limit: int = Query(50, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get the promotions running now near a location.
+
+    Args:
+        lat (float): Latitude of the search location.
+        lng (float): Longitude of the search location.
+        radius (float, optional): Search radius in kilometres.
+        limit (int, optional): Maximum number of deals to return.
+        db (Session, optional): Database session dependency.
+
+    Returns:
+        list: Deals with the largest discount first, then the nearest first.
+    """
+    return PromotionController.getActiveDeals(db, lat, lng, radius, limit)
+
+
 @router.get(
     "/promotion/{promotion_id}",
     response_model=promotion_schemas.Promotion,
     tags=["Promotion (CRUD)"],
 )
-async def get_promotion_by_promotion_id(
+def get_promotion_by_promotion_id(
     promotion_id: str, db: Session = Depends(get_db)
 ):
     """Get a promotion by its promotion ID.
@@ -68,7 +119,7 @@ async def get_promotion_by_promotion_id(
     response_model=promotion_schemas.Promotion,
     tags=["Promotion (CRUD)"],
 )
-async def get_promotions_by_dish_id(dish_id: int, db: Session = Depends(get_db)):
+def get_promotions_by_dish_id(dish_id: int, db: Session = Depends(get_db)):
     """Get a promotion by the dish ID.
 
     Args:
@@ -81,6 +132,26 @@ async def get_promotions_by_dish_id(dish_id: int, db: Session = Depends(get_db))
     return PromotionController.getPromotionsByDishId(db, dish_id)
 
 
+@router.get(
+    "/promotions/hawkercenterid/{hawker_center_id}",
+    response_model=list[promotion_schemas.Promotion],
+    tags=["Promotion (CRUD)"],
+)
+def get_active_promotions_by_hawker_center_id(
+    hawker_center_id: int, db: Session = Depends(get_db)
+):
+    """Get the promotions running now at the stalls of a hawker center.
+
+    Args:
+        hawker_center_id (int): Hawker center ID from the path.
+        db (Session, optional): Database session dependency.
+
+    Returns:
+        list: List of active promotion objects.
+    """
+    return PromotionController.getActivePromotionsByHawkerCenterId(db, hawker_center_id)
+
+
 @router.put(
     "/promotion/update",
     response_model=promotion_schemas.Promotion,
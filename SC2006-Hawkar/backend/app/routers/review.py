@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 
-from database import get_db
+from database import get_db, get_async_db
 from controllers.review import ReviewController
 import schemas.review as review_schemas
-from schemas.response import StandardResponse
+from schemas.response import StandardResponse, Page
 
 router = APIRouter()
 
@@ -37,19 +39,43 @@ def get_all_reviewes(skip: int = 0, limit: int = 100, db: Session = Depends(get_
     return ReviewController.getAllReviews(db, skip, limit)
 
 
+@router.get(
+    "/reviews/page",
+    response_model=Page[review_schemas.Review],
+    tags=["Review (CRUD)"],
+)
+def get_reviews_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of reviews using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of reviews and the cursor of the next page.
+    """
+    return ReviewController.getReviewsPage(db, limit, cursor)
+
+
 @router.get(
     "/review/{review_id}", response_model=review_schemas.Review, tags=["Review (CRUD)"]
 )
-async def get_review_by_review_id(review_id: str, db: Session = Depends(get_db)):
+async def get_review_by_review_id(
+    review_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get a review by its review ID.
 
     Args:
-        review_id (str): Review ID from the path.
-        db (Session, optional): Database session dependency.
+        review_id (int): Review ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         Review: The review object.
     """
-    return ReviewController.getReviewByReviewId(db, review_id)
+    return await ReviewController.getReviewByReviewIdAsync(db, review_id)
 
 
 @router.get(
@@ -57,7 +83,7 @@ async def get_review_by_review_id(review_id: str, db: Session = Depends(get_db))
     response_model=list[review_schemas.Review],
     tags=["Review (CRUD)"],
 )
-async def get_review_by_user_id(user_id: str, db: Session = Depends(get_db)):
+def get_review_by_user_id(user_id: str, db: Session = Depends(get_db)):
     """Get all reviews submitted by a specific user.
 
     Args:
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from database import get_db
+from controllers.search import SearchController
+
+import schemas.search as search_schemas
+
+router = APIRouter()
+
+tags_metadata = [
+    {
+        "name": "Search Controller",
+        "description": "API Endpoints for methods implemented by the Search Controller",
+    },
+]
+
+
+@router.get(
+    "/search/{query}",
+    response_model=search_schemas.SearchResult,
+    tags=["Search Controller"],
+)
+def search(query: str, limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+    """Search hawkers, stalls and dishes by name, stalls by cuisine and reviews by text.
+
+    Every word of the query must match. Words match exactly, as a prefix
+    (so results can be shown while typing) or, unless SEARCH_BACKEND is
+    "database", with a typo.
+
+    Args:
+        query (str): The search query string.
+        limit (int, optional): Maximum number of results of each type.
+        db (Session, optional): Database session dependency.
+    Returns:
+        SearchResult: Matching hawkers, stalls, dishes and reviews, best matches first.
+    """
+    return SearchController.getSearchResult(db, query, limit)
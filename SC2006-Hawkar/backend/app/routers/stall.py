@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Union
+from typing import Union, Optional, List
+from datetime import time
 
-from database import get_db
+from database import get_db, get_async_db
 from controllers.stall import StallController
 from controllers.dish import DishController
 from controllers.review import ReviewController
@@ -13,7 +15,12 @@ import schemas.dish as dish_schemas
 import schemas.review as review_schemas
 import schemas.hawkerCenter as hawkerCenter_schemas
 import schemas.likeStall as likeStall_schemas
-from schemas.response import StandardResponse
+from schemas.response import StandardResponse, Page
+from schemas.storage import PresignedUpload, UploadConfirmation
+from schemas.user import CuisineType, HygieneRating
+from services.responseCache import STALLS, HAWKER_CENTERS, cached_response
+import services.etag as etag_services
+from services.etag import conditional_response
 
 
 router = APIRouter()
@@ -33,19 +40,23 @@ tags_metadata = [
 
 @router.get(
     "/stall/{stall_id}/dishes",
-    response_model=list[dish_schemas.DishUpdate],
+    response_model=list[dish_schemas.MenuItem],
     tags=["Stall-Dish"],
 )
-async def get_dish_by_stall_id(stall_id: str, db: Session = Depends(get_db)):
-    """Get all dishes for a given stall ID.
+@conditional_response(list[dish_schemas.MenuItem], etag_services.stall_dishes_version)
+@cached_response(list[dish_schemas.MenuItem], tags=["stall:{stall_id}:dishes"])
+async def get_dish_by_stall_id(
+    stall_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    """Get the menu of a stall: its dishes with their active promotion.
 
     Args:
-        stall_id (str): Stall ID from the path.
-        db (Session, optional): Database session dependency.
+        stall_id (int): Stall ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
-        list: List of dish objects for the stall.
+        list: List of menu items for the stall.
     """
-    return DishController.getDishesByStallId(db, stall_id)
+    return await DishController.getDishesByStallIdAsync(db, stall_id)
 
 
 @router.post(
@@ -115,16 +126,20 @@ def delete_dish(dish_id: int, db: Session = Depends(get_db)):
     response_model=list[review_schemas.Review],
     tags=["Stall-Review"],
 )
-async def get_review_by_stall_id(stall_id: str, db: Session = Depends(get_db)):
+@conditional_response(list[review_schemas.Review], etag_services.stall_reviews_version)
+@cached_response(list[review_schemas.Review], tags=["stall:{stall_id}:reviews"])
+async def get_review_by_stall_id(
+    stall_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get all reviews for a given stall ID.
 
     Args:
-        stall_id (str): Stall ID from the path.
-        db (Session, optional): Database session dependency.
+        stall_id (int): Stall ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         list: List of review objects for the stall.
     """
-    return ReviewController.getReviewsByStallId(db, stall_id)
+    return await ReviewController.getReviewsByStallIdAsync(db, stall_id)
 
 
 @router.post(
@@ -208,23 +223,142 @@ def get_liked_stalls(user_id: int, db: Session = Depends(get_db)):
     return liked_stalls
 
 
+@router.get(
+    "/stall/{user_id}/liked/ids",
+    response_model=list[int],
+    tags=["Stall-Like"],
+)
+def get_liked_stall_ids(
+    user_id: int,
+    stallID: List[int] = Query(..., max_length=500),
+    db: Session = Depends(get_db),
+):
+    """Find which of the given stalls a user has liked.
+
+    Stall IDs are repeated in the query string, e.g. ``?stallID=7&stallID=8``.
+
+    Args:
+        user_id (int): User ID from the path.
+        stallID (List[int]): Stall IDs to check.
+        db (Session, optional): Database session dependency.
+    Returns:
+        list: IDs of the given stalls liked by the user.
+    """
+    return StallController.getLikedStallIDs(db, user_id, stallID)
+
+
 # ------------------------------------------------------------ #
 # -------------------- Stall (CRUD) ------------------------- #
 # ------------------------------------------------------------ #
 
 
+def get_stall_filters(
+    cuisineType: Optional[List[CuisineType]] = Query(None),
+    hygieneRating: Optional[List[HygieneRating]] = Query(None),
+    priceRange: Optional[List[str]] = Query(None),
+    openNow: bool = False,
+    openAt: Optional[time] = None,
+    maxWaitTime: Optional[int] = Query(None, ge=0),
+    hawkerCenterID: Optional[int] = None,
+    sortBy: stall_schemas.StallSortKey = stall_schemas.StallSortKey.ID,
+    order: stall_schemas.SortOrder = stall_schemas.SortOrder.ASC,
+    userID: Optional[int] = None,
+) -> stall_schemas.StallFilter:
+    """Collect the stall filter and sort options from the query string.
+
+    List filters may be repeated, e.g. ``?cuisineType=Thai&cuisineType=Malay``.
+    Pass ``userID`` to have likedByMe set on each stall for that user.
+
+    Returns:
+        StallFilter: Filter and sort options for stall listings.
+    """
+    return stall_schemas.StallFilter(
+        cuisineType=cuisineType,
+        hygieneRating=hygieneRating,
+        priceRange=priceRange,
+        openNow=openNow,
+        openAt=openAt,
+        maxWaitTime=maxWaitTime,
+        hawkerCenterID=hawkerCenterID,
+        sortBy=sortBy,
+        order=order,
+        userID=userID,
+    )
+
+
 @router.get("/stalls", response_model=list[stall_schemas.Stall], tags=["Stall (CRUD)"])
-def get_all_stalls(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all stalls with pagination.
+@conditional_response(list[stall_schemas.Stall], etag_services.stalls_version)
+@cached_response(list[stall_schemas.Stall], tags=[STALLS])
+def get_all_stalls(
+    filters: stall_schemas.StallFilter = Depends(get_stall_filters),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    """Get all stalls matching the given filters with pagination.
 
     Args:
+        filters (StallFilter): Filter and sort options from the query string.
         skip (int, optional): Number of records to skip.
         limit (int, optional): Maximum number of records to return.
         db (Session, optional): Database session dependency.
     Returns:
         list: List of stall objects.
     """
-    return StallController.getAllStalls(db, skip, limit)
+    return StallController.getAllStalls(db, skip, limit, filters)
+
+
+@router.get(
+    "/stalls/page",
+    response_model=Page[stall_schemas.Stall],
+    tags=["Stall (CRUD)"],
+)
+@conditional_response(Page[stall_schemas.Stall], etag_services.stalls_version)
+def get_stalls_page(
+    filters: stall_schemas.StallFilter = Depends(get_stall_filters),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of the stalls matching the given filters using cursor pagination.
+
+    Args:
+        filters (StallFilter): Filter and sort options from the query string.
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of stalls and the cursor of the next page.
+    """
+    return StallController.getStallsPage(db, limit, cursor, filters)
+
+
+@router.get(
+    "/hawker-centers/nearby",
+    response_model=list[stall_schemas.NearbyHawkerCenter],
+    tags=["Hawker Center"],
+)
+def get_nearby_hawker_centers(
+    lat: float = Query(ge=-90, le=90),
+    lng: float = Query(ge=-180, le=180),
+    radius: float = Query(2.0, gt=0, le=50),
+    k: int = Query(10, ge=1, le=50),
+    openAt: Optional[time] = None,
+    db: Session = Depends(get_db),
+):
+    """Get the hawker centers nearest to a location, with their open stalls.
+
+    Args:
+        lat (float): Latitude of the search location.
+        lng (float): Longitude of the search location.
+        radius (float, optional): Search radius in kilometres.
+        k (int, optional): Maximum number of hawker centers to return.
+        openAt (time, optional): Time the stalls must be open at. Defaults to now.
+        db (Session, optional): Database session dependency.
+    Returns:
+        list: Hawker centers nearest first, each with its distance and open stalls.
+    """
+    return StallController.getNearbyHawkerCenters(db, lat, lng, radius, k, openAt)
 
 
 @router.get(
@@ -232,7 +366,11 @@ def get_all_stalls(skip: int = 0, limit: int = 100, db: Session = Depends(get_db
     response_model=list[hawkerCenter_schemas.HawkerCenter],
     tags=["Hawker Center"],
 )
-async def get_all_hawker_centers(
+@conditional_response(
+    list[hawkerCenter_schemas.HawkerCenter], etag_services.hawker_centers_version
+)
+@cached_response(list[hawkerCenter_schemas.HawkerCenter], tags=[HAWKER_CENTERS])
+def get_all_hawker_centers(
     skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
 ):
     """Get all hawker centers with pagination.
@@ -255,16 +393,20 @@ async def get_all_hawker_centers(
 @router.get(
     "/stall/{stall_id}", response_model=stall_schemas.Stall, tags=["Stall (CRUD)"]
 )
-async def get_stall_by_stall_id(stall_id: str, db: Session = Depends(get_db)):
+@conditional_response(stall_schemas.Stall, etag_services.stall_version, last_modified=True)
+@cached_response(stall_schemas.Stall, tags=["stall:{stall_id}"])
+async def get_stall_by_stall_id(
+    stall_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get a stall by its ID.
 
     Args:
-        stall_id (str): Stall ID from the path.
-        db (Session, optional): Database session dependency.
+        stall_id (int): Stall ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         Stall: Stall object.
     """
-    return StallController.getStallByStallId(db, stall_id)
+    return await StallController.getStallByStallIdAsync(db, stall_id)
 
 
 @router.get(
@@ -272,16 +414,18 @@ async def get_stall_by_stall_id(stall_id: str, db: Session = Depends(get_db)):
     response_model=list[stall_schemas.Stall],
     tags=["Stall (CRUD)"],
 )
-async def get_stall_by_hawker_id(hawker_id: str, db: Session = Depends(get_db)):
+async def get_stall_by_hawker_id(
+    hawker_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get all stalls for a given hawker center ID.
 
     Args:
-        hawker_id (str): Hawker center ID from the path.
-        db (Session, optional): Database session dependency.
+        hawker_id (int): Hawker center ID from the path.
+        db (AsyncSession, optional): Async database session dependency.
     Returns:
         list: List of stall objects for the hawker center.
     """
-    return StallController.getStallByHawkerId(db, hawker_id)
+    return await StallController.getStallByHawkerIdAsync(db, hawker_id)
 
 
 @router.get(
@@ -289,7 +433,12 @@ async def get_stall_by_hawker_id(hawker_id: str, db: Session = Depends(get_db)):
     response_model=hawkerCenter_schemas.HawkerCenter,
     tags=["Stall (CRUD)"],
 )
-async def get_hawker_center_by_stall_id(stall_id: str, db: Session = Depends(get_db)):
+@conditional_response(
+    hawkerCenter_schemas.HawkerCenter,
+    etag_services.stall_hawker_center_version,
+    last_modified=True,
+)
+def get_hawker_center_by_stall_id(stall_id: str, db: Session = Depends(get_db)):
     """Get the hawker center for a given stall ID.
 
     Args:
@@ -347,6 +496,68 @@ def update_stall(
     return StandardResponse(success=True, message="Stall updated successfully")
 
 
+@router.post(
+    "/stall/{stall_id}/images",
+    response_model=stall_schemas.Stall,
+    tags=["Stall (CRUD)"],
+)
+def add_stall_images(
+    stall_id: int, images: list[UploadFile], db: Session = Depends(get_db)
+):
+    """Add images to a stall with a multipart/form-data upload.
+
+    The files are streamed to object storage instead of being sent as base64 in JSON.
+
+    Args:
+        stall_id (int): Stall ID from the path.
+        images (list[UploadFile]): Image files from the form.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Stall: The updated stall object.
+    """
+    return StallController.addStallImages(db, stall_id, images)
+
+
+@router.post(
+    "/stall/{stall_id}/images/presign",
+    response_model=PresignedUpload,
+    tags=["Stall (CRUD)"],
+)
+def presign_stall_image(stall_id: int, db: Session = Depends(get_db)):
+    """Mint a presigned URL to upload a stall image to object storage directly.
+
+    PUT the image to uploadUrl, then confirm it with its key at
+    /stall/{stall_id}/images/confirm, so the image never passes through the API.
+
+    Args:
+        stall_id (int): Stall ID from the path.
+        db (Session, optional): Database session dependency.
+    Returns:
+        PresignedUpload: The URL to upload to and the key to confirm.
+    """
+    return StallController.presignStallImage(db, stall_id)
+
+
+@router.post(
+    "/stall/{stall_id}/images/confirm",
+    response_model=stall_schemas.Stall,
+    tags=["Stall (CRUD)"],
+)
+def confirm_stall_image(
+    stall_id: int, upload: UploadConfirmation, db: Session = Depends(get_db)
+):
+    """Add an image uploaded with a presigned URL to a stall.
+
+    Args:
+        stall_id (int): Stall ID from the path.
+        upload (UploadConfirmation): Key of the presigned upload from the request body.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Stall: The updated stall object.
+    """
+    return StallController.confirmStallImage(db, stall_id, upload.key)
+
+
 @router.delete(
     "/stall/delete/{stall_id}", response_model=StandardResponse, tags=["Stall (CRUD)"]
 )
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from database import get_db
 from controllers.user import UserController
 
 import schemas.user as user_schemas
 import schemas.hawker as hawker_schemas
+from schemas.response import Page
+from schemas.storage import PresignedUpload, UploadConfirmation
 
 router = APIRouter()
 
@@ -23,7 +26,7 @@ tags_metadata = [
 # -------------------------------------------------------- #
 # ---------- User ---------- #
 @router.post("/user-controller/create-user", tags=["User Controller"])
-async def create_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+def create_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
     """Create a new user in the system.
 
     Args:
@@ -63,7 +66,7 @@ async def create_user(user: user_schemas.UserCreate, db: Session = Depends(get_d
     response_model=list[user_schemas.User],
     tags=["User (CRUD)"],
 )
-async def get_all_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_all_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get all users with pagination.
 
     Args:
@@ -76,12 +79,34 @@ async def get_all_users(skip: int = 0, limit: int = 100, db: Session = Depends(g
     return UserController.getAllUsers(db, skip, limit)
 
 
+@router.get(
+    "/users/page",
+    response_model=Page[user_schemas.User],
+    tags=["User (CRUD)"],
+)
+def get_users_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get one page of users using cursor pagination.
+
+    Args:
+        cursor (str, optional): nextCursor returned with the previous page.
+        limit (int, optional): Maximum number of records to return.
+        db (Session, optional): Database session dependency.
+    Returns:
+        Page: Page of users and the cursor of the next page.
+    """
+    return UserController.getUsersPage(db, limit, cursor)
+
+
 @router.get(
     "/user/{userID}",
     response_model=user_schemas.User,
     tags=["User (CRUD)"],
 )
-async def get_user_by_id(userID: str, db: Session = Depends(get_db)):
+def get_user_by_id(userID: str, db: Session = Depends(get_db)):
     """Get a user by their user ID.
 
     Args:
@@ -96,7 +121,7 @@ async def get_user_by_id(userID: str, db: Session = Depends(get_db)):
 @router.get(
     "/user/email/{email}", response_model=user_schemas.User, tags=["User (CRUD)"]
 )
-async def get_user_by_email(email: str, db: Session = Depends(get_db)):
+def get_user_by_email(email: str, db: Session = Depends(get_db)):
     """Get a user by their email address.
 
     Args:
@@ -119,3 +144,63 @@ def update_user(user: user_schemas.UserUpdate, db: Session = Depends(get_db)):
         User: The updated user object.
     """
     return UserController.updateUser(db, user)
+
+
+@router.put(
+    "/user/{user_id}/profile-photo",
+    response_model=user_schemas.User,
+    tags=["User (CRUD)"],
+)
+def update_profile_photo(user_id: int, photo: UploadFile, db: Session = Depends(get_db)):
+    """Replace a user's profile photo with a multipart/form-data upload.
+
+    The file is streamed to object storage instead of being sent as base64 in JSON.
+
+    Args:
+        user_id (int): User ID from the path.
+        photo (UploadFile): Image file from the form.
+        db (Session, optional): Database session dependency.
+    Returns:
+        User: The updated user object.
+    """
+    return UserController.updateProfilePhoto(db, user_id, photo)
+
+
+@router.post(
+    "/user/{user_id}/profile-photo/presign",
+    response_model=PresignedUpload,
+    tags=["User (CRUD)"],
+)
+def presign_profile_photo(user_id: int, db: Session = Depends(get_db)):
+    """Mint a presigned URL to upload a profile photo to object storage directly.
+
+    PUT the image to uploadUrl, then confirm it with its key at
+    /user/{user_id}/profile-photo/confirm, so the image never passes through the API.
+
+    Args:
+        user_id (int): User ID from the path.
+        db (Session, optional): Database session dependency.
+    Returns:
+        PresignedUpload: The URL to upload to and the key to confirm.
+    """
+    return UserController.presignProfilePhoto(db, user_id)
+
+
+@router.put(
+    "/user/{user_id}/profile-photo/confirm",
+    response_model=user_schemas.User,
+    tags=["User (CRUD)"],
+)
+def confirm_profile_photo(
+    user_id: int, upload: UploadConfirmation, db: Session = Depends(get_db)
+):
+    """Replace a user's profile photo with an image uploaded with a presigned URL.
+
+    Args:
+        user_id (int): User ID from the path.
+        upload (UploadConfirmation): Key of the presigned upload from the request body.
+        db (Session, optional): Database session dependency.
+    Returns:
+        User: The updated user object.
+    """
+    return UserController.confirmProfilePhoto(db, user_id, upload.key)
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class RouteCacheStats(BaseModel):
+    """
+    Pydantic schema for the response cache's effectiveness on one route.
+
+    Attributes:
+        hits (int): Requests answered from the cache.
+        misses (int): Requests computed from the database.
+        hitRate (float): Share of requests answered from the cache.
+    """
+
+    hits: int
+    misses: int
+    hitRate: float
+
+
+class CacheStats(BaseModel):
+    """
+    Pydantic schema for the response cache's metrics since the process started.
+
+    Attributes:
+        backend (str): "memory", "redis" or "none".
+        ttl (int): Seconds a response is cached for at most.
+        entries (int, optional): Cached responses held, None if the backend cannot tell.
+        invalidations (int): Writes that invalidated cached responses.
+        errors (int): Failed cache reads, writes and invalidations.
+        routes (Dict[str, RouteCacheStats]): Hits and misses per route path.
+    """
+
+    backend: str
+    ttl: int
+    entries: Optional[int] = None
+    invalidations: int
+    errors: int
+    routes: Dict[str, RouteCacheStats]
@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
+from .image import ImageVariants
+
 
 class Dish(BaseModel):
     """
@@ -17,7 +19,9 @@ class Dish(BaseModel):
         dishName (str): The name of the dish.
         price (float): The regular price of the dish.
         photo (str, optional): URL or path to the dish's photo.
+        photoVariants (ImageVariants, optional): Resized variants of the photo.
         onPromotion (bool, optional): Whether the dish is on promotion.
+        updatedAt (datetime, optional): When the dish was last changed.
     """
 
     dishID: int
@@ -25,7 +29,9 @@ class Dish(BaseModel):
     dishName: str
     price: float
     photo: Optional[str] = None
+    photoVariants: Optional[ImageVariants] = None
     onPromotion: Optional[bool] = False
+    updatedAt: Optional[datetime] = None
 
     class ConfigDict:
         from_attributes = True
@@ -87,3 +93,42 @@ class DishUpdate(BaseModel):
     startDate: Optional[datetime] = None
     endDate: Optional[datetime] = None
     discountedPrice: Optional[float] = None
+
+
+class MenuItem(BaseModel):
+    """
+    Pydantic schema for representing a dish on a stall's menu.
+
+    This read model combines a dish with its currently active promotion,
+    if any. The promotion fields are None when no promotion is running.
+
+    Attributes:
+        dishID (int): The unique identifier for the dish.
+        stallID (int, optional): The ID of the stall offering this dish.
+        dishName (str): The name of the dish.
+        price (float): The regular price of the dish.
+        photo (str, optional): URL or path to the dish's photo.
+        photoVariants (ImageVariants, optional): Resized variants of the photo.
+        onPromotion (bool, optional): Whether the dish is on promotion.
+        updatedAt (datetime, optional): When the dish was last changed.
+        promotionID (int, optional): ID of the active promotion.
+        startDate (datetime, optional): When the active promotion began.
+        endDate (datetime, optional): When the active promotion ends.
+        discountedPrice (float, optional): Price during the active promotion.
+    """
+
+    dishID: int
+    stallID: Optional[int] = None
+    dishName: Optional[str] = None
+    price: Optional[float] = None
+    photo: Optional[str] = None
+    photoVariants: Optional[ImageVariants] = None
+    onPromotion: Optional[bool] = False
+    updatedAt: Optional[datetime] = None
+    promotionID: Optional[int] = None
+    startDate: Optional[datetime] = None
+    endDate: Optional[datetime] = None
+    discountedPrice: Optional[float] = None
+
+    class ConfigDict:
+        from_attributes = True
@@ -1,4 +1,6 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
 
 
 class HawkerCenter(BaseModel):
@@ -14,6 +16,7 @@ class HawkerCenter(BaseModel):
         address (str): Physical address of the hawker center.
         latitude (float): Geographic latitude coordinate.
         longitude (float): Geographic longitude coordinate.
+        updatedAt (datetime, optional): When the hawker center was last changed.
     """
 
     hawkerCenterID: int
@@ -21,6 +24,7 @@ class HawkerCenter(BaseModel):
     address: str
     latitude: float
     longitude: float
+    updatedAt: Optional[datetime] = None
 
     class ConfigDict:
         from_attributes = True
@@ -64,3 +68,18 @@ class HawkerCenterUpdate(BaseModel):
     address: str
     latitude: float
     longitude: float
+
+
+class HawkerCenterImportReport(BaseModel):
+    """
+    Pydantic schema for the outcome of a hawker center GeoJSON import.
+
+    Attributes:
+        inserted (int): Number of new hawker centers.
+        updated (int): Number of existing hawker centers whose details changed.
+        skipped (int): Number of unchanged, duplicate or malformed records.
+    """
+
+    inserted: int
+    updated: int
+    skipped: int
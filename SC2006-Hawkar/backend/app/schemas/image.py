@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class ImageVariants(BaseModel):
+    """
+    Pydantic schema for the resized variants of an uploaded image.
+
+    Variants are WebP images stored next to the original, scaled down
+    to fit the given size. Images smaller than that are not enlarged.
+
+    Attributes:
+        thumbnail (str): URL of the variant at most 320 pixels wide and high.
+        medium (str): URL of the variant at most 1024 pixels wide and high.
+    """
+
+    thumbnail: str
+    medium: str
@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
+from .image import ImageVariants
+
 
 class Promotion(BaseModel):
     """
@@ -17,6 +19,8 @@ class Promotion(BaseModel):
         startDate (datetime): When the promotion begins.
         endDate (datetime): When the promotion ends.
         discountedPrice (float): The special promotional price.
+        isActive (bool, optional): Whether the promotion is running now.
+        updatedAt (datetime, optional): When the promotion was last changed.
     """
 
     promotionID: int
@@ -24,6 +28,8 @@ class Promotion(BaseModel):
     startDate: datetime
     endDate: datetime
     discountedPrice: float
+    isActive: Optional[bool] = False
+    updatedAt: Optional[datetime] = None
 
     class ConfigDict:
         from_attributes = True
@@ -68,3 +74,43 @@ class PromotionUpdate(BaseModel):
     startDate: Optional[datetime] = None
     endDate: Optional[datetime] = None
     discountedPrice: Optional[float] = None
+
+
+class ActiveDeal(BaseModel):
+    """
+    Pydantic schema for a promotion running near a location.
+
+    This read model combines an active promotion with its dish, stall and
+    hawker center, for the active deals feed.
+
+    Attributes:
+        promotionID (int): The unique identifier for the promotion.
+        discountedPrice (float): The special promotional price.
+        discountPercent (float): Discount off the regular price, in percent.
+        endDate (datetime): When the promotion ends.
+        dishID (int): The ID of the dish on promotion.
+        dishName (str): The name of the dish.
+        price (float): The regular price of the dish.
+        photo (str, optional): URL or path to the dish's photo.
+        photoVariants (ImageVariants, optional): Resized variants of the photo.
+        stallID (int): The ID of the stall selling the dish.
+        stallName (str): The name of the stall.
+        hawkerCenterID (int): The ID of the stall's hawker center.
+        hawkerCenterName (str): The name of the hawker center.
+        distance (float): Great-circle distance from the search location in kilometres.
+    """
+
+    promotionID: int
+    discountedPrice: float
+    discountPercent: float
+    endDate: datetime
+    dishID: int
+    dishName: Optional[str] = None
+    price: Optional[float] = None
+    photo: Optional[str] = None
+    photoVariants: Optional[ImageVariants] = None
+    stallID: int
+    stallName: Optional[str] = None
+    hawkerCenterID: int
+    hawkerCenterName: Optional[str] = None
+    distance: float
@@ -1,4 +1,8 @@
 from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+
+T = TypeVar("T")
 
 
 class StandardResponse(BaseModel):
@@ -16,3 +20,20 @@ class StandardResponse(BaseModel):
 
     success: bool
     message: str
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    Pydantic schema for one page of a cursor-paginated list.
+
+    Pass nextCursor back as the cursor query parameter to fetch the
+    following page. Cursors are opaque and only valid for the same
+    endpoint and sort order.
+
+    Attributes:
+        items (List[T]): Records on this page.
+        nextCursor (str, optional): Cursor of the next page, or None on the last page.
+    """
+
+    items: List[T]
+    nextCursor: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 from enum import Enum
 
 from .consumer import Consumer
@@ -61,6 +62,7 @@ class Review(BaseModel):
         consumer (Consumer): Nested Consumer schema with consumer details.
         stallID (int): The ID of the stall being reviewed.
         stall (Stall): Nested Stall schema with stall details.
+        updatedAt (datetime, optional): When the review was last changed.
     """
 
     reviewID: int
@@ -76,6 +78,8 @@ class Review(BaseModel):
     stallID: int
     stall: Stall
 
+    updatedAt: Optional[datetime] = None
+
     class ConfigDict:
         from_attributes = True
 
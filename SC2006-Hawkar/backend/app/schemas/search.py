@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List
+
+from .hawker import Hawker
+from .stall import Stall
+from .dish import Dish
+from .review import Review
+
+
+class SearchResult(BaseModel):
+    """
+    Pydantic schema for the results of a search.
+
+    Each list holds the best matches first.
+
+    Attributes:
+        hawkers (List[Hawker]): Hawkers whose name matches the query.
+        stalls (List[Stall]): Stalls whose name or cuisine matches the query.
+        dishes (List[Dish]): Dishes whose name matches the query.
+        reviews (List[Review]): Reviews whose text matches the query.
+    """
+
+    hawkers: List[Hawker] = []
+    stalls: List[Stall] = []
+    dishes: List[Dish] = []
+    reviews: List[Review] = []
@@ -1,13 +1,50 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from enum import Enum
-from datetime import time
+from datetime import datetime, time
 
 from .hawker import Hawker
 from .hawkerCenter import HawkerCenter
+from .image import ImageVariants
 from .user import CuisineType, HygieneRating
 
 
+class StallSortKey(Enum):
+    """
+    Enumeration for the columns stall listings can be sorted by.
+
+    Attributes:
+        ID: Sort by stall ID (insertion order).
+        NAME: Sort alphabetically by stall name.
+        HYGIENE: Sort by hygiene rating, best first when ascending.
+        WAIT_TIME: Sort by estimated waiting time.
+        OPENING_TIME: Sort by daily opening time.
+        RATING: Sort by average rating; stalls without reviews count as 0.
+        RATING_COUNT: Sort by number of reviews.
+    """
+
+    ID = "stallID"
+    NAME = "stallName"
+    HYGIENE = "hygieneRating"
+    WAIT_TIME = "estimatedWaitTime"
+    OPENING_TIME = "startTime"
+    RATING = "averageRating"
+    RATING_COUNT = "ratingCount"
+
+
+class SortOrder(Enum):
+    """
+    Enumeration for sort directions.
+
+    Attributes:
+        ASC: Ascending order.
+        DESC: Descending order.
+    """
+
+    ASC = "asc"
+    DESC = "desc"
+
+
 class Stall(BaseModel):
     """
     Pydantic schema for representing a food stall.
@@ -24,6 +61,7 @@ class Stall(BaseModel):
         hawkerCenterID (int, optional): The ID of the hawker center where this stall is located.
         hawkerCenter (HawkerCenter): Nested HawkerCenter schema with center details.
         images (List[str], optional): URLs or paths to stall images.
+        imageVariants (List[ImageVariants]): Resized variants of each image, None for external images.
         unitNumber (str, optional): The unit number within the hawker center.
         startTime (time, optional): Daily opening time.
         endTime (time, optional): Daily closing time.
@@ -31,6 +69,13 @@ class Stall(BaseModel):
         cuisineType (List[CuisineType], optional): Types of cuisine offered.
         estimatedWaitTime (int, optional): Estimated waiting time in minutes.
         priceRange (str, optional): Indication of the price range of dishes.
+        ratingCount (int): Number of reviews of the stall.
+        averageRating (float): Average review rating, or 0 if there are no reviews.
+        ratingHistogram (List[int]): Number of 1, 2, 3, 4 and 5 star reviews.
+        lastReviewedAt (datetime, optional): When the stall was last reviewed.
+        likeCount (int): Number of users who liked the stall.
+        likedByMe (bool, optional): Whether the user given in the request liked the stall.
+        updatedAt (datetime, optional): When the stall was last changed.
     """
 
     stallID: int
@@ -40,6 +85,7 @@ class Stall(BaseModel):
     hawkerCenterID: Optional[int] = None
     hawkerCenter: HawkerCenter
     images: Optional[List[str]] = None
+    imageVariants: List[Optional[ImageVariants]] = []
     unitNumber: Optional[str] = None
     startTime: Optional[time] = None
     endTime: Optional[time] = None
@@ -47,6 +93,13 @@ class Stall(BaseModel):
     cuisineType: Optional[List[CuisineType]] = None
     estimatedWaitTime: Optional[int] = None
     priceRange: Optional[str] = None
+    ratingCount: int = 0
+    averageRating: float = 0
+    ratingHistogram: List[int] = [0, 0, 0, 0, 0]
+    lastReviewedAt: Optional[datetime] = None
+    likeCount: int = 0
+    likedByMe: Optional[bool] = None
+    updatedAt: Optional[datetime] = None
 
     class ConfigDict:
         from_attributes = True
@@ -120,3 +173,48 @@ class StallUpdate(BaseModel):
     cuisineType: Optional[List[CuisineType]] = None
     estimatedWaitTime: Optional[int] = None
     priceRange: Optional[str] = None
+
+
+class StallFilter(BaseModel):
+    """
+    Pydantic schema for the filter, sort and annotation options of stall listings.
+
+    All filters are optional and combined with AND. Filters taking a list
+    match stalls having any of the given values.
+
+    Attributes:
+        cuisineType (List[CuisineType], optional): Cuisines the stall must offer at least one of.
+        hygieneRating (List[HygieneRating], optional): Accepted hygiene ratings.
+        priceRange (List[str], optional): Accepted price ranges.
+        openNow (bool): Only return stalls open at the current time.
+        openAt (time, optional): Only return stalls open at the given time of day.
+        maxWaitTime (int, optional): Maximum estimated waiting time in minutes.
+        hawkerCenterID (int, optional): Only return stalls in this hawker center.
+        sortBy (StallSortKey): Column to sort by.
+        order (SortOrder): Sort direction.
+        userID (int, optional): Set likedByMe on each stall for this user.
+    """
+
+    cuisineType: Optional[List[CuisineType]] = None
+    hygieneRating: Optional[List[HygieneRating]] = None
+    priceRange: Optional[List[str]] = None
+    openNow: bool = False
+    openAt: Optional[time] = None
+    maxWaitTime: Optional[int] = Field(default=None, ge=0)
+    hawkerCenterID: Optional[int] = None
+    sortBy: StallSortKey = StallSortKey.ID
+    order: SortOrder = SortOrder.ASC
+    userID: Optional[int] = None
+
+
+class NearbyHawkerCenter(HawkerCenter):
+    """
+    Pydantic schema for a hawker center returned by a nearby search.
+
+    Attributes:
+        distance (float): Great-circle distance from the search location in kilometres.
+        openStalls (List[Stall]): Stalls in the hawker center that are currently open.
+    """
+
+    distance: float
+    openStalls: List[Stall] = []
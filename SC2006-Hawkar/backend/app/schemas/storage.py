@@ -0,0 +1,68 @@
+from pydantic import BaseModel
+from typing import Dict
+from datetime import datetime
+
+
+class BucketSweepReport(BaseModel):
+    """
+    Pydantic schema for the outcome of sweeping one bucket for orphaned objects.
+
+    Attributes:
+        scanned (int): Number of objects listed.
+        orphaned (int): Number of objects no database row references.
+        deleted (int): Number of orphaned objects deleted.
+        bytesFreed (int): Size of the deleted objects, or of the orphaned objects in a dry run.
+        errors (int): Number of orphaned objects that could not be deleted.
+    """
+
+    scanned: int
+    orphaned: int
+    deleted: int
+    bytesFreed: int
+    errors: int
+
+
+class StorageSweepReport(BaseModel):
+    """
+    Pydantic schema for the outcome of sweeping object storage for orphaned objects.
+
+    Attributes:
+        dryRun (bool): Whether orphaned objects were only counted.
+        buckets (Dict[str, BucketSweepReport]): Outcome per bucket.
+        durationSeconds (float): Duration of the sweep.
+    """
+
+    dryRun: bool
+    buckets: Dict[str, BucketSweepReport]
+    durationSeconds: float
+
+
+class PresignedUpload(BaseModel):
+    """
+    Pydantic schema for a presigned URL an image can be uploaded to directly.
+
+    The client PUTs the image to uploadUrl before expiresAt, then confirms the
+    upload with its key, which records url on the stall, dish or user.
+
+    Attributes:
+        uploadUrl (str): URL to PUT the image to.
+        key (str): Object name of the upload, sent back to confirm it.
+        url (str): URL the image is served from once confirmed.
+        expiresAt (datetime): Time after which uploadUrl no longer accepts uploads.
+    """
+
+    uploadUrl: str
+    key: str
+    url: str
+    expiresAt: datetime
+
+
+class UploadConfirmation(BaseModel):
+    """
+    Pydantic schema for confirming an image uploaded with a presigned URL.
+
+    Attributes:
+        key (str): Key of the presigned upload.
+    """
+
+    key: str
@@ -2,6 +2,8 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional, Dict, Literal, Any
 from enum import Enum
 
+from .image import ImageVariants
+
 
 class Role(Enum):
     ADMIN = "Admin"
@@ -93,6 +95,7 @@ class User(UserBase):
     Attributes:
         userID (int): The unique identifier for the user.
         profilePhoto (str, optional): URL or path to user's profile photo.
+        profilePhotoVariants (ImageVariants, optional): Resized variants of the profile photo.
         contactNumber (str, optional): User's contact phone number.
         role (Role): User's role in the system (Admin, Consumer, or Hawker).
         isGoogleUser (bool): Whether the user authenticated via Google OAuth.
@@ -100,6 +103,7 @@ class User(UserBase):
 
     userID: int
     profilePhoto: Optional[str] = ""
+    profilePhotoVariants: Optional[ImageVariants] = None
     contactNumber: Optional[str] = ""
     role: Role
     isGoogleUser: bool = False
@@ -5,6 +5,7 @@ import schemas.admin as admin_schemas
 import schemas.user as user_schemas
 from models.admin import Admin
 from models.user import User
+from services.loadingProfile import with_loading_profile
 
 
 def get_admin_by_user_id(db: Session, userID: int):
@@ -17,7 +18,11 @@ def get_admin_by_user_id(db: Session, userID: int):
     Returns:
         Admin: The admin object, or None if not found.
     """
-    return db.query(Admin).filter(Admin.userID == userID).first()
+    return (
+        with_loading_profile(db.query(Admin), admin_schemas.Admin)
+        .filter(Admin.userID == userID)
+        .first()
+    )
 
 
 def get_admin_by_admin_id(db: Session, adminID: int):
@@ -30,7 +35,11 @@ def get_admin_by_admin_id(db: Session, adminID: int):
     Returns:
         Admin: The admin object, or None if not found.
     """
-    return db.query(Admin).filter(Admin.adminID == adminID).first()
+    return (
+        with_loading_profile(db.query(Admin), admin_schemas.Admin)
+        .filter(Admin.adminID == adminID)
+        .first()
+    )
 
 
 def get_all_admins(db: Session, skip: int = 0, limit: int = 100):
@@ -44,7 +53,12 @@ def get_all_admins(db: Session, skip: int = 0, limit: int = 100):
     Returns:
         list: List of admins.
     """
-    return db.query(Admin).offset(skip).limit(limit).all()
+    return (
+        with_loading_profile(db.query(Admin), admin_schemas.Admin)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
 
 def create_admin(db: Session, user: admin_schemas.AdminCreate):
@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
 
 import services.user as user_services
+import services.responseCache as cache_services
+import services.etag as etag_services
 import schemas.consumer as consumer_schemas
 import schemas.user as user_schemas
 from models.consumer import Consumer
 from models.user import User
+from services.loadingProfile import with_loading_profile
+from services.pagination import paginate
 
 
 def convert_favorite_stalls_to_list(favorite_stalls):
@@ -42,7 +46,11 @@ def get_consumer_by_user_id(db: Session, userID: int):
     Returns:
         Consumer: The consumer object, or None if not found.
     """
-    consumer = db.query(Consumer).filter(Consumer.userID == userID).first()
+    consumer = (
+        with_loading_profile(db.query(Consumer), consumer_schemas.Consumer)
+        .filter(Consumer.userID == userID)
+        .first()
+    )
     if consumer is None:
         return None
 
@@ -59,7 +67,11 @@ def get_consumer_by_consumer_id(db: Session, consumerID: int):
     Returns:
         Consumer: The consumer object, or None if not found.
     """
-    consumer = db.query(Consumer).filter(Consumer.consumerID == consumerID).first()
+    consumer = (
+        with_loading_profile(db.query(Consumer), consumer_schemas.Consumer)
+        .filter(Consumer.consumerID == consumerID)
+        .first()
+    )
     if consumer is None:
         return None
 
@@ -77,7 +89,12 @@ def get_all_consumers(db: Session, skip: int = 0, limit: int = 100):
     Returns:
         list: List of consumers, or None if none found.
     """
-    consumers = db.query(Consumer).offset(skip).limit(limit).all()
+    consumers = (
+        with_loading_profile(db.query(Consumer), consumer_schemas.Consumer)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
     if consumers is None:
         return None
     # for consumer in consumers:
@@ -85,6 +102,20 @@ def get_all_consumers(db: Session, skip: int = 0, limit: int = 100):
     return consumers
 
 
+def get_consumers_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of consumers in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of consumers and the cursor of the next page.
+    """
+    query = with_loading_profile(db.query(Consumer), consumer_schemas.Consumer)
+    return paginate(query, [(Consumer.consumerID, False)], limit, cursor)
+
+
 def create_consumer(db: Session, user: consumer_schemas.ConsumerCreate):
     """Create a new consumer and associated user.
 
@@ -164,10 +195,12 @@ def update_consumer(db: Session, updated_consumer: consumer_schemas.ConsumerUpda
 
     for key, value in updated_consumer_data.items():
         setattr(db_consumer, key, value)
+    etag_services.touch_user(db, db_user.userID)
 
     db.add(db_consumer)
     db.commit()
     db.refresh(db_consumer)
+    cache_services.invalidate_all()
 
     # db_consumer.favoriteStalls = convert_favorite_stalls_to_list(db_consumer.favoriteStalls)
     return db_consumer
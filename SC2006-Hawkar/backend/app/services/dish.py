@@ -1,5 +1,7 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 
 import schemas.dish as dish_schemas
 import schemas.promotion as promotion_schemas
@@ -7,7 +9,12 @@ from models.dish import Dish
 from models.stall import Stall
 from models.promotion import Promotion
 import services.promotion as promotion_services
-from services.objectStorage import ObjectStorage
+import services.promotionScheduler as promotion_scheduler
+import services.responseCache as cache_services
+import services.search as search_services
+from services.imageVariants import variant_urls
+from services.objectStorage import ObjectStorage, check_image_upload
+from services.pagination import paginate
 
 
 def get_dish_by_dish_id(db: Session, dishID: int):
@@ -29,32 +36,93 @@ def get_dish_by_dish_id(db: Session, dishID: int):
     return db_dish
 
 
+async def get_dish_by_dish_id_async(db: AsyncSession, dishID: int):
+    """Retrieve a dish by its dish ID without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        dishID (int): ID of the dish.
+    Raises:
+        HTTPException: If the dish is not found.
+    Returns:
+        Dish: The dish object.
+    """
+    db_dish = await db.get(Dish, dishID)
+
+    if not db_dish:
+        raise HTTPException(status_code=404, detail="Dish not found")
+
+    return db_dish
+
+
+def menu_statement(stallID: int):
+    """Build the statement selecting a stall's dishes with their active promotion.
+
+    Promotions are active while Promotion.isActive is set by
+    services.promotionScheduler. If several are, the dish gets the earliest
+    created one.
+
+    Args:
+        stallID (int): ID of the stall.
+    Returns:
+        Select: Statement of one row per dish, in dish ID order.
+    """
+    active_promotion = (
+        select(func.min(Promotion.promotionID))
+        .where(Promotion.dishID == Dish.dishID, Promotion.isActive.is_(True))
+        .correlate(Dish)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Dish.dishID,
+            Dish.stallID,
+            Dish.dishName,
+            Dish.price,
+            Dish.photo,
+            Dish.onPromotion,
+            Dish.updatedAt,
+            Promotion.promotionID,
+            Promotion.startDate,
+            Promotion.endDate,
+            Promotion.discountedPrice,
+        )
+        .outerjoin(Promotion, Promotion.promotionID == active_promotion)
+        .where(Dish.stallID == stallID)
+        .order_by(Dish.dishID)
+    )
+
+
+def _menu_items(rows) -> list:
+    return [
+        dish_schemas.MenuItem(**row._mapping, photoVariants=variant_urls(row.photo))
+        for row in rows
+    ]
+
+
 def get_dishes_by_stall_id(db: Session, stallID: int):
-    """Retrieve all dishes for a given stall ID.
+    """Retrieve the menu of a stall: its dishes with their active promotion,
+    in a single query.
 
     Args:
         db (Session): Database session.
         stallID (int): ID of the stall.
     Returns:
-        list: List of dishes for the stall (empty if none found).
+        list: List of MenuItems for the stall (empty if none found).
     """
-    db_dishes = db.query(Dish).filter(Dish.stallID == stallID).all()
-
-    if not db_dishes:
-        # Return empty list instead of error if no dishes found
-        return []
-
-    # Enhance dishes with promotion details
-    for dish in db_dishes:
-        if dish.onPromotion:
-            promotion = promotion_services.get_promotions_by_dish_id(db, dish.dishID)
-            if promotion:
-                # Add promotion details to the dish
-                dish.startDate = promotion.startDate
-                dish.endDate = promotion.endDate
-                dish.discountedPrice = promotion.discountedPrice
+    return _menu_items(db.execute(menu_statement(stallID)))
 
-    return db_dishes
+
+async def get_dishes_by_stall_id_async(db: AsyncSession, stallID: int):
+    """Retrieve the menu of a stall without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        stallID (int): ID of the stall.
+    Returns:
+        list: List of MenuItems for the stall (empty if none found).
+    """
+    return _menu_items(await db.execute(menu_statement(stallID)))
 
 
 def get_all_dishes(db: Session, skip: int = 0, limit: int = 100):
@@ -72,6 +140,20 @@ def get_all_dishes(db: Session, skip: int = 0, limit: int = 100):
     return db_dishes
 
 
+def get_dishes_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of dishes in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of dishes and the cursor of the next page.
+    """
+    query = db.query(Dish)
+    return paginate(query, [(Dish.dishID, False)], limit, cursor)
+
+
 def create_dish(db: Session, dish: dish_schemas.DishCreate):
     """Create a new dish and optionally a promotion.
 
@@ -117,6 +199,11 @@ def create_dish(db: Session, dish: dish_schemas.DishCreate):
             ),
         )
 
+    search_services.index_dish(db_dish)
+    cache_services.invalidate(
+        cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+    )
+
     return db_dish
 
 
@@ -163,10 +250,88 @@ def update_dish(db: Session, updated_dish: dish_schemas.DishUpdate):
     for key, value in updated_dish_data.items():
         setattr(db_dish, key, value)
 
+    db.add(db_dish)
+    db.commit()
+    # onPromotion follows the dates of the dish's promotions, not the request
+    promotion_scheduler.refresh_promotions(db, dishIDs=[db_dish.dishID])
+    db.refresh(db_dish)
+
+    search_services.index_dish(db_dish)
+    cache_services.invalidate(
+        cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+    )
+
+    return db_dish
+
+
+def update_dish_photo(db: Session, dishID: int, photo: UploadFile):
+    """Replace a dish's photo with an uploaded file.
+
+    Args:
+        db (Session): Database session.
+        dishID (int): ID of the dish.
+        photo (UploadFile): Uploaded image, streamed to object storage.
+    Returns:
+        Dish: The updated dish object, or None if not found.
+    """
+    db_dish = db.query(Dish).filter(Dish.dishID == dishID).first()
+    if not db_dish:
+        return None
+
+    check_image_upload(photo)
+    storage = ObjectStorage()
+    db_dish.photo = storage.upload_dish_photo_stream(
+        db_dish.stallID, db_dish.dishName, photo.file, photo.size or -1, photo.content_type
+    )
+
     db.add(db_dish)
     db.commit()
     db.refresh(db_dish)
+    cache_services.invalidate(
+        cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+    )
+    return db_dish
+
+
+def presign_dish_photo(db: Session, dishID: int):
+    """Mint a presigned URL to upload a dish photo to directly.
+
+    Args:
+        db (Session): Database session.
+        dishID (int): ID of the dish.
+    Returns:
+        dict: The presigned upload, or None if the dish is not found.
+    """
+    db_dish = db.query(Dish).filter(Dish.dishID == dishID).first()
+    if not db_dish:
+        return None
+    return ObjectStorage().presign_dish_photo(db_dish.stallID)
+
+
+def confirm_dish_photo(db: Session, dishID: int, key: str):
+    """Replace a dish's photo with an image uploaded with a presigned URL.
 
+    Args:
+        db (Session): Database session.
+        dishID (int): ID of the dish.
+        key (str): Key of the presigned upload.
+    Raises:
+        HTTPException: If the upload is not the dish's stall's or not a valid image.
+    Returns:
+        Dish: The updated dish object, or None if not found.
+    """
+    db_dish = db.query(Dish).filter(Dish.dishID == dishID).first()
+    if not db_dish:
+        return None
+
+    db_dish.photo = ObjectStorage().confirm_dish_photo(db_dish.stallID, key)
+
+    db.add(db_dish)
+    db.commit()
+    db.refresh(db_dish)
+    cache_services.invalidate(
+        cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+    )
     return db_dish
 
 
@@ -195,4 +360,9 @@ def delete_dish(db: Session, dishID: int) -> bool:
     db.delete(db_dish)
     db.commit()
 
+    search_services.remove_from_index("dishes", dishID)
+    cache_services.invalidate(
+        cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+    )
+
     return True
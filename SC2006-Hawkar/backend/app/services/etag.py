@@ -0,0 +1,244 @@
+import functools
+import hashlib
+import inspect
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from models.consumer import Consumer
+from models.dish import Dish
+from models.hawker import Hawker
+from models.hawkerCenter import HawkerCenter
+from models.promotion import Promotion
+from models.review import Review
+from models.stall import Stall
+from services.responseCache import render_json
+
+
+# Versions of the rows behind each response, read with one statement from the
+# endpoint's arguments. A response's ETag changes whenever its version does.
+# Collections count their rows too, so deleting one changes the version even
+# though no updatedAt does.
+
+
+def stall_version(db: Session, params: dict) -> Optional[tuple]:
+    """Version of a stall and its hawker center, or None if it doesn't exist."""
+    return db.execute(
+        select(Stall.updatedAt, HawkerCenter.updatedAt)
+        .select_from(Stall)
+        .outerjoin(Stall.hawkerCenter)
+        .where(Stall.stallID == params["stall_id"])
+    ).first()
+
+
+def stall_hawker_center_version(db: Session, params: dict) -> Optional[tuple]:
+    """Version of a stall's hawker center, or None if the stall doesn't exist."""
+    return db.execute(
+        select(HawkerCenter.hawkerCenterID, HawkerCenter.updatedAt)
+        .select_from(Stall)
+        .outerjoin(Stall.hawkerCenter)
+        .where(Stall.stallID == params["stall_id"])
+    ).first()
+
+
+def stalls_version(db: Session, params: dict) -> tuple:
+    """Version of every stall and hawker center, as any may be listed, and the
+    current minute when filtering by openNow, as the stalls open then change
+    with the time."""
+    version = tuple(db.execute(
+        select(
+            func.count(Stall.stallID),
+            func.max(Stall.updatedAt),
+            select(func.max(HawkerCenter.updatedAt)).scalar_subquery(),
+        )
+    ).first())
+    filters = params.get("filters")
+    if filters is not None and filters.openNow and not filters.openAt:
+        version += (datetime.now().replace(second=0, microsecond=0),)
+    return version
+
+
+def hawker_centers_version(db: Session, params: dict) -> tuple:
+    """Version of every hawker center."""
+    return db.execute(
+        select(func.count(HawkerCenter.hawkerCenterID), func.max(HawkerCenter.updatedAt))
+    ).first()
+
+
+def stall_dishes_version(db: Session, params: dict) -> tuple:
+    """Version of a stall's dishes and their promotions."""
+    return db.execute(
+        select(
+            func.count(func.distinct(Dish.dishID)),
+            func.max(Dish.updatedAt),
+            func.count(Promotion.promotionID),
+            func.max(Promotion.updatedAt),
+        )
+        .select_from(Dish)
+        .outerjoin(Dish.promotions)
+        .where(Dish.stallID == params["stall_id"])
+    ).first()
+
+
+def stall_reviews_version(db: Session, params: dict) -> tuple:
+    """Version of a stall's reviews, and of the stall nested in each of them."""
+    reviews = (
+        select(func.count(Review.reviewID), func.max(Review.updatedAt))
+        .where(Review.stallID == params["stall_id"])
+        .subquery()
+    )
+    return db.execute(
+        select(reviews, Stall.updatedAt, HawkerCenter.updatedAt)
+        .select_from(reviews)
+        .outerjoin(Stall, Stall.stallID == params["stall_id"])
+        .outerjoin(Stall.hawkerCenter)
+    ).first()
+
+
+def dish_version(db: Session, params: dict) -> Optional[tuple]:
+    """Version of a dish, or None if it doesn't exist."""
+    return db.execute(select(Dish.updatedAt).where(Dish.dishID == params["dish_id"])).first()
+
+
+def dishes_version(db: Session, params: dict) -> tuple:
+    """Version of every dish."""
+    return db.execute(select(func.count(Dish.dishID), func.max(Dish.updatedAt))).first()
+
+
+def touch_user(db: Session, userID: int):
+    """Change the version of the rows a user is nested in: the stalls of a
+    hawker, and the reviews of a consumer. Run in the transaction changing the user.
+
+    Args:
+        db (Session): Database session.
+        userID (int): ID of the changed user.
+    """
+    now = datetime.now()
+    db.query(Stall).filter(
+        Stall.hawkerID.in_(select(Hawker.hawkerID).where(Hawker.userID == userID))
+    ).update({Stall.updatedAt: now}, synchronize_session=False)
+    db.query(Review).filter(
+        Review.consumerID.in_(select(Consumer.consumerID).where(Consumer.userID == userID))
+    ).update({Review.updatedAt: now}, synchronize_session=False)
+
+
+def weak_etag(request: Request, version: tuple) -> str:
+    """Weak ETag of a response, from its path, query string and version."""
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.sha1(repr((request.url.path, query, tuple(version))).encode())
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag, by weak comparison."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+def _last_modified(version: tuple) -> Optional[datetime]:
+    """Latest timestamp in a version, in UTC and rounded down to whole seconds."""
+    timestamps = [part for part in version if isinstance(part, datetime)]
+    if not timestamps:
+        return None
+    # Timestamps are naive local times, see the models' updatedAt
+    return max(timestamps).astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the client's copy is current. If-Modified-Since is only
+    considered without If-None-Match, as RFC 9110 requires."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if last_modified is None or if_modified_since is None:
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def conditional_response(response_model, version, last_modified: bool = False):
+    """Serve a GET endpoint with a weak ETag, and answer 304 Not Modified when
+    the client's If-None-Match still matches.
+
+    The version is read before the endpoint runs, so an unchanged response
+    costs one small query and no serialization. Sits above @cached_response
+    if the route has both.
+
+    Args:
+        response_model: The route's response_model, used to serialize the result.
+        version: Function of a session and a dict of the endpoint's arguments
+            returning the version of the rows behind the response, or None if
+            they don't exist, in which case the endpoint runs as usual, e.g. to 404.
+        last_modified (bool, optional): Also send Last-Modified and honour
+            If-Modified-Since. Only for single resources, as deleting an item
+            of a collection changes no timestamp.
+    Returns:
+        Callable: Decorator for the endpoint, applied below @router.get.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+        # FastAPI passes the request to one parameter only, so share the one
+        # @cached_response added, if any
+        request_name = next(
+            (name for name, p in signature.parameters.items() if p.annotation is Request),
+            None,
+        )
+
+        def read_version(kwargs):
+            with SessionLocal() as db:
+                return version(db, kwargs)
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            request = kwargs[request_name or "etag_request"]
+            if request_name is None:
+                del kwargs["etag_request"]
+
+            current = await run_in_threadpool(read_version, kwargs)
+            headers = {}
+            if current is not None:
+                headers["ETag"] = weak_etag(request, current)
+                modified = _last_modified(current) if last_modified else None
+                if modified is not None:
+                    headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+                if _not_modified(request, headers["ETag"], modified):
+                    return Response(status_code=304, headers=headers)
+
+            body = await render_json(endpoint, adapter, kwargs)
+            response = (
+                body if isinstance(body, Response)
+                else Response(body, media_type="application/json")
+            )
+            response.headers.update(headers)
+            return response
+
+        if request_name is None:
+            # FastAPI reads the parameters from the signature; add the request
+            # to the endpoint's own parameters
+            wrapper.__signature__ = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(
+                        "etag_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                    ),
+                ]
+            )
+        return wrapper
+
+    return decorator
@@ -1,11 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 import services.user as user_services
+import services.responseCache as cache_services
+import services.etag as etag_services
+import services.search as search_services
 import schemas.hawker as hawker_schemas
 import schemas.user as user_schemas
 from models.hawker import Hawker
 from models.user import User
+from services.loadingProfile import with_loading_profile
+from services.pagination import paginate
 
 
 def get_hawker_by_user_id(db: Session, userID: int):
@@ -19,7 +26,11 @@ def get_hawker_by_user_id(db: Session, userID: int):
     Returns:
         Hawker: The hawker object.
     """
-    hawker = db.query(Hawker).filter(Hawker.userID == userID).first()
+    hawker = (
+        with_loading_profile(db.query(Hawker), hawker_schemas.Hawker)
+        .filter(Hawker.userID == userID)
+        .first()
+    )
 
     if not hawker:
         raise HTTPException(status_code=404, detail="Hawker not found")
@@ -33,6 +44,33 @@ def get_hawker_by_user_id(db: Session, userID: int):
     return hawker
 
 
+async def get_hawker_by_user_id_async(db: AsyncSession, userID: int):
+    """Retrieve a hawker by the associated user ID without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        userID (int): User ID of the hawker.
+    Raises:
+        HTTPException: If the hawker is not found or not verified.
+    Returns:
+        Hawker: The hawker object.
+    """
+    result = await db.execute(
+        with_loading_profile(select(Hawker), hawker_schemas.Hawker).filter(
+            Hawker.userID == userID
+        )
+    )
+    hawker = result.unique().scalars().first()
+
+    if not hawker:
+        raise HTTPException(status_code=404, detail="Hawker not found")
+
+    if not hawker.verifyStatus:
+        raise HTTPException(status_code=403, detail="Hawker not verified")
+
+    return hawker
+
+
 def get_hawker_by_hawker_id(db: Session, hawkerID: int):
     """Retrieve a hawker by their hawker ID.
 
@@ -44,7 +82,11 @@ def get_hawker_by_hawker_id(db: Session, hawkerID: int):
     Returns:
         Hawker: The hawker object.
     """
-    hawker = db.query(Hawker).filter(Hawker.hawkerID == hawkerID).first()
+    hawker = (
+        with_loading_profile(db.query(Hawker), hawker_schemas.Hawker)
+        .filter(Hawker.hawkerID == hawkerID)
+        .first()
+    )
 
     if not hawker:
         raise HTTPException(status_code=404, detail="Hawker not found")
@@ -54,6 +96,30 @@ def get_hawker_by_hawker_id(db: Session, hawkerID: int):
     return hawker
 
 
+async def get_hawker_by_hawker_id_async(db: AsyncSession, hawkerID: int):
+    """Retrieve a hawker by their hawker ID without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        hawkerID (int): Hawker ID.
+    Raises:
+        HTTPException: If the hawker is not found.
+    Returns:
+        Hawker: The hawker object.
+    """
+    result = await db.execute(
+        with_loading_profile(select(Hawker), hawker_schemas.Hawker).filter(
+            Hawker.hawkerID == hawkerID
+        )
+    )
+    hawker = result.unique().scalars().first()
+
+    if not hawker:
+        raise HTTPException(status_code=404, detail="Hawker not found")
+
+    return hawker
+
+
 def get_all_hawkers(db: Session, skip: int = 0, limit: int = 100):
     """Retrieve all hawkers with pagination.
 
@@ -64,7 +130,12 @@ def get_all_hawkers(db: Session, skip: int = 0, limit: int = 100):
     Returns:
         list: List of hawkers.
     """
-    hawkers = db.query(Hawker).offset(skip).limit(limit).all()
+    hawkers = (
+        with_loading_profile(db.query(Hawker), hawker_schemas.Hawker)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
     # for hawker in hawkers:
     #     hawker.geometry = json.loads(hawker.geometry)
@@ -72,6 +143,20 @@ def get_all_hawkers(db: Session, skip: int = 0, limit: int = 100):
     return hawkers
 
 
+def get_hawkers_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of hawkers in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of hawkers and the cursor of the next page.
+    """
+    query = with_loading_profile(db.query(Hawker), hawker_schemas.Hawker)
+    return paginate(query, [(Hawker.hawkerID, False)], limit, cursor)
+
+
 def create_hawker(db: Session, user: hawker_schemas.HawkerCreate):
     """Create a new hawker and associated user.
 
@@ -119,6 +204,8 @@ def create_hawker(db: Session, user: hawker_schemas.HawkerCreate):
     db.commit()
     db.refresh(db_hawker)
 
+    search_services.index_hawker(db_hawker)
+
     return db_hawker
 
 
@@ -138,9 +225,6 @@ def update_hawker(db: Session, updated_hawker: hawker_schemas.HawkerUpdate):
     if not db_user or not db_hawker:
         return None
 
-    # Store old name for trie update
-    # old_hawker_name = db_hawker.businessName
-
     # Update User
     updated_user_data = updated_hawker.model_dump(exclude_unset=True)
     for key, value in updated_user_data.items():
@@ -154,11 +238,15 @@ def update_hawker(db: Session, updated_hawker: hawker_schemas.HawkerUpdate):
     updated_hawker_data = updated_hawker.model_dump(exclude_unset=True)
     for key, value in updated_hawker_data.items():
         setattr(db_hawker, key, value)
+    etag_services.touch_user(db, db_user.userID)
 
     db.add(db_hawker)
     db.commit()
     db.refresh(db_hawker)
 
+    search_services.index_hawker(db_hawker)
+    cache_services.invalidate_all()
+
     return db_hawker
 
 
@@ -181,4 +269,7 @@ def delete_hawker(db: Session, hawkerID: int) -> bool:
     db.delete(db_hawker)
     db.commit()
 
+    search_services.remove_from_index("hawkers", hawkerID)
+    cache_services.invalidate_all()
+
     return True
@@ -0,0 +1,145 @@
+import json
+import os
+from itertools import islice
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from models.hawkerCenter import HawkerCenter
+import services.responseCache as cache_services
+from services.spatialIndex import invalidate_hawker_center_index
+
+
+DEFAULT_GEOJSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets",
+    "data",
+    "HawkerCentresGEOJSON.geojson",
+)
+IMPORT_BATCH_SIZE = 500
+
+
+def load_hawker_center_features(geojson_file):
+    """Parse an NEA hawker centres GeoJSON file and iterate over its features.
+
+    Args:
+        geojson_file (file): Open text or binary file containing a FeatureCollection.
+    Raises:
+        ValueError: If the file is not a GeoJSON FeatureCollection.
+    Returns:
+        Iterator[dict]: GeoJSON features.
+    """
+    data = json.load(geojson_file)
+    if not isinstance(data, dict) or not isinstance(data.get("features"), list):
+        raise ValueError("Expected a GeoJSON FeatureCollection")
+    return iter(data["features"])
+
+
+def parse_hawker_center_feature(feature: dict):
+    """Convert an NEA hawker centre feature into HawkerCenter column values.
+
+    The NEA export nests the geometry inside the feature properties, so both
+    that and the standard GeoJSON location are accepted.
+
+    Args:
+        feature (dict): GeoJSON feature.
+    Returns:
+        dict: Column values including incCrc, or None if the feature is malformed.
+    """
+    try:
+        properties = feature["properties"]
+        description = properties["Description"]
+        geometry = feature.get("geometry") or properties["geometry"]
+        longitude, latitude = geometry["coordinates"][:2]
+        name = description["NAME"].strip()
+        inc_crc = description["INC_CRC"].strip()
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+    if not name or not inc_crc:
+        return None
+
+    address = description.get("ADDRESS_MYENV", "").strip()
+    if not address:
+        block = description.get("ADDRESSBLOCKHOUSENUMBER", "").strip()
+        street = description.get("ADDRESSSTREETNAME", "").strip()
+        postal_code = description.get("ADDRESSPOSTALCODE", "").strip()
+        address = ", ".join(
+            part
+            for part in (
+                f"Blk {block}" if block else "",
+                street,
+                f"Singapore {postal_code.zfill(6)}" if postal_code else "",
+            )
+            if part
+        )
+
+    return {
+        "name": name,
+        "address": address,
+        "latitude": float(latitude),
+        "longitude": float(longitude),
+        "incCrc": inc_crc,
+    }
+
+
+def import_hawker_centers(db: Session, features, batch_size: int = IMPORT_BATCH_SIZE):
+    """Upsert hawker centers from NEA GeoJSON features.
+
+    A feature whose INC_CRC is already stored is unchanged and skipped. Any
+    other feature updates the hawker center with the same name, or inserts a
+    new one. Only the first feature of each name is written, later ones are
+    skipped. Rows are written with one executemany INSERT and one executemany
+    UPDATE per batch, and each batch is committed on its own.
+
+    Args:
+        db (Session): Database session.
+        features (Iterable[dict]): GeoJSON features.
+        batch_size (int): Number of features written per transaction.
+    Returns:
+        dict: Number of hawker centers inserted, updated and skipped.
+    """
+    existing = db.query(
+        HawkerCenter.hawkerCenterID, HawkerCenter.name, HawkerCenter.incCrc
+    ).all()
+    ids_by_name = {row.name: row.hawkerCenterID for row in existing}
+    known_crcs = {row.incCrc for row in existing if row.incCrc}
+    updated_ids = set()
+
+    report = {"inserted": 0, "updated": 0, "skipped": 0}
+    features = iter(features)
+    while batch := list(islice(features, batch_size)):
+        inserts, updates = [], []
+        for feature in batch:
+            values = parse_hawker_center_feature(feature)
+            if values is None or values["incCrc"] in known_crcs:
+                report["skipped"] += 1
+                continue
+            known_crcs.add(values["incCrc"])
+
+            if values["name"] not in ids_by_name:
+                inserts.append(values)
+                ids_by_name[values["name"]] = None
+            elif ids_by_name[values["name"]] is None or ids_by_name[values["name"]] in updated_ids:
+                # Duplicate of a hawker center inserted or updated earlier in this import
+                report["skipped"] += 1
+            else:
+                updated_ids.add(ids_by_name[values["name"]])
+                updates.append({"hawkerCenterID": ids_by_name[values["name"]], **values})
+
+        if updates:
+            db.execute(update(HawkerCenter), updates)
+        if inserts:
+            db.execute(insert(HawkerCenter), inserts)
+        db.commit()
+
+        report["inserted"] += len(inserts)
+        report["updated"] += len(updates)
+
+    # Bulk statements bypass the ORM unit of work, so the index isn't
+    # invalidated by the session events.
+    if report["inserted"] or report["updated"]:
+        invalidate_hawker_center_index()
+        # Hawker centers are nested in every stall
+        cache_services.invalidate_all()
+
+    return report
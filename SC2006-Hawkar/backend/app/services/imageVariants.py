@@ -0,0 +1,105 @@
+import io
+from typing import BinaryIO, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+# Base URL uploaded objects are served from
+PUBLIC_URL = "http://localhost:9000"
+
+# Variant name: longest side in pixels. Smaller images are not enlarged.
+VARIANTS = {"thumbnail": 320, "medium": 1024}
+VARIANT_FORMAT = "WEBP"
+VARIANT_EXTENSION = "webp"
+VARIANT_CONTENT_TYPE = "image/webp"
+VARIANT_QUALITY = 80
+
+# Buckets whose images get variants
+VARIANT_BUCKETS = ("profile-photo", "stall", "dish")
+
+
+def variant_key(obj_name: str, variant: str) -> str:
+    """Object name of a variant, stored next to the original in its bucket."""
+    return f"{obj_name}_{variant}.{VARIANT_EXTENSION}"
+
+
+def is_variant_key(obj_name: str) -> bool:
+    """Whether an object name is that of a variant rather than an original."""
+    return any(obj_name.endswith(variant_key("", variant)) for variant in VARIANTS)
+
+
+def split_object_url(url: Optional[str]) -> Optional[tuple]:
+    """Return the bucket and object name of an uploaded object's URL.
+
+    Args:
+        url (str, optional): URL of the object.
+    Returns:
+        tuple: (bucket, object name), or None for external URLs.
+    """
+    if not url or not url.startswith(f"{PUBLIC_URL}/"):
+        return None
+    bucket, _, obj_name = url[len(PUBLIC_URL) + 1 :].partition("/")
+    if not bucket or not obj_name:
+        return None
+    return bucket, obj_name
+
+
+def variant_urls(url: Optional[str]) -> Optional[dict]:
+    """Return the variant URLs of an image uploaded to a variant bucket.
+
+    Images are only stored in a variant bucket after their variants, and
+    images stored before variants existed are backfilled at startup, see
+    ObjectStorage.backfill_variants.
+
+    Args:
+        url (str, optional): URL of the original image.
+    Returns:
+        dict: {variant: URL}, or None for external URLs such as Google
+            profile photos, which have no variants.
+    """
+    location = split_object_url(url)
+    if location is None or location[0] not in VARIANT_BUCKETS:
+        return None
+    bucket, obj_name = location
+    return {
+        variant: f"{PUBLIC_URL}/{bucket}/{variant_key(obj_name, variant)}"
+        for variant in VARIANTS
+    }
+
+
+def process_image(stream: BinaryIO, render: bool = True) -> tuple:
+    """Detect an image's content type and render its variants.
+
+    Only the pixels needed for the largest variant are decoded where the
+    format allows it, e.g. JPEG. EXIF orientation is applied to the variants.
+
+    Args:
+        stream (BinaryIO): Image data; read from its current position.
+        render (bool, optional): Whether to render the variants, or only detect the type.
+    Returns:
+        tuple: (content type, [(variant, bytes), ...]), or (None, []) if the
+            data is not an image Pillow can read.
+    """
+    try:
+        with Image.open(stream) as image:
+            content_type = Image.MIME.get(image.format)
+            if not render:
+                return content_type, []
+            largest = max(VARIANTS.values())
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+                image = image.convert("RGBA" if has_alpha else "RGB")
+
+            variants = []
+            for variant, size in VARIANTS.items():
+                resized = image.copy()
+                resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+                output = io.BytesIO()
+                resized.save(output, VARIANT_FORMAT, quality=VARIANT_QUALITY)
+                variants.append((variant, output.getvalue()))
+            return content_type, variants
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        print(f"Could not process image: {str(e)}")
+        return None, []
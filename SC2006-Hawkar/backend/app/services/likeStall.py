@@ -1,9 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, with_expression
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 
 from models.likeStall import LikeStall
 from models.stall import Stall
+import services.responseCache as cache_services
 
 
 def like_stall(db: Session, userID: int, stallID: int):
@@ -23,12 +25,16 @@ def like_stall(db: Session, userID: int, stallID: int):
     if not stall:
         raise HTTPException(status_code=404, detail="Stall not found")
 
-    # Create the like relationship
+    # Create the like relationship and count it in the same transaction
     try:
         db_like = LikeStall(userID=userID, stallID=stallID)
         db.add(db_like)
+        db.query(Stall).filter(Stall.stallID == stallID).update(
+            {Stall.likeCount: Stall.likeCount + 1}, synchronize_session=False
+        )
         db.commit()
         db.refresh(db_like)
+        cache_services.invalidate(cache_services.STALLS, cache_services.stall_tag(stallID))
         return db_like
     except IntegrityError:
         db.rollback()
@@ -59,7 +65,11 @@ def unlike_stall(db: Session, userID: int, stallID: int):
         raise HTTPException(status_code=404, detail="Like relationship not found")
 
     db.delete(db_like)
+    db.query(Stall).filter(Stall.stallID == stallID).update(
+        {Stall.likeCount: Stall.likeCount - 1}, synchronize_session=False
+    )
     db.commit()
+    cache_services.invalidate(cache_services.STALLS, cache_services.stall_tag(stallID))
     return {"success": True, "message": "Stall unliked successfully"}
 
 
@@ -75,3 +85,34 @@ def get_liked_stalls(db: Session, userID: int):
     # Get all stalls liked by this user
     liked_stalls = db.query(LikeStall).filter(LikeStall.userID == userID).all()
     return liked_stalls
+
+
+def get_liked_stall_ids(db: Session, userID: int, stallIDs: list):
+    """Find which of the given stalls a user has liked, in a single query.
+
+    Args:
+        db (Session): Database session.
+        userID (int): User ID.
+        stallIDs (list): Stall IDs to check.
+    Returns:
+        set: IDs of the given stalls liked by the user.
+    """
+    if not stallIDs:
+        return set()
+    rows = db.query(LikeStall.stallID).filter(
+        LikeStall.userID == userID, LikeStall.stallID.in_(stallIDs)
+    )
+    return {row.stallID for row in rows}
+
+
+def with_liked_by_me(query, userID: int):
+    """Load Stall.likedByMe for a user as part of a stall query.
+
+    Args:
+        query (Query): Query selecting stalls.
+        userID (int): User whose likes are checked.
+    Returns:
+        Query: The query with an EXISTS subquery filling in likedByMe.
+    """
+    liked = exists().where(LikeStall.stallID == Stall.stallID, LikeStall.userID == userID)
+    return query.options(with_expression(Stall.likedByMe, liked))
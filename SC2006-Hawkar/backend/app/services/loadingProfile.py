@@ -0,0 +1,68 @@
+from functools import lru_cache
+
+from sqlalchemy.orm import joinedload
+
+import schemas.admin as admin_schemas
+import schemas.consumer as consumer_schemas
+import schemas.hawker as hawker_schemas
+import schemas.review as review_schemas
+import schemas.stall as stall_schemas
+from models.admin import Admin
+from models.consumer import Consumer
+from models.hawker import Hawker
+from models.review import Review
+from models.stall import Stall
+
+
+# Relationship paths that must be loaded to serialize each response schema
+# without lazy loads. Every nested relationship in these schemas is
+# many-to-one, so a single JOINed SELECT is enough to build the response.
+LOADING_PROFILES = {
+    stall_schemas.Stall: (Stall, ("hawker.user", "hawkerCenter")),
+    review_schemas.Review: (
+        Review,
+        ("consumer.user", "stall.hawker.user", "stall.hawkerCenter"),
+    ),
+    hawker_schemas.Hawker: (Hawker, ("user",)),
+    consumer_schemas.Consumer: (Consumer, ("user",)),
+    admin_schemas.Admin: (Admin, ("user",)),
+}
+
+
+@lru_cache(maxsize=None)
+def get_loader_options(schema) -> tuple:
+    """Build the loader options registered for a response schema.
+
+    Options are built on first use rather than at import time so that every
+    mapper is configured before the relationship attributes are resolved.
+
+    Args:
+        schema: Pydantic response schema registered in LOADING_PROFILES.
+    Returns:
+        tuple: joinedload options covering every nested relationship.
+    """
+    model, paths = LOADING_PROFILES[schema]
+    options = []
+    for path in paths:
+        entity = model
+        option = None
+        for name in path.split("."):
+            attribute = getattr(entity, name)
+            option = (
+                joinedload(attribute) if option is None else option.joinedload(attribute)
+            )
+            entity = attribute.property.mapper.class_
+        options.append(option)
+    return tuple(options)
+
+
+def with_loading_profile(query, schema):
+    """Apply the eager-loading plan registered for a response schema.
+
+    Args:
+        query (Query | Select): Query selecting the ORM model behind the schema.
+        schema: Pydantic response schema the results will be serialized into.
+    Returns:
+        Query | Select: The query with the schema's loader options applied.
+    """
+    return query.options(*get_loader_options(schema))
@@ -1,14 +1,89 @@
+from fastapi import HTTPException, UploadFile
 from minio import Minio
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import hashlib
+import re
+import socket
+import threading
+import time
+import urllib3
+from urllib3.connection import HTTPConnection
 import uuid
 import os
 import base64
 import io
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from services.imageVariants import (
+    VARIANT_BUCKETS,
+    VARIANT_CONTENT_TYPE,
+    VARIANTS,
+    is_variant_key,
+    process_image,
+    variant_key,
+)
+from typing import BinaryIO, Optional
+
+
+# Images of one request uploaded at the same time
+UPLOAD_CONCURRENCY = int(os.environ.get("MINIO_UPLOAD_CONCURRENCY", "4"))
+# Seconds to connect, and between bytes sent or received, before an upload fails
+UPLOAD_TIMEOUT = float(os.environ.get("MINIO_UPLOAD_TIMEOUT", "30"))
+# Part size of streamed uploads, the most of an upload held in memory (MinIO's minimum)
+STREAM_PART_SIZE = 5 * 1024 * 1024
+# Connections kept open to MinIO, shared by all threads; a thread waits for a
+# free connection rather than opening one beyond this
+POOL_SIZE = int(os.environ.get("MINIO_POOL_SIZE", str(UPLOAD_CONCURRENCY * 2 + 4)))
+# Attempts to create the buckets at startup, with exponential backoff from BUCKETS_RETRY_DELAY seconds
+BUCKETS_RETRIES = int(os.environ.get("MINIO_BUCKETS_RETRIES", "5"))
+BUCKETS_RETRY_DELAY = float(os.environ.get("MINIO_BUCKETS_RETRY_DELAY", "0.5"))
+REQUIRED_BUCKETS = ("profile-photo", "dish", "stall", "review-attachment")
+# Content-addressed objects remembered to exist, so re-uploads skip MinIO entirely
+KNOWN_OBJECTS_CACHE_SIZE = int(os.environ.get("MINIO_KNOWN_OBJECTS_CACHE_SIZE", "4096"))
+# Objects younger than this many seconds are never swept, see services.storageSweeper
+SWEEP_MIN_AGE = int(os.environ.get("STORAGE_SWEEP_MIN_AGE", "3600"))
+# Content-addressed objects are reused only while younger than this, so the
+# sweeper of any worker can't delete one before the request reusing it has
+# committed its reference. Older objects are uploaded again, renewing their age.
+DEDUPE_MAX_AGE = timedelta(seconds=SWEEP_MIN_AGE / 2)
+# Upload stall images after responding, returning their future URLs right away
+BACKGROUND_UPLOADS = os.environ.get("MINIO_BACKGROUND_UPLOADS", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Seconds a presigned upload URL stays valid
+PRESIGNED_UPLOAD_EXPIRY = int(os.environ.get("MINIO_PRESIGNED_UPLOAD_EXPIRY", "600"))
+# Largest image accepted through a presigned upload, in bytes
+PRESIGNED_UPLOAD_MAX_SIZE = int(
+    os.environ.get("MINIO_PRESIGNED_UPLOAD_MAX_SIZE", str(10 * 1024 * 1024))
+)
+# Bytes of a presigned upload read to check that it is an image
+PRESIGNED_UPLOAD_SNIFF_SIZE = 256 * 1024
+
+
+def check_image_upload(upload: UploadFile):
+    """
+    Reject a multipart upload that is not an image.
+
+    Args:
+        upload (UploadFile): Uploaded file
+
+    Raises:
+        HTTPException: If the file is not an image
+    """
+    if not (upload.content_type or "").startswith("image/"):
+        raise HTTPException(
+            status_code=415, detail=f"{upload.filename or 'File'} is not an image"
+        )
 
 
 class ObjectStorage:
     _instance: Optional["ObjectStorage"] = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
         """
@@ -17,41 +92,684 @@ class ObjectStorage:
         Returns:
             ObjectStorage: The single instance of ObjectStorage
         """
-        if cls._instance is None:
-            cls._instance = super(ObjectStorage, cls).__new__(cls)
-            cls._instance._initialized = False
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(ObjectStorage, cls).__new__(cls)
+                cls._instance._initialized = False
         return cls._instance
 
     def __init__(self):
         """
         Initialize the ObjectStorage with MinIO client configuration.
         Uses environment variables for MinIO connection details or defaults.
-        """
-        if not self._initialized:
-            self.minio_endpoint = os.environ.get("MINIO_ENDPOINT", "minio:9000")
-            self.minio_access_key = os.environ.get("MINIO_ROOT_USER", "tanknam")
-            self.minio_secret_key = os.environ.get("MINIO_ROOT_PASSWORD", "12345678")
 
-            self.client = Minio(
-                endpoint=self.minio_endpoint,
-                access_key=self.minio_access_key,
-                secret_key=self.minio_secret_key,
-                secure=False,
-            )
-            self._initialized = True
-            self._ensure_buckets_exist()
+        No request is sent to MinIO here; the buckets are created by
+        ensure_buckets(), which the app runs in the background at startup.
+        """
+        with self._instance_lock:
+            if not self._initialized:
+                self._initialize()
+
+    def _initialize(self):
+        self.minio_endpoint = os.environ.get("MINIO_ENDPOINT", "minio:9000")
+        self.minio_access_key = os.environ.get("MINIO_ROOT_USER", "tanknam")
+        self.minio_secret_key = os.environ.get("MINIO_ROOT_PASSWORD", "12345678")
+
+        self.client = Minio(
+            endpoint=self.minio_endpoint,
+            access_key=self.minio_access_key,
+            secret_key=self.minio_secret_key,
+            secure=False,
+            http_client=urllib3.PoolManager(
+                timeout=urllib3.Timeout(connect=UPLOAD_TIMEOUT, read=UPLOAD_TIMEOUT),
+                maxsize=POOL_SIZE,
+                block=True,
+                retries=urllib3.Retry(
+                    total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+                ),
+                # Detect connections silently dropped while idle in the pool
+                socket_options=HTTPConnection.default_socket_options
+                + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)],
+            ),
+        )
+        # Presigned URLs are used by browsers, so they are signed for the host
+        # browsers reach MinIO at. The region is given so signing needs no request.
+        self.presign_client = Minio(
+            endpoint=os.environ.get("MINIO_PUBLIC_ENDPOINT", "localhost:9000"),
+            access_key=self.minio_access_key,
+            secret_key=self.minio_secret_key,
+            secure=False,
+            region=os.environ.get("MINIO_REGION", "us-east-1"),
+        )
+        # Uploads awaited by the request, and uploads left to run after it
+        self.upload_executor = ThreadPoolExecutor(
+            max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="minio-upload"
+        )
+        self.background_executor = ThreadPoolExecutor(
+            max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="minio-background-upload"
+        )
+        # LRU of (bucket, object name) of content-addressed objects known to
+        # exist, to the time until which they may be reused
+        self.known_objects = OrderedDict()
+        self.known_objects_lock = threading.Lock()
+        # Whether the required buckets are known to exist, and whether a thread
+        # is creating them. The lock guards the flags only, never a request.
+        self.ready = False
+        self.provisioning = False
+        self.buckets_lock = threading.Lock()
+        self._initialized = True
 
     def _ensure_buckets_exist(self):
         """
         Ensure required buckets exist in MinIO storage.
         Creates required buckets if they don't already exist.
         """
-        required_buckets = ["profile-photo", "dish", "stall"]
-
-        for bucket in required_buckets:
+        for bucket in REQUIRED_BUCKETS:
             if not self.client.bucket_exists(bucket):
                 self.client.make_bucket(bucket)
 
+    def _provision_buckets(self) -> bool:
+        """
+        Make one attempt at creating the buckets, unless they exist or another
+        thread is already creating them.
+
+        Raises:
+            Exception: If MinIO is unreachable
+
+        Returns:
+            bool: False if another thread is creating the buckets, else True
+        """
+        with self.buckets_lock:
+            if self.ready:
+                return True
+            if self.provisioning:
+                return False
+            self.provisioning = True
+        try:
+            self._ensure_buckets_exist()
+            self.ready = True
+        finally:
+            with self.buckets_lock:
+                self.provisioning = False
+        return True
+
+    def ensure_buckets(
+        self, retries: int = BUCKETS_RETRIES, delay: float = BUCKETS_RETRY_DELAY
+    ) -> bool:
+        """
+        Create the required buckets if missing, retrying with exponential
+        backoff while MinIO is unreachable. Does nothing once it has succeeded.
+
+        Args:
+            retries (int, optional): Number of attempts
+            delay (float, optional): Seconds before the second attempt, doubled after each
+
+        Returns:
+            bool: Whether the buckets exist
+        """
+        for attempt in range(retries):
+            try:
+                if self._provision_buckets():
+                    return True
+                print(f"Object storage buckets are being created (attempt {attempt + 1}/{retries})")
+            except Exception as e:
+                print(f"Object storage not ready (attempt {attempt + 1}/{retries}): {str(e)}")
+            if attempt + 1 < retries:
+                time.sleep(delay * 2**attempt)
+        return self.ready
+
+    def _require_buckets(self):
+        """
+        Create the buckets before an upload if startup could not, e.g. because
+        MinIO was down then.
+
+        Raises:
+            HTTPException: If another thread is creating the buckets
+            Exception: If MinIO is still unreachable
+        """
+        if not self.ready and not self._provision_buckets():
+            raise HTTPException(
+                status_code=503, detail="Object storage is starting, try again shortly"
+            )
+
+    # Profile and review photo names get a unique ID to avoid overwriting
+    # previous photos. Stall images and dish photos are named after the
+    # SHA-256 of their content instead, so identical re-uploads share one object.
+
+    @staticmethod
+    def _profile_photo_name(email_address: str) -> str:
+        unique_id = str(uuid.uuid4())[:8]
+        return f"{email_address.replace('@', '_')}_{unique_id}_profile-photo"
+
+    @staticmethod
+    def _stall_image_name(stallID: int, digest: str) -> str:
+        return f"{stallID}_{digest}_stall-image"
+
+    @staticmethod
+    def _review_photo_name(consumer_id: int, stall_id: int) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{consumer_id}_to_{stall_id}_{timestamp}_review"
+
+    @staticmethod
+    def _dish_photo_name(stall_id: int, digest: str) -> str:
+        return f"stall_{stall_id}_dish_{digest}"
+
+    @staticmethod
+    def _digest(stream: BinaryIO) -> str:
+        """
+        SHA-256 of a file-like object's content, read in chunks from its
+        current position, which is restored afterwards.
+        """
+        start = stream.tell()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+        stream.seek(start)
+        return digest.hexdigest()
+
+    def _remember_object(self, bucket: str, obj_name: str, last_modified: datetime):
+        with self.known_objects_lock:
+            self.known_objects[(bucket, obj_name)] = last_modified + DEDUPE_MAX_AGE
+            self.known_objects.move_to_end((bucket, obj_name))
+            while len(self.known_objects) > KNOWN_OBJECTS_CACHE_SIZE:
+                self.known_objects.popitem(last=False)
+
+    def forget_object(self, bucket: str, obj_name: str):
+        """
+        Drop an object from the cache of existing objects, e.g. once it is deleted.
+
+        Args:
+            bucket (str): Bucket of the object
+            obj_name (str): Object name
+        """
+        with self.known_objects_lock:
+            self.known_objects.pop((bucket, obj_name), None)
+
+    def _object_reusable(self, bucket: str, obj_name: str) -> bool:
+        """
+        Check whether a content-addressed object exists and is younger than
+        DEDUPE_MAX_AGE, from the cache or else with a HEAD request.
+
+        The cache is only trusted while the object is too young to be swept,
+        as the sweeper of another worker can't clear this worker's cache.
+        """
+        now = datetime.now(timezone.utc)
+        with self.known_objects_lock:
+            reusable_until = self.known_objects.get((bucket, obj_name))
+            if reusable_until is not None and reusable_until > now:
+                self.known_objects.move_to_end((bucket, obj_name))
+                return True
+        try:
+            stat = self.client.stat_object(bucket, obj_name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject", "ResourceNotFound"):
+                return False
+            raise
+        if stat.last_modified is None or stat.last_modified + DEDUPE_MAX_AGE <= now:
+            return False
+        self._remember_object(bucket, obj_name, stat.last_modified)
+        return True
+
+    @staticmethod
+    def _decode_image(encoded_image: str) -> bytes:
+        """
+        Decode a base64 data URL or raw base64 string into image bytes.
+        """
+        if "," in encoded_image:
+            header, encoded_image = encoded_image.split(",", 1)
+        return base64.b64decode(encoded_image)
+
+    def _put_variants(self, bucket: str, obj_name: str, stream: BinaryIO) -> Optional[str]:
+        """
+        Store the resized variants of an image next to it, see services.imageVariants.
+
+        Run before storing the original, so that every image in a variant
+        bucket has the variants its URL advertises.
+
+        Args:
+            bucket (str): Bucket of the original image
+            obj_name (str): Object name of the original image
+            stream (BinaryIO): Image data, read from its current position
+
+        Raises:
+            HTTPException: If the bucket is a variant bucket and the data is not an image
+
+        Returns:
+            str: Detected content type of the image, or None if it is not an image
+        """
+        content_type, variants = process_image(stream, render=bucket in VARIANT_BUCKETS)
+        if content_type is None and bucket in VARIANT_BUCKETS:
+            raise HTTPException(status_code=415, detail="Upload is not an image")
+        for variant, data in variants:
+            self.client.put_object(
+                bucket,
+                variant_key(obj_name, variant),
+                io.BytesIO(data),
+                length=len(data),
+                content_type=VARIANT_CONTENT_TYPE,
+            )
+        return content_type
+
+    def _put_image(self, bucket: str, obj_name: str, data: bytes, dedupe: bool = False):
+        """
+        Upload image bytes and their variants to a bucket under the given object name.
+
+        With dedupe, obj_name must be derived from the content, and nothing
+        is uploaded if the object already exists and is younger than DEDUPE_MAX_AGE.
+        """
+        self._require_buckets()
+        if dedupe and self._object_reusable(bucket, obj_name):
+            return
+        content_type = self._put_variants(bucket, obj_name, io.BytesIO(data))
+        uploaded_at = datetime.now(timezone.utc)
+        self.client.put_object(
+            bucket,
+            obj_name,
+            io.BytesIO(data),
+            length=len(data),
+            content_type=content_type or "image/jpeg",
+            part_size=10 * 1024 * 1024,
+        )
+        if dedupe:
+            self._remember_object(bucket, obj_name, uploaded_at)
+
+    def _put_stream(
+        self,
+        bucket: str,
+        obj_name: str,
+        stream: BinaryIO,
+        length: int,
+        content_type: str,
+        dedupe: bool = False,
+    ) -> str:
+        """
+        Upload a file-like object to a bucket in parts of STREAM_PART_SIZE,
+        so at most one part is held in memory.
+
+        Args:
+            bucket (str): Bucket to upload to
+            obj_name (str): Object name in the bucket
+            stream (BinaryIO): File-like object positioned at the start of the image
+            length (int): Size of the image in bytes, or -1 if unknown
+            content_type (str): MIME type of the image, if it cannot be detected
+            dedupe (bool, optional): Skip the upload if the object exists and
+                is younger than DEDUPE_MAX_AGE; obj_name must be derived from the content
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        self._require_buckets()
+        url = f"http://localhost:9000/{bucket}/{obj_name}"
+        if dedupe and self._object_reusable(bucket, obj_name):
+            return url
+        start = stream.tell()
+        content_type = self._put_variants(bucket, obj_name, stream) or content_type
+        stream.seek(start)
+        uploaded_at = datetime.now(timezone.utc)
+        self.client.put_object(
+            bucket,
+            obj_name,
+            stream,
+            length=length,
+            content_type=content_type,
+            part_size=STREAM_PART_SIZE,
+        )
+        if dedupe:
+            self._remember_object(bucket, obj_name, uploaded_at)
+        return url
+
+    def upload_profile_photo_stream(
+        self,
+        email_address: str,
+        stream: BinaryIO,
+        length: int = -1,
+        content_type: str = "image/jpeg",
+    ) -> str:
+        """
+        Upload a user's profile photo from a file-like object, e.g. an UploadFile.
+
+        Args:
+            email_address (str): Email address of the user
+            stream (BinaryIO): Image data
+            length (int, optional): Size of the image in bytes, -1 if unknown
+            content_type (str, optional): MIME type of the image
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        obj_name = self._profile_photo_name(email_address)
+        return self._put_stream("profile-photo", obj_name, stream, length, content_type)
+
+    def upload_stall_image_stream(
+        self,
+        stallID: int,
+        stream: BinaryIO,
+        length: int = -1,
+        content_type: str = "image/jpeg",
+    ) -> str:
+        """
+        Upload a stall's image from a file-like object, e.g. an UploadFile.
+
+        Args:
+            stallID (int): ID of the stall
+            stream (BinaryIO): Image data
+            length (int, optional): Size of the image in bytes, -1 if unknown
+            content_type (str, optional): MIME type of the image
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        obj_name = self._stall_image_name(stallID, self._digest(stream))
+        return self._put_stream("stall", obj_name, stream, length, content_type, dedupe=True)
+
+    def upload_review_photo_stream(
+        self,
+        consumer_id: int,
+        stall_id: int,
+        stream: BinaryIO,
+        length: int = -1,
+        content_type: str = "image/jpeg",
+    ) -> str:
+        """
+        Upload a review photo from a file-like object, e.g. an UploadFile.
+
+        Args:
+            consumer_id (int): ID of the consumer submitting the review
+            stall_id (int): ID of the stall being reviewed
+            stream (BinaryIO): Image data
+            length (int, optional): Size of the image in bytes, -1 if unknown
+            content_type (str, optional): MIME type of the image
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        obj_name = self._review_photo_name(consumer_id, stall_id)
+        return self._put_stream("review-attachment", obj_name, stream, length, content_type)
+
+    def upload_dish_photo_stream(
+        self,
+        stall_id: int,
+        dish_name: str,
+        stream: BinaryIO,
+        length: int = -1,
+        content_type: str = "image/jpeg",
+    ) -> str:
+        """
+        Upload a dish photo from a file-like object, e.g. an UploadFile.
+
+        Args:
+            stall_id (int): ID of the stall offering the dish
+            dish_name (str): Name of the dish; photos are keyed by content, not name
+            stream (BinaryIO): Image data
+            length (int, optional): Size of the image in bytes, -1 if unknown
+            content_type (str, optional): MIME type of the image
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        obj_name = self._dish_photo_name(stall_id, self._digest(stream))
+        return self._put_stream("dish", obj_name, stream, length, content_type, dedupe=True)
+
+    def _put_image_in_background(self, bucket: str, obj_name: str, data: bytes):
+        try:
+            self._put_image(bucket, obj_name, data, dedupe=True)
+        except Exception as e:
+            # Nobody is waiting on a background upload, so it can only be logged
+            print(f"Error uploading {bucket}/{obj_name} in background: {str(e)}")
+
+    def _upload_images(self, bucket: str, images: list, background: bool) -> None:
+        """
+        Upload (object name, bytes) pairs to a bucket, at most
+        UPLOAD_CONCURRENCY at a time. Object names are derived from the
+        content, so objects that already exist are skipped.
+
+        Raises:
+            Exception: The first upload error. Uploads not started yet are
+                cancelled, but those running are not waited for; as objects are
+                content-addressed, retrying the request reuses what they wrote.
+        """
+        if background:
+            for obj_name, data in images:
+                self.background_executor.submit(
+                    self._put_image_in_background, bucket, obj_name, data
+                )
+            return
+
+        futures = [
+            self.upload_executor.submit(self._put_image, bucket, obj_name, data, True)
+            for obj_name, data in images
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def list_object_pages(self, bucket: str, page_size: int = 1000):
+        """
+        List every object in a bucket, a page at a time.
+
+        Args:
+            bucket (str): Bucket to list
+            page_size (int, optional): Number of objects per page
+
+        Yields:
+            list: Objects with object_name, size and last_modified
+        """
+        self._require_buckets()
+        objects = iter(self.client.list_objects(bucket, recursive=True))
+        while page := list(islice(objects, page_size)):
+            yield page
+
+    def remove_objects(self, bucket: str, obj_names: list) -> list:
+        """
+        Delete objects from a bucket with one multi-object delete request.
+
+        Args:
+            bucket (str): Bucket of the objects
+            obj_names (list): Names of at most 1000 objects
+
+        Returns:
+            list: Errors of the objects that could not be deleted
+        """
+        for obj_name in obj_names:
+            self.forget_object(bucket, obj_name)
+        # The request is only sent once the returned errors are iterated
+        return list(
+            self.client.remove_objects(
+                bucket, [DeleteObject(obj_name) for obj_name in obj_names]
+            )
+        )
+
+    def backfill_variants(self) -> dict:
+        """
+        Render the missing variants of the images in the variant buckets,
+        e.g. seeded images or those stored before variants existed.
+
+        Objects that are not images are logged and left as they are.
+
+        Returns:
+            dict: Number of images whose variants were rendered, per bucket
+        """
+        report = {}
+        for bucket in VARIANT_BUCKETS:
+            names = set()
+            for page in self.list_object_pages(bucket):
+                names.update(obj.object_name for obj in page)
+
+            report[bucket] = 0
+            for obj_name in sorted(names):
+                if is_variant_key(obj_name) or all(
+                    variant_key(obj_name, variant) in names for variant in VARIANTS
+                ):
+                    continue
+                try:
+                    response = self.client.get_object(bucket, obj_name)
+                    try:
+                        data = response.read()
+                    finally:
+                        response.close()
+                        response.release_conn()
+                    self._put_variants(bucket, obj_name, io.BytesIO(data))
+                    report[bucket] += 1
+                except Exception as e:
+                    print(f"Error rendering variants of {bucket}/{obj_name}: {str(e)}")
+        return report
+
+    def _presign_upload(self, bucket: str, obj_name: str) -> dict:
+        """
+        Mint a URL the client can PUT an image to directly, without the
+        image passing through the API. The URL only allows writing obj_name.
+
+        Returns:
+            dict: uploadUrl to PUT the image to, its key, the url it will be
+                served from, and when uploadUrl expires
+        """
+        expires = timedelta(seconds=PRESIGNED_UPLOAD_EXPIRY)
+        return {
+            "uploadUrl": self.presign_client.presigned_put_object(
+                bucket, obj_name, expires=expires
+            ),
+            "key": obj_name,
+            "url": f"http://localhost:9000/{bucket}/{obj_name}",
+            "expiresAt": datetime.now(timezone.utc) + expires,
+        }
+
+    def _confirm_upload(self, bucket: str, obj_name: str, pattern: str) -> str:
+        """
+        Check an image uploaded with a presigned URL before it is recorded,
+        and render its variants.
+
+        Uploads that are too large or not images are deleted. Uploads that
+        are never confirmed are deleted by the storage sweeper.
+
+        Args:
+            bucket (str): Bucket the image was uploaded to
+            obj_name (str): Key the upload URL was minted for
+            pattern (str): Regular expression the keys of this owner match,
+                so one owner cannot claim another's upload
+
+        Returns:
+            str: URL to access the uploaded image
+
+        Raises:
+            HTTPException: If the key is not the owner's, nothing was uploaded
+                to it, or the upload is too large or not an image
+        """
+        if not re.fullmatch(pattern, obj_name):
+            raise HTTPException(status_code=400, detail="Upload key does not match")
+        self._require_buckets()
+        try:
+            stat = self.client.stat_object(bucket, obj_name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject", "ResourceNotFound"):
+                raise HTTPException(status_code=400, detail="Image has not been uploaded")
+            raise
+
+        if stat.size > PRESIGNED_UPLOAD_MAX_SIZE:
+            self.client.remove_object(bucket, obj_name)
+            raise HTTPException(status_code=413, detail="Image is too large")
+        # Images in a variant bucket are read whole (length 0) to render the
+        # variants, other uploads only far enough to tell whether they are images
+        length = 0 if bucket in VARIANT_BUCKETS else PRESIGNED_UPLOAD_SNIFF_SIZE
+        response = self.client.get_object(bucket, obj_name, offset=0, length=length)
+        try:
+            data = response.read()
+        finally:
+            response.close()
+            response.release_conn()
+        try:
+            if bucket in VARIANT_BUCKETS:
+                self._put_variants(bucket, obj_name, io.BytesIO(data))
+            elif process_image(io.BytesIO(data), render=False)[0] is None:
+                raise HTTPException(status_code=415, detail="Upload is not an image")
+        except HTTPException:
+            self.client.remove_object(bucket, obj_name)
+            raise
+        return f"http://localhost:9000/{bucket}/{obj_name}"
+
+    def presign_profile_photo(self, email_address: str) -> dict:
+        """
+        Mint a presigned URL to upload a user's profile photo to.
+
+        Args:
+            email_address (str): Email address of the user
+
+        Returns:
+            dict: uploadUrl, key, url and expiresAt of the upload
+        """
+        return self._presign_upload("profile-photo", self._profile_photo_name(email_address))
+
+    def confirm_profile_photo(self, email_address: str, obj_name: str) -> str:
+        """
+        Check a profile photo uploaded with a presigned URL.
+
+        Args:
+            email_address (str): Email address of the user
+            obj_name (str): Key of the upload
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        owner = re.escape(email_address.replace("@", "_"))
+        return self._confirm_upload(
+            "profile-photo", obj_name, rf"{owner}_[0-9a-f]{{8}}_profile-photo"
+        )
+
+    def presign_stall_image(self, stallID: int) -> dict:
+        """
+        Mint a presigned URL to upload a stall image to. The content is not
+        known yet, so the key gets a random ID instead of the content's hash.
+
+        Args:
+            stallID (int): ID of the stall
+
+        Returns:
+            dict: uploadUrl, key, url and expiresAt of the upload
+        """
+        return self._presign_upload("stall", self._stall_image_name(stallID, uuid.uuid4().hex))
+
+    def confirm_stall_image(self, stallID: int, obj_name: str) -> str:
+        """
+        Check a stall image uploaded with a presigned URL.
+
+        Args:
+            stallID (int): ID of the stall
+            obj_name (str): Key of the upload
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        return self._confirm_upload("stall", obj_name, rf"{stallID}_[0-9a-f]+_stall-image")
+
+    def presign_dish_photo(self, stall_id: int) -> dict:
+        """
+        Mint a presigned URL to upload a dish photo to. The key gets a
+        random ID instead of the content's hash.
+
+        Args:
+            stall_id (int): ID of the stall offering the dish
+
+        Returns:
+            dict: uploadUrl, key, url and expiresAt of the upload
+        """
+        return self._presign_upload("dish", self._dish_photo_name(stall_id, uuid.uuid4().hex))
+
+    def confirm_dish_photo(self, stall_id: int, obj_name: str) -> str:
+        """
+        Check a dish photo uploaded with a presigned URL.
+
+        Args:
+            stall_id (int): ID of the stall offering the dish
+            obj_name (str): Key of the upload
+
+        Returns:
+            str: URL to access the uploaded image
+        """
+        return self._confirm_upload("dish", obj_name, rf"stall_{stall_id}_dish_[0-9a-f]+")
+
     def upload_profile_photo(self, email_address: str, encoded_image: str) -> str:
         """
         Upload a user's profile photo to MinIO storage.
@@ -80,18 +798,9 @@ class ObjectStorage:
                 # Raw base64
                 decoded_data = base64.b64decode(encoded_image)
 
-            # Generate unique ID to avoid overwriting previous photos
-            unique_id = str(uuid.uuid4())[:8]
-            obj_name = f"{email_address.replace('@', '_')}_{unique_id}_profile-photo"
+            obj_name = self._profile_photo_name(email_address)
 
-            self.client.put_object(
-                "profile-photo",
-                obj_name,
-                io.BytesIO(decoded_data),
-                length=len(decoded_data),
-                content_type="image/jpeg",
-                part_size=10 * 1024 * 1024,
-            )
+            self._put_image("profile-photo", obj_name, decoded_data)
 
             return f"http://localhost:9000/profile-photo/{obj_name}"
         except Exception as e:
@@ -118,18 +827,9 @@ class ObjectStorage:
             header, encoded = encoded_image.split(",", 1)
             decoded_data = base64.b64decode(encoded)
 
-            # Generate unique ID to avoid overwriting previous photos
-            unique_id = str(uuid.uuid4())[:8]
-            obj_name = f"{stallID}_{unique_id}_stall-image"
+            obj_name = self._stall_image_name(stallID, hashlib.sha256(decoded_data).hexdigest())
 
-            self.client.put_object(
-                "stall",
-                obj_name,
-                io.BytesIO(decoded_data),
-                length=len(decoded_data),
-                content_type="image/jpeg",
-                part_size=10 * 1024 * 1024,
-            )
+            self._put_image("stall", obj_name, decoded_data, dedupe=True)
 
             return f"http://localhost:9000/stall/{obj_name}"
         except Exception as e:
@@ -137,6 +837,59 @@ class ObjectStorage:
             print(f"Error uploading stall image: {str(e)}")
             raise e
 
+    def upload_stall_images(
+        self, stallID: int, encoded_images: list, background: bool = None
+    ) -> list:
+        """
+        Upload a stall's images to MinIO storage in parallel.
+
+        Images that are already URLs are kept as-is, and images already in
+        storage are not uploaded again. With background uploads,
+        the URLs are returned before the uploads finish; each image appears
+        at its URL once uploaded, and failed uploads are only logged.
+
+        Args:
+            stallID (int): ID of the stall
+            encoded_images (list): Base64 encoded image data or URLs to images
+            background (bool, optional): Whether to upload in the background,
+                BACKGROUND_UPLOADS by default
+
+        Returns:
+            list: URLs to access the images, in the same order
+
+        Raises:
+            Exception: If there's an error during a non-background upload
+        """
+        if background is None:
+            background = BACKGROUND_UPLOADS
+
+        try:
+            images_url = []
+            uploads = []
+            queued = set()
+            for encoded_image in encoded_images:
+                if encoded_image.startswith("http"):
+                    images_url.append(encoded_image)
+                    continue
+                decoded_data = self._decode_image(encoded_image)
+
+                obj_name = self._stall_image_name(
+                    stallID, hashlib.sha256(decoded_data).hexdigest()
+                )
+
+                # The same image twice in one request is uploaded once
+                if obj_name not in queued:
+                    queued.add(obj_name)
+                    uploads.append((obj_name, decoded_data))
+                images_url.append(f"http://localhost:9000/stall/{obj_name}")
+
+            self._upload_images("stall", uploads, background)
+            return images_url
+        except Exception as e:
+            # Log the error
+            print(f"Error uploading stall images: {str(e)}")
+            raise e
+
     def upload_review_photo(
         self, consumer_id: int, stall_id: int, encoded_image: str
     ) -> str:
@@ -160,17 +913,9 @@ class ObjectStorage:
             header, encoded = encoded_image.split(",", 1)
             decoded_data = base64.b64decode(encoded)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            obj_name = f"{consumer_id}_to_{stall_id}_{timestamp}_review"
+            obj_name = self._review_photo_name(consumer_id, stall_id)
 
-            self.client.put_object(
-                "review-attachment",
-                obj_name,
-                io.BytesIO(decoded_data),
-                length=len(decoded_data),
-                content_type="image/jpeg",
-                part_size=10 * 1024 * 1024,
-            )
+            self._put_image("review-attachment", obj_name, decoded_data)
 
             return f"http://localhost:9000/review-attachment/{obj_name}"
         except Exception as e:
@@ -186,7 +931,7 @@ class ObjectStorage:
 
         Args:
             stall_id (int): ID of the stall offering the dish
-            dish_name (str): Name of the dish
+            dish_name (str): Name of the dish; photos are keyed by content, not name
             encoded_image (str): Base64 encoded image data
 
         Returns:
@@ -201,19 +946,9 @@ class ObjectStorage:
             header, encoded = encoded_image.split(",", 1)
             decoded_data = base64.b64decode(encoded)
 
-            # Create sanitized object name
-            sanitized_dish_name = dish_name.replace(" ", "_").lower()
-            unique_id = str(uuid.uuid4())[:8]
-            obj_name = f"stall_{stall_id}_{sanitized_dish_name}_{unique_id}"
+            obj_name = self._dish_photo_name(stall_id, hashlib.sha256(decoded_data).hexdigest())
 
-            self.client.put_object(
-                "dish",
-                obj_name,
-                io.BytesIO(decoded_data),
-                length=len(decoded_data),
-                content_type="image/jpeg",
-                part_size=10 * 1024 * 1024,
-            )
+            self._put_image("dish", obj_name, decoded_data, dedupe=True)
 
             return f"http://localhost:9000/dish/{obj_name}"
         except Exception as e:
@@ -0,0 +1,137 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+
+from fastapi import HTTPException
+from pydantic_core import to_jsonable_python
+from sqlalchemy import and_, false, or_
+
+
+def order_by_keys(query, keys):
+    """Order a query by the given keyset, with NULLs last in either direction.
+
+    Args:
+        query (Query): Query to order.
+        keys (list): List of (column, descending) tuples. The last key must be unique.
+    Returns:
+        Query: The ordered query.
+    """
+    return query.order_by(
+        *(
+            (column.desc() if descending else column.asc()).nulls_last()
+            for column, descending in keys
+        )
+    )
+
+
+def encode_cursor(keys, row) -> str:
+    """Encode the keyset values of a row into an opaque cursor.
+
+    Args:
+        keys (list): List of (column, descending) tuples.
+        row: ORM object the next page starts after.
+    Returns:
+        str: URL-safe cursor string.
+    """
+    payload = {
+        "keys": [column.key for column, _ in keys],
+        "values": [to_jsonable_python(getattr(row, column.key)) for column, _ in keys],
+    }
+    encoded = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def decode_value(column, value):
+    """Convert a JSON cursor value back into the column's Python type.
+
+    Args:
+        column (InstrumentedAttribute): Column the value belongs to.
+        value: Value decoded from the cursor JSON.
+    Returns:
+        The value as the column's Python type.
+    """
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (date, datetime, time):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def decode_cursor(keys, cursor: str) -> list:
+    """Decode a cursor produced by encode_cursor for the same keyset.
+
+    Args:
+        keys (list): List of (column, descending) tuples.
+        cursor (str): Cursor string from the previous page.
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for another sort order.
+    Returns:
+        list: Keyset values of the last row of the previous page.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if payload["keys"] != [column.key for column, _ in keys]:
+            raise ValueError("cursor was issued for a different sort order")
+        return [
+            decode_value(column, value)
+            for (column, _), value in zip(keys, payload["values"], strict=True)
+        ]
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_keyset(keys, values):
+    """Build a condition matching rows sorted strictly after the given keyset values.
+
+    Expands to ``(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...`` so that each key
+    may be sorted in its own direction. As order_by_keys sorts NULLs last, every
+    NULL comes after a non-NULL value and nothing comes after a NULL but the
+    rows tied on it, which are compared with ``IS NULL``.
+
+    Args:
+        keys (list): List of (column, descending) tuples.
+        values (list): Keyset values of the last row of the previous page.
+    Returns:
+        ColumnElement: Boolean SQL expression.
+    """
+    clauses = []
+    for index, (column, descending) in enumerate(keys):
+        value = values[index]
+        if value is None:
+            continue
+        equal_prefix = [
+            prefix_column.is_(None) if prefix_value is None else prefix_column == prefix_value
+            for (prefix_column, _), prefix_value in zip(keys[:index], values[:index])
+        ]
+        after = column < value if descending else column > value
+        clauses.append(and_(*equal_prefix, or_(after, column.is_(None))))
+    return or_(false(), *clauses)
+
+
+def paginate(query, keys, limit: int, cursor: str = None) -> dict:
+    """Fetch one page of a query using keyset pagination.
+
+    Unlike offset pagination, the cost of fetching a page does not depend on
+    how deep into the result it is, and rows inserted or deleted between
+    requests do not shift later pages.
+
+    Args:
+        query (Query): Unordered query to paginate.
+        keys (list): List of (column, descending) tuples. The last key must be unique.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page with the records as ``items`` and the cursor of the next
+            page as ``nextCursor``, which is None on the last page.
+    """
+    if cursor:
+        query = query.filter(after_keyset(keys, decode_cursor(keys, cursor)))
+
+    rows = order_by_keys(query, keys).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(keys, items[-1]) if len(rows) > limit else None
+
+    return {"items": items, "nextCursor": next_cursor}
@@ -1,9 +1,29 @@
+import math
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 import schemas.promotion as promotion_schemas
 from models.promotion import Promotion
 from models.dish import Dish
+from models.hawkerCenter import HawkerCenter
+from models.stall import Stall
+from services.pagination import paginate
+import services.promotionScheduler as promotion_scheduler
+import services.responseCache as cache_services
+from services.imageVariants import variant_urls
+from services.spatialIndex import (
+    CELL_SIZE_DEGREES,
+    KM_PER_DEGREE,
+    get_hawker_center_index,
+    haversine_km,
+)
+
+
+# The active deals feed is cached per cell of the spatial index's grid, so
+# every request from the same ~1.1 km cell shares one database query
+DEALS_CELL_SIZE = CELL_SIZE_DEGREES
 
 
 def get_promotion_by_promotion_id(db: Session, promotionID: int):
@@ -53,6 +73,138 @@ def get_all_promotions(db: Session, skip: int = 0, limit: int = 100):
     return db_promotions
 
 
+def get_active_promotions_by_hawker_center_id(db: Session, hawkerCenterID: int):
+    """Retrieve the promotions running now at the stalls of a hawker center.
+
+    Reads Promotion.isActive, which services.promotionScheduler keeps up to
+    date, so no dates are compared.
+
+    Args:
+        db (Session): Database session.
+        hawkerCenterID (int): ID of the hawker center.
+
+    Returns:
+        list: List of active promotions, in ID order.
+    """
+    db_promotions = (
+        db.query(Promotion)
+        .join(Promotion.dishes)
+        .join(Dish.stall)
+        .filter(Promotion.isActive.is_(True), Stall.hawkerCenterID == hawkerCenterID)
+        .order_by(Promotion.promotionID)
+        .all()
+    )
+
+    return db_promotions
+
+
+def _deals_around_cell(db: Session, row: int, col: int, radius: float) -> list:
+    """Retrieve the active deals at the hawker centers that may be within
+    radius of some point of a geo-cell, with one query.
+
+    Args:
+        db (Session): Database session.
+        row (int): Latitude index of the cell.
+        col (int): Longitude index of the cell.
+        radius (float): Search radius in kilometres.
+    Returns:
+        list: Deals as JSON-compatible dicts, with their hawker center's coordinates.
+    """
+    # Every point of the cell is within one cell size of its centre
+    latitude = (row + 0.5) * DEALS_CELL_SIZE
+    longitude = (col + 0.5) * DEALS_CELL_SIZE
+    margin = DEALS_CELL_SIZE * KM_PER_DEGREE
+    index = get_hawker_center_index(db)
+    nearby = index.nearby(latitude, longitude, radius + margin, index.size)
+    if not nearby:
+        return []
+
+    rows = db.execute(
+        select(
+            Promotion.promotionID,
+            Promotion.discountedPrice,
+            Promotion.endDate,
+            Dish.dishID,
+            Dish.dishName,
+            Dish.price,
+            Dish.photo,
+            Stall.stallID,
+            Stall.stallName,
+            HawkerCenter.hawkerCenterID,
+            HawkerCenter.name.label("hawkerCenterName"),
+            HawkerCenter.latitude,
+            HawkerCenter.longitude,
+        )
+        .join(Promotion.dishes)
+        .join(Dish.stall)
+        .join(Stall.hawkerCenter)
+        .where(
+            Promotion.isActive.is_(True),
+            Stall.hawkerCenterID.in_([center_id for center_id, _ in nearby]),
+        )
+    )
+    return [
+        {
+            **row._mapping,
+            "endDate": row.endDate.isoformat(),
+            "photoVariants": variant_urls(row.photo),
+            "discountPercent": round((row.price - row.discountedPrice) / row.price * 100, 1)
+            if row.price
+            else 0.0,
+        }
+        for row in rows
+    ]
+
+
+def get_active_deals(db: Session, latitude: float, longitude: float, radius: float, limit: int):
+    """Retrieve the promotions running now near a location.
+
+    The deals around the location's geo-cell are cached; distances are then
+    computed from the exact location.
+
+    Args:
+        db (Session): Database session.
+        latitude (float): Latitude of the search location.
+        longitude (float): Longitude of the search location.
+        radius (float): Search radius in kilometres.
+        limit (int): Maximum number of deals to return.
+    Returns:
+        list: Deals with the largest discount first, then the nearest first.
+    """
+    row = math.floor(latitude / DEALS_CELL_SIZE)
+    col = math.floor(longitude / DEALS_CELL_SIZE)
+    deals = cache_services.cached_json(
+        "/promotions/active",
+        f"cell={row},{col}&radius={radius}",
+        [cache_services.PROMOTIONS, cache_services.STALLS],
+        lambda: _deals_around_cell(db, row, col, radius),
+    )
+
+    results = []
+    for deal in deals:
+        distance = haversine_km(latitude, longitude, deal["latitude"], deal["longitude"])
+        if distance <= radius:
+            results.append({**deal, "distance": round(distance, 3)})
+    results.sort(
+        key=lambda deal: (-deal["discountPercent"], deal["distance"], deal["promotionID"])
+    )
+    return results[:limit]
+
+
+def get_promotions_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of promotions in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of promotions and the cursor of the next page.
+    """
+    query = db.query(Promotion)
+    return paginate(query, [(Promotion.promotionID, False)], limit, cursor)
+
+
 def create_promotion(db: Session, promotion: promotion_schemas.PromotionCreate):
     """Create a new promotion for a dish.
 
@@ -79,7 +231,12 @@ def create_promotion(db: Session, promotion: promotion_schemas.PromotionCreate):
 
     db.add(db_promotion)
     db.commit()
+    promotion_scheduler.refresh_promotions(db, dishIDs=[db_dish.dishID])
+    promotion_scheduler.schedule_promotion(db_promotion)
     db.refresh(db_promotion)
+    cache_services.invalidate(
+        cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+    )
 
     return db_promotion
 
@@ -101,6 +258,7 @@ def update_promotion(db: Session, updated_promotion: promotion_schemas.Promotion
     )
     if not db_promotion:
         return None
+    previous_dishID = db_promotion.dishID
 
     # Update Promotion
     updated_promotion_data = updated_promotion.model_dump(exclude_unset=True)
@@ -109,7 +267,16 @@ def update_promotion(db: Session, updated_promotion: promotion_schemas.Promotion
 
     db.add(db_promotion)
     db.commit()
+    promotion_scheduler.refresh_promotions(
+        db, dishIDs=[previous_dishID, db_promotion.dishID]
+    )
+    promotion_scheduler.schedule_promotion(db_promotion)
     db.refresh(db_promotion)
+    if db_promotion.dishes:
+        cache_services.invalidate(
+            cache_services.stall_dishes_tag(db_promotion.dishes.stallID),
+            cache_services.PROMOTIONS,
+        )
 
     return db_promotion
 
@@ -134,7 +301,14 @@ def delete_promotion(db: Session, promotionID: int) -> bool:
     if not db_promotion:
         raise HTTPException(status_code=400, detail="Invalid promotionID")
 
+    db_dish = db_promotion.dishes
+
     db.delete(db_promotion)
     db.commit()
+    if db_dish:
+        promotion_scheduler.refresh_promotions(db, dishIDs=[db_dish.dishID])
+        cache_services.invalidate(
+            cache_services.stall_dishes_tag(db_dish.stallID), cache_services.PROMOTIONS
+        )
 
     return True
@@ -0,0 +1,212 @@
+import heapq
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, case, select
+from sqlalchemy.orm import Session
+
+from models.dish import Dish
+from models.promotion import Promotion
+import services.responseCache as cache_services
+
+
+# Seconds between reloads of the upcoming transitions from the database, which
+# picks up promotions changed by other worker processes
+PROMOTION_RESYNC_INTERVAL = int(os.environ.get("PROMOTION_RESYNC_INTERVAL", "300"))
+
+
+class PromotionSchedule:
+    """
+    Min-heap of upcoming promotion transitions, i.e. the start and end dates
+    of promotions, so the scheduler can sleep until the earliest one.
+
+    Entries are never removed when a promotion changes. A stale entry only
+    causes a refresh that changes nothing, and is dropped at the next reload.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+    def push(self, at: Optional[datetime], promotionID: int, now: datetime = None):
+        """
+        Schedule a transition, unless it is not in the future.
+
+        Args:
+            at (datetime): Time of the transition, naive local time like the models'
+            promotionID (int): ID of the promotion starting or ending then
+            now (datetime, optional): Current time
+        """
+        if at is None or at <= (now or datetime.now()):
+            return
+        with self.lock:
+            heapq.heappush(self.heap, (at, promotionID))
+            earliest = self.heap[0][0] == at
+        if earliest:
+            # Let the scheduler shorten its sleep
+            self.wakeup.set()
+
+    def pop_due(self, now: datetime) -> list:
+        """
+        Remove the transitions due by now.
+
+        Returns:
+            list: IDs of the promotions starting or ending, possibly repeated
+        """
+        due = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                due.append(heapq.heappop(self.heap)[1])
+        return due
+
+    def next_at(self) -> Optional[datetime]:
+        """
+        Time of the earliest upcoming transition, or None if there is none.
+        """
+        with self.lock:
+            return self.heap[0][0] if self.heap else None
+
+    def reload(self, db: Session, now: datetime):
+        """
+        Replace the transitions with those of the promotions not yet ended.
+
+        Args:
+            db (Session): Database session
+            now (datetime): Current time
+        """
+        rows = db.execute(
+            select(Promotion.promotionID, Promotion.startDate, Promotion.endDate).where(
+                Promotion.endDate > now
+            )
+        )
+        heap = []
+        for promotionID, startDate, endDate in rows:
+            if startDate is not None and startDate > now:
+                heap.append((startDate, promotionID))
+            heap.append((endDate, promotionID))
+        heapq.heapify(heap)
+        with self.lock:
+            self.heap = heap
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.heap)
+
+
+schedule = PromotionSchedule()
+
+
+def schedule_promotion(promotion: Promotion):
+    """Schedule the start and end of a created or updated promotion.
+
+    Args:
+        promotion (Promotion): The promotion.
+    """
+    now = datetime.now()
+    schedule.push(promotion.startDate, promotion.promotionID, now)
+    schedule.push(promotion.endDate, promotion.promotionID, now)
+
+
+def refresh_promotions(db: Session, now: datetime = None, dishIDs: list = None) -> dict:
+    """Bring Promotion.isActive and Dish.onPromotion in line with the
+    promotions' dates, with bulk updates of only the rows that changed.
+
+    A promotion is active from its startDate until, but excluding, its
+    endDate. A dish is on promotion while any of its promotions is active.
+    Commits the session, and invalidates the cached menus that changed.
+
+    Args:
+        db (Session): Database session.
+        now (datetime, optional): Time to evaluate the promotions at. Defaults to now.
+        dishIDs (list, optional): Only refresh these dishes and their promotions.
+    Returns:
+        dict: Numbers of promotions and dishes changed.
+    """
+    now = now or datetime.now()
+    active = case((and_(Promotion.startDate <= now, Promotion.endDate > now), True), else_=False)
+
+    promotion_filter = [Promotion.isActive.is_distinct_from(active)]
+    if dishIDs is not None:
+        promotion_filter.append(Promotion.dishID.in_(dishIDs))
+    stallIDs = set(
+        db.scalars(select(Dish.stallID).join(Promotion.dishes).where(*promotion_filter))
+    )
+    promotions = (
+        db.query(Promotion)
+        .filter(*promotion_filter)
+        .update({Promotion.isActive: active}, synchronize_session=False)
+    )
+
+    on_promotion = (
+        select(Promotion.promotionID)
+        .where(Promotion.dishID == Dish.dishID, Promotion.isActive.is_(True))
+        .exists()
+    )
+    dish_filter = [Dish.onPromotion.is_distinct_from(on_promotion)]
+    if dishIDs is not None:
+        dish_filter.append(Dish.dishID.in_(dishIDs))
+    stallIDs.update(db.scalars(select(Dish.stallID).where(*dish_filter)))
+    dishes = (
+        db.query(Dish)
+        .filter(*dish_filter)
+        .update({Dish.onPromotion: on_promotion}, synchronize_session=False)
+    )
+
+    db.commit()
+    if stallIDs:
+        cache_services.invalidate(
+            cache_services.PROMOTIONS, *map(cache_services.stall_dishes_tag, stallIDs)
+        )
+    return {"promotions": promotions, "dishes": dishes}
+
+
+def start_promotion_scheduler(session_factory, resync_interval: int = PROMOTION_RESYNC_INTERVAL):
+    """Refresh promotions at each start and end date in a daemon thread.
+
+    The thread refreshes every promotion at startup, then sleeps until the
+    earliest scheduled transition, or the next reload of the schedule.
+
+    Args:
+        session_factory: Callable returning a new database session, e.g. SessionLocal.
+        resync_interval (int, optional): Seconds between reloads of the schedule.
+    Returns:
+        threading.Thread: The scheduler thread.
+    """
+
+    def run():
+        next_resync = 0.0
+        while True:
+            schedule.wakeup.clear()
+            now = datetime.now()
+            try:
+                with session_factory() as db:
+                    if time.monotonic() >= next_resync:
+                        next_resync = time.monotonic() + resync_interval
+                        schedule.reload(db, now)
+                        changed = refresh_promotions(db, now)
+                    elif schedule.pop_due(now):
+                        changed = refresh_promotions(db, now)
+                    else:
+                        changed = None
+                if changed and any(changed.values()):
+                    print(
+                        f"Promotions refreshed: {changed['promotions']} promotions "
+                        f"and {changed['dishes']} dishes changed"
+                    )
+            except Exception as e:
+                # Retried at the next transition or reload
+                print(f"Error refreshing promotions: {str(e)}")
+
+            timeout = next_resync - time.monotonic()
+            next_at = schedule.next_at()
+            if next_at is not None:
+                timeout = min(timeout, (next_at - datetime.now()).total_seconds())
+            schedule.wakeup.wait(max(timeout, 0.0))
+
+    thread = threading.Thread(target=run, name="promotion-scheduler", daemon=True)
+    thread.start()
+    return thread
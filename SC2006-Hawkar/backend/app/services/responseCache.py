@@ -0,0 +1,244 @@
+import functools
+import inspect
+import json
+import os
+import threading
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+from factory.cache import CacheFactory
+
+
+# "memory" keeps an LRU in each process; "redis" shares one cache between
+# processes through a Redis-compatible server at CACHE_URL; "none" disables it.
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_URL = os.environ.get("CACHE_URL", "redis://localhost:6379/0")
+# Seconds a cached response is served for at most, even if nothing invalidates it
+CACHE_TTL = int(os.environ.get("CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "1024"))
+
+# Tags of cached responses, invalidated by the services that change them
+ALL = "*"  # carried by every cached response
+STALLS = "stalls"
+HAWKER_CENTERS = "hawker-centers"
+PROMOTIONS = "promotions"  # any dish or promotion shown in the active deals feed
+
+cache = CacheFactory.getCache(CACHE_BACKEND, CACHE_URL, CACHE_MAX_ENTRIES)
+
+# Hits and misses per route path, e.g. "/stall/{stall_id}"
+route_metrics = defaultdict(lambda: {"hits": 0, "misses": 0})
+metrics = {"invalidations": 0, "errors": 0}
+metrics_lock = threading.Lock()
+
+
+def stall_tag(stallID: int) -> str:
+    """Tag of a stall's own response."""
+    return f"stall:{stallID}"
+
+
+def stall_dishes_tag(stallID: int) -> str:
+    """Tag of a stall's dishes."""
+    return f"stall:{stallID}:dishes"
+
+
+def stall_reviews_tag(stallID: int) -> str:
+    """Tag of a stall's reviews."""
+    return f"stall:{stallID}:reviews"
+
+
+def _count(name: str, route: str = None):
+    with metrics_lock:
+        if route is None:
+            metrics[name] += 1
+        else:
+            route_metrics[route][name] += 1
+
+
+def invalidate(*tags: str):
+    """Stop serving the cached responses carrying any of the given tags.
+
+    Call after the change is committed. Cache errors are only logged, as
+    cached responses expire after CACHE_TTL anyway.
+
+    Args:
+        *tags (str): Tags to invalidate, e.g. stall_tag(7).
+    """
+    if cache is None or not tags:
+        return
+    try:
+        cache.invalidate(list(tags))
+        _count("invalidations")
+    except Exception as e:
+        _count("errors")
+        print(f"Error invalidating cached responses {tags}: {str(e)}")
+
+
+def invalidate_all():
+    """Stop serving every cached response, e.g. after a change to users or
+    hawker centers, which are nested in most responses."""
+    invalidate(ALL)
+
+
+async def render_json(endpoint, adapter: TypeAdapter, kwargs: dict):
+    """Run an endpoint and serialize its result like FastAPI would.
+
+    Sync endpoints run, and are serialized, in the threadpool, as lazy
+    loads during serialization may hit the database.
+
+    Args:
+        endpoint: The endpoint function, sync or async.
+        adapter (TypeAdapter): TypeAdapter of the route's response_model.
+        kwargs (dict): Arguments of the endpoint.
+    Returns:
+        bytes: The JSON body, or the Response the endpoint returned itself.
+    """
+
+    def serialize(result):
+        if isinstance(result, Response):
+            return result
+        return adapter.dump_json(
+            adapter.validate_python(result, from_attributes=True), by_alias=True
+        )
+
+    if inspect.iscoroutinefunction(endpoint):
+        return serialize(await endpoint(**kwargs))
+    return await run_in_threadpool(lambda: serialize(endpoint(**kwargs)))
+
+
+def cached_response(response_model, tags: list, ttl: int = CACHE_TTL):
+    """Cache a GET endpoint's serialized JSON response.
+
+    Responses are keyed by the request path and query string, and by the
+    current versions of their tags. A hit is returned as-is, skipping the
+    database and the response_model serialization. Endpoints that raise,
+    e.g. a 404, are not cached.
+
+    Args:
+        response_model: The route's response_model, used to serialize the result.
+        tags (list): Tags of the response, formatted with the endpoint's
+            arguments, e.g. "stall:{stall_id}".
+        ttl (int, optional): Seconds to serve the response for at most.
+    Returns:
+        Callable: Decorator for the endpoint, applied below @router.get.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*, cache_request: Request, **kwargs):
+            route = cache_request.scope["route"].path
+            key = None
+            body = None
+            if cache is not None:
+                try:
+                    response_tags = [ALL] + [tag.format(**kwargs) for tag in tags]
+                    versions = cache.getVersions(response_tags)
+                    query = urlencode(sorted(cache_request.query_params.multi_items()))
+                    key = f"{cache_request.url.path}?{query}#" + ".".join(map(str, versions))
+                    body = cache.get(key)
+                except Exception as e:
+                    _count("errors")
+                    print(f"Error reading cached response for {route}: {str(e)}")
+
+            if body is not None:
+                _count("hits", route)
+                return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+            _count("misses", route)
+
+            body = await render_json(endpoint, adapter, kwargs)
+            if isinstance(body, Response):
+                return body
+
+            if key is not None:
+                try:
+                    cache.set(key, body, ttl)
+                except Exception as e:
+                    _count("errors")
+                    print(f"Error caching response for {route}: {str(e)}")
+            return Response(body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+        # FastAPI reads the parameters from the signature; add the request
+        # to the endpoint's own parameters
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+            ]
+        )
+        return wrapper
+
+    return decorator
+
+
+def cached_json(route: str, key: str, tags: list, compute, ttl: int = CACHE_TTL):
+    """Cache a JSON-compatible value computed by a service.
+
+    For data shared by requests that cached_response would key apart, e.g.
+    the deals around a geo-cell, whatever the exact location in it.
+
+    Args:
+        route (str): Route path the value is counted under in the cache stats.
+        key (str): Key of the value among the route's values.
+        tags (list): Tags of the value.
+        compute: Function returning the value on a miss.
+        ttl (int, optional): Seconds to keep the value for at most.
+    Returns:
+        The cached value, or the computed one.
+    """
+    full_key = None
+    if cache is not None:
+        try:
+            versions = cache.getVersions([ALL] + list(tags))
+            full_key = f"{route}?{key}#" + ".".join(map(str, versions))
+            body = cache.get(full_key)
+            if body is not None:
+                _count("hits", route)
+                return json.loads(body)
+        except Exception as e:
+            _count("errors")
+            print(f"Error reading cached value for {route}: {str(e)}")
+    _count("misses", route)
+
+    value = compute()
+    if full_key is not None:
+        try:
+            cache.set(full_key, json.dumps(value).encode(), ttl)
+        except Exception as e:
+            _count("errors")
+            print(f"Error caching value for {route}: {str(e)}")
+    return value
+
+
+def get_cache_stats() -> dict:
+    """Report the response cache's hits and misses per route.
+
+    Returns:
+        dict: Backend, TTL, number of entries, invalidations and errors, and
+            hits, misses and hit rate per route.
+    """
+    with metrics_lock:
+        routes = {
+            route: {
+                **counts,
+                "hitRate": round(counts["hits"] / (counts["hits"] + counts["misses"]), 3)
+                if counts["hits"] + counts["misses"]
+                else 0.0,
+            }
+            for route, counts in route_metrics.items()
+        }
+        return {
+            "backend": CACHE_BACKEND if cache is not None else "none",
+            "ttl": CACHE_TTL,
+            "entries": cache.size() if cache is not None else 0,
+            "invalidations": metrics["invalidations"],
+            "errors": metrics["errors"],
+            "routes": routes,
+        }
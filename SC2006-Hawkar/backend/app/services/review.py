@@ -1,3 +1,8 @@
+import math
+from datetime import datetime
+
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -5,6 +10,10 @@ import schemas.review as review_schemas
 from models.review import Review
 from models.consumer import Consumer
 from models.stall import Stall
+import services.responseCache as cache_services
+import services.search as search_services
+from services.loadingProfile import with_loading_profile
+from services.pagination import paginate
 
 
 def get_review_by_review_id(db: Session, reviewID: int):
@@ -17,11 +26,33 @@ def get_review_by_review_id(db: Session, reviewID: int):
     Returns:
         Review: The review object, or None if not found.
     """
-    review = db.query(Review).filter(Review.reviewID == reviewID).first()
+    review = (
+        with_loading_profile(db.query(Review), review_schemas.Review)
+        .filter(Review.reviewID == reviewID)
+        .first()
+    )
 
     return review
 
 
+async def get_review_by_review_id_async(db: AsyncSession, reviewID: int):
+    """Retrieve a review by its review ID without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        reviewID (int): ID of the review.
+
+    Returns:
+        Review: The review object, or None if not found.
+    """
+    result = await db.execute(
+        with_loading_profile(select(Review), review_schemas.Review).filter(
+            Review.reviewID == reviewID
+        )
+    )
+    return result.unique().scalars().first()
+
+
 def get_reviews_by_consumer_id(db: Session, consumerID: int):
     """Retrieve all reviews by a consumer ID.
 
@@ -32,7 +63,11 @@ def get_reviews_by_consumer_id(db: Session, consumerID: int):
     Returns:
         list: List of reviews for the consumer.
     """
-    db_reviews = db.query(Review).filter(Review.consumerID == consumerID).all()
+    db_reviews = (
+        with_loading_profile(db.query(Review), review_schemas.Review)
+        .filter(Review.consumerID == consumerID)
+        .all()
+    )
 
     return db_reviews
 
@@ -47,11 +82,33 @@ def get_reviews_by_stall_id(db: Session, stallID: int):
     Returns:
         list: List of reviews for the stall.
     """
-    db_reviews = db.query(Review).filter(Review.stallID == stallID).all()
+    db_reviews = (
+        with_loading_profile(db.query(Review), review_schemas.Review)
+        .filter(Review.stallID == stallID)
+        .all()
+    )
 
     return db_reviews
 
 
+async def get_reviews_by_stall_id_async(db: AsyncSession, stallID: int):
+    """Retrieve all reviews by a stall ID without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        stallID (int): Stall ID.
+
+    Returns:
+        list: List of reviews for the stall.
+    """
+    result = await db.execute(
+        with_loading_profile(select(Review), review_schemas.Review).filter(
+            Review.stallID == stallID
+        )
+    )
+    return result.unique().scalars().all()
+
+
 def get_all_reviews(db: Session, skip: int = 0, limit: int = 100):
     """Retrieve all reviews with pagination.
 
@@ -63,11 +120,30 @@ def get_all_reviews(db: Session, skip: int = 0, limit: int = 100):
     Returns:
         list: List of reviews.
     """
-    db_reviews = db.query(Review).offset(skip).limit(limit).all()
+    db_reviews = (
+        with_loading_profile(db.query(Review), review_schemas.Review)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
     return db_reviews
 
 
+def get_reviews_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of reviews in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of reviews and the cursor of the next page.
+    """
+    query = with_loading_profile(db.query(Review), review_schemas.Review)
+    return paginate(query, [(Review.reviewID, False)], limit, cursor)
+
+
 def get_all_reported_reviews(db: Session, skip: int = 0, limit: int = 100):
     """Retrieve all reported reviews with pagination.
 
@@ -80,7 +156,7 @@ def get_all_reported_reviews(db: Session, skip: int = 0, limit: int = 100):
         list: List of reported reviews.
     """
     db_reviews = (
-        db.query(Review)
+        with_loading_profile(db.query(Review), review_schemas.Review)
         .filter(Review.isReported == True)
         .offset(skip)
         .limit(limit)
@@ -90,6 +166,83 @@ def get_all_reported_reviews(db: Session, skip: int = 0, limit: int = 100):
     return db_reviews
 
 
+def get_reported_reviews_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of reported reviews in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of reported reviews and the cursor of the next page.
+    """
+    query = with_loading_profile(db.query(Review), review_schemas.Review).filter(
+        Review.isReported == True
+    )
+    return paginate(query, [(Review.reviewID, False)], limit, cursor)
+
+
+def rating_bucket(rating: float) -> int:
+    """Get the 1-5 star histogram bucket a rating is counted in, rounding half up.
+
+    Args:
+        rating (float): Review rating.
+    Returns:
+        int: Number of stars.
+    """
+    return min(5, max(1, math.floor(rating + 0.5)))
+
+
+def update_rating_aggregates(
+    db: Session,
+    stallID: int,
+    added: float = None,
+    removed: float = None,
+    reviewedAt: datetime = None,
+):
+    """Apply a review's rating change to its stall's rating aggregates.
+
+    The change is a single UPDATE relative to the stored values, so it
+    commits or rolls back with the review itself and concurrent reviews
+    don't overwrite each other's counts. Reviews without a rating aren't
+    counted.
+
+    Args:
+        db (Session): Database session.
+        stallID (int): ID of the reviewed stall.
+        added (float, optional): Rating added by a new or updated review.
+        removed (float, optional): Rating removed by a deleted or updated review.
+        reviewedAt (datetime, optional): Submission time of a new review.
+    """
+    count_delta = (added is not None) - (removed is not None)
+    sum_delta = (added or 0) - (removed or 0)
+    count = Stall.ratingCount + count_delta
+    total = Stall.ratingSum + sum_delta
+    values = {
+        Stall.ratingCount: count,
+        Stall.ratingSum: total,
+        Stall.averageRating: case((count > 0, total / count), else_=0),
+    }
+
+    bucket_deltas = {}
+    if added is not None:
+        bucket = rating_bucket(added)
+        bucket_deltas[bucket] = bucket_deltas.get(bucket, 0) + 1
+    if removed is not None:
+        bucket = rating_bucket(removed)
+        bucket_deltas[bucket] = bucket_deltas.get(bucket, 0) - 1
+    for bucket, delta in bucket_deltas.items():
+        if delta:
+            column = getattr(Stall, f"rating{bucket}Count")
+            values[column] = column + delta
+    if reviewedAt is not None:
+        values[Stall.lastReviewedAt] = reviewedAt
+
+    db.query(Stall).filter(Stall.stallID == stallID).update(
+        values, synchronize_session=False
+    )
+
+
 def create_review(db: Session, review: review_schemas.ReviewCreate):
     """Create a new review for a consumer and stall.
 
@@ -124,9 +277,19 @@ def create_review(db: Session, review: review_schemas.ReviewCreate):
     )
 
     db.add(db_review)
+    update_rating_aggregates(
+        db, review.stallID, added=review.rating, reviewedAt=datetime.now()
+    )
     db.commit()
     db.refresh(db_review)
 
+    search_services.index_review(db_review)
+    cache_services.invalidate(
+        cache_services.STALLS,
+        cache_services.stall_tag(db_review.stallID),
+        cache_services.stall_reviews_tag(db_review.stallID),
+    )
+
     return db_review
 
 
@@ -147,14 +310,26 @@ def update_review(db: Session, updated_review: review_schemas.ReviewUpdate):
         return None
 
     # Update Review
+    old_rating = db_review.rating
     updated_review_data = updated_review.model_dump(exclude_unset=True)
     for key, value in updated_review_data.items():
         setattr(db_review, key, value)
 
     db.add(db_review)
+    if db_review.rating != old_rating:
+        update_rating_aggregates(
+            db, db_review.stallID, added=db_review.rating, removed=old_rating
+        )
     db.commit()
     db.refresh(db_review)
 
+    search_services.index_review(db_review)
+    cache_services.invalidate(
+        cache_services.STALLS,
+        cache_services.stall_tag(db_review.stallID),
+        cache_services.stall_reviews_tag(db_review.stallID),
+    )
+
     return db_review
 
 
@@ -195,6 +370,29 @@ def report_review(db: Session, reviewID: int, reportType: str, reportText: str):
     db.add(db_review)
     db.commit()
     db.refresh(db_review)
+    cache_services.invalidate(cache_services.stall_reviews_tag(db_review.stallID))
+
+    return db_review
+
+
+def ignore_reported_review(db: Session, reviewID: int):
+    """Clear the report on a review, keeping the review.
+
+    Args:
+        db (Session): Database session.
+        reviewID (int): ID of the review to ignore.
+
+    Returns:
+        Review: The updated review object, or None if not found.
+    """
+    db_review = db.query(Review).filter(Review.reviewID == reviewID).first()
+    if db_review is None:
+        return None
+
+    db_review.isReported = False
+    db.commit()
+    db.refresh(db_review)
+    cache_services.invalidate(cache_services.stall_reviews_tag(db_review.stallID))
 
     return db_review
 
@@ -218,6 +416,15 @@ def delete_review(db: Session, reviewID: int) -> bool:
         raise HTTPException(status_code=400, detail="Invalid reviewID")
 
     db.delete(db_review)
+    if db_review.rating is not None:
+        update_rating_aggregates(db, db_review.stallID, removed=db_review.rating)
     db.commit()
 
+    search_services.remove_from_index("reviews", reviewID)
+    cache_services.invalidate(
+        cache_services.STALLS,
+        cache_services.stall_tag(db_review.stallID),
+        cache_services.stall_reviews_tag(db_review.stallID),
+    )
+
     return True
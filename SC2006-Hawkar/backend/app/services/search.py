@@ -0,0 +1,506 @@
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict, deque
+from heapq import nlargest
+
+from sqlalchemy.orm import Session, joinedload
+
+import schemas.hawker as hawker_schemas
+import schemas.review as review_schemas
+import schemas.stall as stall_schemas
+from database import engine
+from factory.search import SearchFactory
+from models.dish import Dish
+from models.hawker import Hawker
+from models.review import Review
+from models.stall import Stall
+from models.user import User
+from schemas.user import Role
+from services.loadingProfile import with_loading_profile
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# "memory" searches an index held by each process; "database" pushes the
+# search down into the database's own full-text index (FTS5 or tsvector).
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "memory")
+
+# Relative weight of each indexed field; names outrank cuisines and reviews.
+NAME_WEIGHT = 1.0
+CUISINE_WEIGHT = 0.7
+REVIEW_WEIGHT = 0.5
+
+# Match quality per query term, multiplied by the field weight.
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.5  # plus up to PREFIX_BONUS the closer the prefix is to the whole token
+PREFIX_BONUS = 0.4
+FUZZY_MATCH = 0.45  # minus FUZZY_PENALTY per edit
+FUZZY_PENALTY = 0.1
+
+# Bounds that keep a search fast regardless of the index size.
+MAX_QUERY_TERMS = 8
+MAX_PREFIX_EXPANSIONS = 500
+MAX_CANDIDATES = 1000
+FUZZY_MIN_LENGTH = 4
+
+
+def normalize(text: str) -> str:
+    """Case-fold text and strip accents so that "Café" matches "cafe"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: str) -> list:
+    """Split text into normalized word tokens."""
+    return TOKEN_PATTERN.findall(normalize(text or ""))
+
+
+def max_edit_distance(term: str) -> int:
+    """Number of typos tolerated in a query term of this length."""
+    if len(term) < FUZZY_MIN_LENGTH:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+class _TrieNode:
+    __slots__ = ("children", "token", "postings")
+
+    def __init__(self):
+        self.children = {}
+        # Set on the node a token ends at; postings is {(kind, id): field weight}
+        self.token = None
+        self.postings = None
+
+
+class SearchIndex:
+    """
+    In-memory full-text index combining a prefix trie with an inverted index.
+
+    Every distinct token is a path in the trie, and the node it ends at holds
+    the token's posting list. A query term is first expanded into the tokens
+    it matches: itself, its completions (shortest first) and, when those are
+    scarce, the tokens within a small edit distance. The most selective term
+    then supplies up to MAX_CANDIDATES candidate documents, and the other
+    terms are checked against each candidate's own tokens.
+
+    Documents are identified by (kind, id), e.g. ("stalls", 7), and indexed as
+    a list of (text, weight) fields. All methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._terms = {}
+        self._documents = {}
+        self._lock = threading.RLock()
+        self._pending = None
+        self.ready = False
+
+    def __len__(self):
+        return len(self._documents)
+
+    # ----- Indexing ----- #
+
+    def _add(self, key, fields):
+        tokens = {}
+        for text, weight in fields:
+            for token in tokenize(text):
+                if weight > tokens.get(token, 0):
+                    tokens[token] = weight
+        if not tokens:
+            return
+        self._documents[key] = tokens
+
+        for token, weight in tokens.items():
+            node = self._terms.get(token)
+            if node is None:
+                node = self._root
+                for char in token:
+                    child = node.children.get(char)
+                    if child is None:
+                        child = node.children[char] = _TrieNode()
+                    node = child
+                node.token = token
+                node.postings = {}
+                self._terms[token] = node
+            node.postings[key] = weight
+
+    def _remove(self, key):
+        tokens = self._documents.pop(key, None)
+        if not tokens:
+            return
+        for token in tokens:
+            node = self._terms[token]
+            del node.postings[key]
+            if not node.postings:
+                node.token = node.postings = None
+                del self._terms[token]
+                self._prune(token)
+
+    def _prune(self, token):
+        path = [self._root]
+        for char in token:
+            path.append(path[-1].children[char])
+        for depth in range(len(token), 0, -1):
+            node = path[depth]
+            if node.children or node.token is not None:
+                break
+            del path[depth - 1].children[token[depth - 1]]
+
+    def upsert(self, kind: str, doc_id: int, fields):
+        """
+        Add a document to the index or replace its indexed fields.
+
+        Args:
+            kind (str): Document type, e.g. "stalls"
+            doc_id (int): Primary key of the document
+            fields (list): (text, weight) tuples to index
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((kind, doc_id, fields))
+            self._remove((kind, doc_id))
+            self._add((kind, doc_id), fields)
+
+    def remove(self, kind: str, doc_id: int):
+        """
+        Remove a document from the index.
+
+        Args:
+            kind (str): Document type, e.g. "stalls"
+            doc_id (int): Primary key of the document
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((kind, doc_id, None))
+            self._remove((kind, doc_id))
+
+    def begin_rebuild(self):
+        """Start recording changes made while a rebuild reads the database."""
+        with self._lock:
+            self._pending = []
+
+    def finish_rebuild(self, documents):
+        """
+        Replace the index contents, then replay changes recorded since begin_rebuild.
+
+        Args:
+            documents (iterable): (kind, id, fields) tuples
+        """
+        fresh = SearchIndex()
+        for kind, doc_id, fields in documents:
+            fresh._add((kind, doc_id), fields)
+
+        with self._lock:
+            for kind, doc_id, fields in self._pending or ():
+                fresh._remove((kind, doc_id))
+                if fields is not None:
+                    fresh._add((kind, doc_id), fields)
+            self._root, self._terms, self._documents = (
+                fresh._root,
+                fresh._terms,
+                fresh._documents,
+            )
+            self._pending = None
+            self.ready = True
+
+    # ----- Searching ----- #
+
+    def _find(self, prefix: str):
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _fuzzy_tokens(self, term: str, max_distance: int):
+        """
+        Yield (token, distance) for the tokens within max_distance edits of term.
+
+        Walks the trie computing one row of the edit distance matrix per node
+        and abandons a branch once every cell of its row exceeds max_distance.
+        Adjacent transpositions count as one edit. As in most search engines
+        the first letter must match, which prunes all but one root branch.
+        """
+        start = self._root.children.get(term[0])
+        if start is None:
+            return
+        size = len(term)
+        # Distances from the one-letter prefix term[0] to each prefix of term
+        first = [1] + list(range(size))
+        stack = [(start, term[0], first, None, None)]
+        while stack:
+            node, char, row, previous_row, previous_char = stack.pop()
+            if node.token is not None and row[size] <= max_distance:
+                yield node.token, row[size]
+            if min(row) > max_distance:
+                continue
+            for next_char, child in node.children.items():
+                next_row = [row[0] + 1]
+                for i in range(1, size + 1):
+                    cost = row[i - 1] + (term[i - 1] != next_char)
+                    if (
+                        i > 1
+                        and term[i - 1] == char
+                        and term[i - 2] == next_char
+                        and previous_row is not None
+                    ):
+                        cost = min(cost, previous_row[i - 2] + 1)
+                    next_row.append(min(cost, next_row[i - 1] + 1, row[i] + 1))
+                stack.append((child, next_char, next_row, row, char))
+
+    def _expand(self, term: str, limit: int):
+        """
+        Map the tokens a query term matches to their match quality.
+
+        Returns:
+            tuple: ({token: quality}, number of postings of those tokens)
+        """
+        expansions = {}
+        matched = 0
+
+        node = self._terms.get(term)
+        if node is not None:
+            expansions[term] = EXACT_MATCH
+            matched += len(node.postings)
+
+        # Breadth-first so that the shortest completions are kept
+        prefix_node = self._find(term)
+        if prefix_node is not None:
+            queue = deque(prefix_node.children.values())
+            while queue and len(expansions) < MAX_PREFIX_EXPANSIONS:
+                node = queue.popleft()
+                if node.token is not None:
+                    expansions[node.token] = (
+                        PREFIX_MATCH + PREFIX_BONUS * len(term) / len(node.token)
+                    )
+                    matched += len(node.postings)
+                queue.extend(node.children.values())
+
+        # Only fall back to typo tolerance when exact and prefix matches are scarce
+        max_distance = max_edit_distance(term)
+        if max_distance and matched < limit:
+            for token, distance in self._fuzzy_tokens(term, max_distance):
+                if token not in expansions:
+                    expansions[token] = FUZZY_MATCH - FUZZY_PENALTY * distance
+                    matched += len(self._terms[token].postings)
+
+        return expansions, matched
+
+    def _candidates(self, expansions: dict) -> dict:
+        """Score up to MAX_CANDIDATES documents containing the expanded tokens, best tokens first."""
+        scores = {}
+        for token, quality in sorted(expansions.items(), key=lambda item: item[1], reverse=True):
+            for key, weight in self._terms[token].postings.items():
+                if weight * quality > scores.get(key, 0.0):
+                    scores[key] = weight * quality
+                    if len(scores) >= MAX_CANDIDATES:
+                        return scores
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> dict:
+        """
+        Rank the documents matching every term of a query.
+
+        Each term matches a token exactly, as a prefix or with a few typos.
+        A document's score is the sum over the terms of its best match; ties
+        go to the document with fewer tokens, i.e. the closer match.
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results per kind
+
+        Returns:
+            dict: {kind: [(id, score), ...]} with the best matches first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not terms:
+            return {}
+
+        with self._lock:
+            expanded = [self._expand(term, limit) for term in terms]
+            if not all(expansions for expansions, _ in expanded):
+                return {}
+
+            # The term with the fewest postings supplies the candidates
+            expanded.sort(key=lambda item: item[1])
+            scores = self._candidates(expanded[0][0])
+
+            for expansions, _ in expanded[1:]:
+                filtered = {}
+                for key, score in scores.items():
+                    best = 0.0
+                    for token, weight in self._documents[key].items():
+                        quality = expansions.get(token)
+                        if quality is not None and weight * quality > best:
+                            best = weight * quality
+                    if best:
+                        filtered[key] = score + best
+                scores = filtered
+
+            by_kind = defaultdict(list)
+            for (kind, doc_id), score in scores.items():
+                by_kind[kind].append((score, -len(self._documents[(kind, doc_id)]), -doc_id))
+
+        return {
+            kind: [(-doc_id, score) for score, _, doc_id in nlargest(limit, matches)]
+            for kind, matches in by_kind.items()
+        }
+
+
+search_index = SearchIndex()
+database_search = (
+    SearchFactory.getSearch(engine.dialect.name) if SEARCH_BACKEND == "database" else None
+)
+
+
+# ----- Documents ----- #
+
+
+def stall_fields(stall: Stall) -> list:
+    return [(stall.stallName, NAME_WEIGHT)] + [
+        (cuisine, CUISINE_WEIGHT) for cuisine in stall.cuisineType or []
+    ]
+
+
+def dish_fields(dish: Dish) -> list:
+    return [(dish.dishName, NAME_WEIGHT)]
+
+
+def hawker_fields(hawker: Hawker) -> list:
+    return [(hawker.user.name if hawker.user else "", NAME_WEIGHT)]
+
+
+def review_fields(review: Review) -> list:
+    return [(review.reviewText, REVIEW_WEIGHT)]
+
+
+def index_stall(stall: Stall):
+    """Add or refresh a stall in the search index. No-op until the index is built."""
+    if search_index.ready:
+        search_index.upsert("stalls", stall.stallID, stall_fields(stall))
+
+
+def index_dish(dish: Dish):
+    """Add or refresh a dish in the search index. No-op until the index is built."""
+    if search_index.ready:
+        search_index.upsert("dishes", dish.dishID, dish_fields(dish))
+
+
+def index_hawker(hawker: Hawker):
+    """Add or refresh a hawker in the search index. No-op until the index is built."""
+    if search_index.ready:
+        search_index.upsert("hawkers", hawker.hawkerID, hawker_fields(hawker))
+
+
+def index_review(review: Review):
+    """Add or refresh a review in the search index. No-op until the index is built."""
+    if search_index.ready:
+        search_index.upsert("reviews", review.reviewID, review_fields(review))
+
+
+def index_user(db: Session, user: User):
+    """Refresh the hawker profile of a user whose name may have changed."""
+    if search_index.ready and user.role == Role.HAWKER:
+        hawker = db.query(Hawker).filter(Hawker.userID == user.userID).first()
+        if hawker is not None:
+            index_hawker(hawker)
+
+
+def remove_from_index(kind: str, doc_id: int):
+    """Remove a deleted stall, dish, hawker or review from the search index."""
+    if search_index.ready:
+        search_index.remove(kind, doc_id)
+
+
+def build_search_index(db: Session) -> SearchIndex:
+    """
+    Rebuild the search index from the database.
+
+    Args:
+        db (Session): Database session
+
+    Returns:
+        SearchIndex: The rebuilt index
+    """
+    search_index.begin_rebuild()
+    documents = []
+    for stall in db.query(Stall):
+        documents.append(("stalls", stall.stallID, stall_fields(stall)))
+    for dish in db.query(Dish):
+        documents.append(("dishes", dish.dishID, dish_fields(dish)))
+    for hawker in db.query(Hawker).options(joinedload(Hawker.user)):
+        documents.append(("hawkers", hawker.hawkerID, hawker_fields(hawker)))
+    for review in db.query(Review):
+        documents.append(("reviews", review.reviewID, review_fields(review)))
+    search_index.finish_rebuild(documents)
+    return search_index
+
+
+def setup_search(db: Session):
+    """
+    Prepare the configured search backend: build the in-memory index, or
+    create the database's full-text index and triggers if missing, on the
+    primary as replicas only copy its writes.
+
+    Args:
+        db (Session): Database session
+    """
+    if database_search is not None:
+        database_search.setup(db.get_primary_bind())
+    else:
+        build_search_index(db)
+
+
+# Model, primary key and response schema with a loading profile, per kind
+SEARCH_TARGETS = {
+    "hawkers": (Hawker, Hawker.hawkerID, hawker_schemas.Hawker),
+    "stalls": (Stall, Stall.stallID, stall_schemas.Stall),
+    "dishes": (Dish, Dish.dishID, None),
+    "reviews": (Review, Review.reviewID, review_schemas.Review),
+}
+
+
+def search_all(db: Session, query: str, limit: int = 10) -> dict:
+    """
+    Search hawkers, stalls and dishes by name, stalls by cuisine and reviews by text.
+
+    The database backend matches every word as a prefix but, unlike the
+    in-memory index, does not tolerate typos.
+
+    Args:
+        db (Session): Database session
+        query (str): Free-text query; the last word may be incomplete
+        limit (int): Maximum number of results per kind
+
+    Returns:
+        dict: Hawkers, stalls, dishes and reviews, best matches first
+    """
+    if database_search is not None:
+        if not database_search.ready:
+            database_search.setup(db.get_primary_bind())
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        ranked = database_search.search(db, terms, limit) if terms else {}
+    else:
+        if not search_index.ready:
+            build_search_index(db)
+        ranked = {
+            kind: [doc_id for doc_id, _ in matches]
+            for kind, matches in search_index.search(query, limit).items()
+        }
+
+    results = {}
+    for kind, (model, primary_key, schema) in SEARCH_TARGETS.items():
+        ids = ranked.get(kind, [])
+        if not ids:
+            results[kind] = []
+            continue
+        rows = db.query(model)
+        if schema is not None:
+            rows = with_loading_profile(rows, schema)
+        by_id = {getattr(row, primary_key.key): row for row in rows.filter(primary_key.in_(ids))}
+        results[kind] = [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+    return results
@@ -0,0 +1,197 @@
+import math
+import threading
+from collections import defaultdict
+from itertools import chain
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.hawkerCenter import HawkerCenter
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# ~1.1 km per cell, so a typical "near me" radius only touches a few cells.
+CELL_SIZE_DEGREES = 0.01
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Great-circle distance between two coordinates.
+
+    Args:
+        lat1 (float): Latitude of the first point in degrees
+        lng1 (float): Longitude of the first point in degrees
+        lat2 (float): Latitude of the second point in degrees
+        lng2 (float): Longitude of the second point in degrees
+
+    Returns:
+        float: Distance in kilometres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialIndex:
+    """
+    Uniform grid index over point coordinates for radius and nearest-k queries.
+
+    Points are bucketed into square cells of CELL_SIZE_DEGREES. A query only
+    computes distances for the points in cells overlapping the search radius.
+    """
+
+    def __init__(self, points, cell_size: float = CELL_SIZE_DEGREES):
+        """
+        Build the index.
+
+        Args:
+            points (iterable): (id, latitude, longitude) tuples
+            cell_size (float): Cell size in degrees
+        """
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.size = 0
+        for point in points:
+            self.cells[self._cell(point[1], point[2])].append(point)
+            self.size += 1
+
+    def _cell(self, latitude: float, longitude: float) -> tuple:
+        return (
+            math.floor(latitude / self.cell_size),
+            math.floor(longitude / self.cell_size),
+        )
+
+    def _candidate_cells(self, latitude: float, longitude: float, radius_km: float):
+        """
+        Yield the non-empty cells overlapping the bounding box of the search circle.
+        """
+        lat_span = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(abs(latitude) + lat_span, 90.0)))
+        lng_span = 180.0 if cos_lat < 1e-9 else radius_km / (KM_PER_DEGREE * cos_lat)
+
+        min_row, min_col = self._cell(latitude - lat_span, longitude - lng_span)
+        max_row, max_col = self._cell(latitude + lat_span, longitude + lng_span)
+
+        # Scan whichever is smaller: the cells in the box or the occupied cells.
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self.cells):
+            for (row, col), points in self.cells.items():
+                if min_row <= row <= max_row and min_col <= col <= max_col:
+                    yield points
+            return
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                points = self.cells.get((row, col))
+                if points:
+                    yield points
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float, k: int):
+        """
+        Find the k nearest points within a radius.
+
+        Args:
+            latitude (float): Latitude of the search centre
+            longitude (float): Longitude of the search centre
+            radius_km (float): Search radius in kilometres
+            k (int): Maximum number of points to return
+
+        Returns:
+            list: (id, distance_km) tuples, nearest first
+        """
+        matches = []
+        for points in self._candidate_cells(latitude, longitude, radius_km):
+            for point_id, point_lat, point_lng in points:
+                distance = haversine_km(latitude, longitude, point_lat, point_lng)
+                if distance <= radius_km:
+                    matches.append((point_id, distance))
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches[:k]
+
+
+_index: Optional[SpatialIndex] = None
+_index_generation = 0
+_index_lock = threading.Lock()
+
+
+def build_hawker_center_index(db: Session) -> SpatialIndex:
+    """
+    Rebuild the hawker center index from the database.
+
+    Args:
+        db (Session): Database session
+
+    Returns:
+        SpatialIndex: The new index
+    """
+    global _index
+    generation = _index_generation
+    rows = (
+        db.query(
+            HawkerCenter.hawkerCenterID, HawkerCenter.latitude, HawkerCenter.longitude
+        )
+        .filter(HawkerCenter.latitude.is_not(None), HawkerCenter.longitude.is_not(None))
+        .all()
+    )
+    index = SpatialIndex(tuple(row) for row in rows)
+    with _index_lock:
+        # Don't install an index read before a concurrent invalidation.
+        if generation == _index_generation:
+            _index = index
+    return index
+
+
+def get_hawker_center_index(db: Session) -> SpatialIndex:
+    """
+    Get the hawker center index, building it if it has not been built or was invalidated.
+
+    Args:
+        db (Session): Database session used if the index needs to be built
+
+    Returns:
+        SpatialIndex: The current index
+    """
+    index = _index
+    if index is None:
+        index = build_hawker_center_index(db)
+    return index
+
+
+def invalidate_hawker_center_index():
+    """
+    Drop the hawker center index so that it is rebuilt on next use.
+
+    Call this after changing hawker centers without going through the ORM
+    (e.g. bulk inserts); ORM changes are tracked automatically.
+    """
+    global _index, _index_generation
+    with _index_lock:
+        _index = None
+        _index_generation += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _track_hawker_center_changes(session, flush_context):
+    if any(
+        isinstance(instance, HawkerCenter)
+        for instance in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info["hawker_centers_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("hawker_centers_changed", False):
+        invalidate_hawker_center_index()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("hawker_centers_changed", None)
@@ -1,65 +1,84 @@
+from sqlalchemy import and_, or_, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
-import json
+from fastapi import HTTPException, UploadFile
+from datetime import datetime
 
 import schemas.stall as stall_schemas
 from models.stall import Stall
 from models.hawker import Hawker
 from models.hawkerCenter import HawkerCenter
-from services.objectStorage import ObjectStorage
+from schemas.user import CuisineType
+from services.objectStorage import ObjectStorage, check_image_upload
+import services.likeStall as likeStall_services
+import services.responseCache as cache_services
+import services.search as search_services
+from services.loadingProfile import with_loading_profile
+from services.pagination import order_by_keys, paginate
+from services.spatialIndex import get_hawker_center_index
 
 
-def convert_str_to_list(images_string):
-    """Convert comma-separated image URLs to a list.
+def convert_cuisine_types(cuisine_types):
+    """Convert cuisine types to the string values stored in the JSON column.
 
     Args:
-        images_string (str or None): String of comma-separated image URLs or None.
+        cuisine_types (list or None): List of CuisineType members or strings.
     Returns:
-        list: List of image URL strings.
+        list: List of cuisine type strings.
     """
-    if not images_string:  # Handle both None and empty string
+    if not cuisine_types:
         return []
-    if images_string and isinstance(images_string, str):
-        return [url.strip() for url in images_string.split(",") if url.strip()]
-    return [] if images_string is None else images_string
+    return [
+        cuisine.value if isinstance(cuisine, CuisineType) else cuisine
+        for cuisine in cuisine_types
+    ]
 
 
-def convert_list_to_str(images_list):
-    """Convert list of image URLs to comma-separated string.
+def get_stall_by_stall_id(db: Session, stallID: int):
+    """Retrieve a stall by its stall ID.
 
     Args:
-        images_list (list or None): List of image URL strings or None.
+        db (Session): Database session.
+        stallID (int): ID of the stall.
+    Raises:
+        HTTPException: If the stall is not found.
     Returns:
-        str: Comma-separated string of image URLs.
+        Stall: The stall object.
     """
-    if images_list and isinstance(images_list, list):
-        string_values = [
-            str(item.value) if hasattr(item, "value") else str(item)
-            for item in images_list
-        ]
-        return ", ".join(string_values)
-    return images_list
+    db_stall = (
+        with_loading_profile(db.query(Stall), stall_schemas.Stall)
+        .filter(Stall.stallID == stallID)
+        .first()
+    )
+
+    if not db_stall:
+        raise HTTPException(status_code=404, detail="Stall not found")
 
+    return db_stall
 
-def get_stall_by_stall_id(db: Session, stallID: int):
-    """Retrieve a stall by its stall ID.
+
+async def get_stall_by_stall_id_async(db: AsyncSession, stallID: int):
+    """Retrieve a stall by its stall ID without blocking the event loop.
 
     Args:
-        db (Session): Database session.
+        db (AsyncSession): Async database session.
         stallID (int): ID of the stall.
     Raises:
         HTTPException: If the stall is not found.
     Returns:
         Stall: The stall object.
     """
-    db_stall = db.query(Stall).filter(Stall.stallID == stallID).first()
+    result = await db.execute(
+        with_loading_profile(select(Stall), stall_schemas.Stall).filter(
+            Stall.stallID == stallID
+        )
+    )
+    db_stall = result.unique().scalars().first()
 
     if not db_stall:
         raise HTTPException(status_code=404, detail="Stall not found")
 
-    # Convert images from string to list
-    db_stall.images = convert_str_to_list(db_stall.images)
-    db_stall.cuisineType = convert_str_to_list(db_stall.cuisineType)
     return db_stall
 
 
@@ -69,40 +88,166 @@ def get_stalls_by_hawker_id(db: Session, hawkerID: int):
     Args:
         db (Session): Database session.
         hawkerID (int): ID of the hawker.
-    Raises:
-        HTTPException: If the hawkerID is invalid.
     Returns:
-        list: List of stalls for the hawker.
+        list: List of stalls for the hawker (empty if none found).
     """
-    db_stalls = db.query(Stall).filter(Stall.hawkerID == hawkerID)
-
-    if not db_stalls:
-        raise HTTPException(status_code=400, detail="Invalid hawkerID")
+    db_stalls = (
+        with_loading_profile(db.query(Stall), stall_schemas.Stall)
+        .filter(Stall.hawkerID == hawkerID)
+        .all()
+    )
 
-    # Convert images from string to list for each stall
-    for stall in db_stalls:
-        stall.images = convert_str_to_list(stall.images)
-        stall.cuisineType = convert_str_to_list(stall.cuisineType)
     return db_stalls
 
 
-def get_all_stalls(db: Session, skip: int = 0, limit: int = 100):
-    """Retrieve all stalls with pagination.
+async def get_stalls_by_hawker_id_async(db: AsyncSession, hawkerID: int):
+    """Retrieve all stalls for a given hawker ID without blocking the event loop.
+
+    Args:
+        db (AsyncSession): Async database session.
+        hawkerID (int): ID of the hawker.
+    Returns:
+        list: List of stalls for the hawker (empty if none found).
+    """
+    result = await db.execute(
+        with_loading_profile(select(Stall), stall_schemas.Stall).filter(
+            Stall.hawkerID == hawkerID
+        )
+    )
+    return result.unique().scalars().all()
+
+
+def cuisine_type_matches(db: Session, cuisine_types):
+    """Build a SQL condition matching stalls offering any of the cuisine types.
+
+    Args:
+        db (Session): Database session, used to pick the dialect-specific JSON operator.
+        cuisine_types (list): List of CuisineType members or strings.
+    Returns:
+        ColumnElement: Boolean SQL expression on Stall.cuisineType.
+    """
+    values = convert_cuisine_types(cuisine_types)
+    if db.get_bind().dialect.name == "postgresql":
+        return type_coerce(Stall.cuisineType, JSONB).has_any(array(values))
+
+    cuisines = func.json_each(Stall.cuisineType).table_valued("value")
+    return select(cuisines.c.value).where(cuisines.c.value.in_(values)).exists()
+
+
+def open_at(time_of_day):
+    """Build a SQL condition matching stalls open at the given time of day.
+
+    Stalls whose closing time is earlier than their opening time are treated
+    as open across midnight.
+
+    Args:
+        time_of_day (time): Time of day to check.
+    Returns:
+        ColumnElement: Boolean SQL expression on Stall.startTime and Stall.endTime.
+    """
+    return or_(
+        and_(
+            Stall.startTime <= Stall.endTime,
+            Stall.startTime <= time_of_day,
+            Stall.endTime >= time_of_day,
+        ),
+        and_(
+            Stall.startTime > Stall.endTime,
+            or_(Stall.startTime <= time_of_day, Stall.endTime >= time_of_day),
+        ),
+    )
+
+
+def filter_stalls(db: Session, filters: stall_schemas.StallFilter):
+    """Build a query for the stalls matching the given filters.
+
+    Args:
+        db (Session): Database session.
+        filters (StallFilter): Filter options.
+    Returns:
+        Query: Unordered query over stalls with the stall loading profile applied,
+            loading likedByMe when a userID is given.
+    """
+    query = with_loading_profile(db.query(Stall), stall_schemas.Stall)
+    if filters.userID is not None:
+        query = likeStall_services.with_liked_by_me(query, filters.userID)
+
+    if filters.cuisineType:
+        query = query.filter(cuisine_type_matches(db, filters.cuisineType))
+    if filters.hygieneRating:
+        query = query.filter(Stall.hygieneRating.in_(filters.hygieneRating))
+    if filters.priceRange:
+        query = query.filter(Stall.priceRange.in_(filters.priceRange))
+    if filters.openAt or filters.openNow:
+        query = query.filter(open_at(filters.openAt or datetime.now().time()))
+    if filters.maxWaitTime is not None:
+        query = query.filter(Stall.estimatedWaitTime <= filters.maxWaitTime)
+    if filters.hawkerCenterID is not None:
+        query = query.filter(Stall.hawkerCenterID == filters.hawkerCenterID)
+
+    return query
+
+
+def stall_sort_keys(filters: stall_schemas.StallFilter):
+    """Get the keyset stalls are sorted by, with the stall ID as tie-breaker.
+
+    Args:
+        filters (StallFilter): Sort options.
+    Returns:
+        list: List of (column, descending) tuples.
+    """
+    descending = filters.order == stall_schemas.SortOrder.DESC
+    sort_column = getattr(Stall, filters.sortBy.value)
+    if sort_column is Stall.stallID:
+        return [(Stall.stallID, descending)]
+    return [(sort_column, descending), (Stall.stallID, descending)]
+
+
+def get_all_stalls(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    filters: stall_schemas.StallFilter = None,
+):
+    """Retrieve stalls matching the given filters with pagination.
 
     Args:
         db (Session): Database session.
         skip (int): Number of records to skip.
         limit (int): Maximum number of records to return.
+        filters (StallFilter, optional): Filter and sort options.
     Returns:
         list: List of stalls.
     """
-    db_stalls = db.query(Stall).offset(skip).limit(limit).all()
+    if filters is None:
+        filters = stall_schemas.StallFilter()
 
-    # Convert images from string to list for each stall
-    for stall in db_stalls:
-        stall.images = convert_str_to_list(stall.images)
-        stall.cuisineType = convert_str_to_list(stall.cuisineType)
-    return db_stalls
+    query = order_by_keys(filter_stalls(db, filters), stall_sort_keys(filters))
+    return query.offset(skip).limit(limit).all()
+
+
+def get_stalls_page(
+    db: Session,
+    limit: int = 100,
+    cursor: str = None,
+    filters: stall_schemas.StallFilter = None,
+):
+    """Retrieve one page of the stalls matching the given filters.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+        filters (StallFilter, optional): Filter and sort options.
+    Returns:
+        dict: Page of stalls and the cursor of the next page.
+    """
+    if filters is None:
+        filters = stall_schemas.StallFilter()
+
+    return paginate(
+        filter_stalls(db, filters), stall_sort_keys(filters), limit, cursor
+    )
 
 
 def get_all_hawker_centers(db: Session, skip: int = 0, limit: int = 100):
@@ -120,6 +265,63 @@ def get_all_hawker_centers(db: Session, skip: int = 0, limit: int = 100):
     return db_hawker_centers
 
 
+def get_nearby_hawker_centers(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    radius: float,
+    k: int,
+    time_of_day=None,
+):
+    """Retrieve the hawker centers nearest to a location, with their open stalls.
+
+    Args:
+        db (Session): Database session.
+        latitude (float): Latitude of the search location.
+        longitude (float): Longitude of the search location.
+        radius (float): Search radius in kilometres.
+        k (int): Maximum number of hawker centers to return.
+        time_of_day (time, optional): Time the stalls must be open at. Defaults to now.
+    Returns:
+        list: Hawker centers nearest first, each with its distance and open stalls.
+    """
+    nearest = get_hawker_center_index(db).nearby(latitude, longitude, radius, k)
+    if not nearest:
+        return []
+
+    center_ids = [center_id for center_id, _ in nearest]
+    hawker_centers = {
+        hawker_center.hawkerCenterID: hawker_center
+        for hawker_center in db.query(HawkerCenter).filter(
+            HawkerCenter.hawkerCenterID.in_(center_ids)
+        )
+    }
+
+    open_stalls = {center_id: [] for center_id in center_ids}
+    stalls = (
+        with_loading_profile(db.query(Stall), stall_schemas.Stall)
+        .filter(
+            Stall.hawkerCenterID.in_(center_ids),
+            open_at(time_of_day or datetime.now().time()),
+        )
+        .order_by(Stall.stallID)
+    )
+    for stall in stalls:
+        open_stalls[stall.hawkerCenterID].append(stall)
+
+    return [
+        {
+            **stall_schemas.HawkerCenter.model_validate(
+                hawker_centers[center_id], from_attributes=True
+            ).model_dump(),
+            "distance": round(distance, 3),
+            "openStalls": open_stalls[center_id],
+        }
+        for center_id, distance in nearest
+        if center_id in hawker_centers
+    ]
+
+
 def create_stall(db: Session, stall: stall_schemas.StallCreate):
     """Create a new stall.
 
@@ -135,21 +337,16 @@ def create_stall(db: Session, stall: stall_schemas.StallCreate):
     if not db_hawker:
         raise HTTPException(status_code=400, detail="Invalid hawkerID")
 
-    # Convert images from list to string before storing
-    # images_string = convert_list_to_str(stall.images)
-    images_string = "TEMPORARY"
-    cuisine_string = convert_list_to_str(stall.cuisineType)
-
     db_stall = Stall(
         stallName=stall.stallName,
         hawkerID=stall.hawkerID,
         hawkerCenterID=stall.hawkerCenterID,
-        images=images_string,
+        images=[],
         unitNumber=stall.unitNumber,
         startTime=stall.startTime,
         endTime=stall.endTime,
         hygieneRating=stall.hygieneRating,
-        cuisineType=cuisine_string,
+        cuisineType=convert_cuisine_types(stall.cuisineType),
         estimatedWaitTime=stall.estimatedWaitTime,
         priceRange=stall.priceRange,
     )
@@ -158,24 +355,18 @@ def create_stall(db: Session, stall: stall_schemas.StallCreate):
     db.commit()
     db.refresh(db_stall)
 
-    images_url = []
+    # Images are keyed by stallID, so they can only be uploaded once it exists
     if stall.images:
         storage = ObjectStorage()
-        for image in stall.images:
-            image_url = storage.upload_stall_image(db_stall.stallID, image)
-            images_url.append(image_url)
+        db_stall.images = storage.upload_stall_images(db_stall.stallID, stall.images)
 
-        db_stall.images = images_url
+        db.add(db_stall)
+        db.commit()
+        db.refresh(db_stall)
 
-    db_stall.images = convert_list_to_str(db_stall.images)
+    search_services.index_stall(db_stall)
+    cache_services.invalidate(cache_services.STALLS)
 
-    db.add(db_stall)
-    db.commit()
-    db.refresh(db_stall)
-
-    # Convert back to list for API response
-    db_stall.images = convert_str_to_list(db_stall.images)
-    db_stall.cuisineType = convert_str_to_list(db_stall.cuisineType)
     return db_stall
 
 
@@ -196,31 +387,17 @@ def update_stall(db: Session, updated_stall: stall_schemas.StallUpdate, stall_id
     # Update Stall
     updated_stall_data = updated_stall.model_dump(exclude_unset=True)
 
-    images_url = []
-
-    # Convert images from list to string if present
-    if "images" in updated_stall_data:
-        if (
-            updated_stall_data["images"] is None
-            or len(updated_stall_data["images"]) == 0
-        ):
-            # Handle empty list case
-            updated_stall_data["images"] = ""
-        elif isinstance(updated_stall_data["images"], list):
-            storage = ObjectStorage()
-            for image in updated_stall_data["images"]:
-                if image.startswith("http"):
-                    images_url.append(image)
-                    continue
-                image_url = storage.upload_stall_image(stall_id, image)
-                images_url.append(image_url)
-            updated_stall_data["images"] = convert_list_to_str(images_url)
-
-    # Convert cuisineType from list to string if present
-    if "cuisineType" in updated_stall_data and isinstance(
-        updated_stall_data["cuisineType"], list
-    ):
-        updated_stall_data["cuisineType"] = convert_list_to_str(
+    # Upload new images; URLs of previously uploaded images are kept as-is
+    if updated_stall_data.get("images"):
+        storage = ObjectStorage()
+        updated_stall_data["images"] = storage.upload_stall_images(
+            stall_id, updated_stall_data["images"]
+        )
+    elif "images" in updated_stall_data:
+        updated_stall_data["images"] = []
+
+    if "cuisineType" in updated_stall_data:
+        updated_stall_data["cuisineType"] = convert_cuisine_types(
             updated_stall_data["cuisineType"]
         )
 
@@ -231,9 +408,83 @@ def update_stall(db: Session, updated_stall: stall_schemas.StallUpdate, stall_id
     db.commit()
     db.refresh(db_stall)
 
-    # Convert back to list for API response
-    db_stall.images = convert_str_to_list(db_stall.images)
-    db_stall.cuisineType = convert_str_to_list(db_stall.cuisineType)
+    search_services.index_stall(db_stall)
+    cache_services.invalidate(cache_services.STALLS, cache_services.stall_tag(stall_id))
+
+    return db_stall
+
+
+def add_stall_images(db: Session, stall_id: int, images: list[UploadFile]):
+    """Add uploaded image files to a stall.
+
+    Args:
+        db (Session): Database session.
+        stall_id (int): ID of the stall.
+        images (list[UploadFile]): Uploaded images, streamed to object storage.
+    Returns:
+        Stall: The updated stall object, or None if not found.
+    """
+    db_stall = db.query(Stall).filter(Stall.stallID == stall_id).first()
+    if not db_stall:
+        return None
+
+    for image in images:
+        check_image_upload(image)
+    storage = ObjectStorage()
+    images_url = [
+        storage.upload_stall_image_stream(
+            stall_id, image.file, image.size or -1, image.content_type
+        )
+        for image in images
+    ]
+    db_stall.images = list(db_stall.images or []) + images_url
+
+    db.add(db_stall)
+    db.commit()
+    db.refresh(db_stall)
+    cache_services.invalidate(cache_services.STALLS, cache_services.stall_tag(stall_id))
+    return db_stall
+
+
+def presign_stall_image(db: Session, stall_id: int):
+    """Mint a presigned URL to upload a stall image to directly.
+
+    Args:
+        db (Session): Database session.
+        stall_id (int): ID of the stall.
+    Returns:
+        dict: The presigned upload, or None if the stall is not found.
+    """
+    if not db.query(Stall.stallID).filter(Stall.stallID == stall_id).first():
+        return None
+    return ObjectStorage().presign_stall_image(stall_id)
+
+
+def confirm_stall_image(db: Session, stall_id: int, key: str):
+    """Add an image uploaded with a presigned URL to a stall.
+
+    Confirming the same upload again does not add it twice.
+
+    Args:
+        db (Session): Database session.
+        stall_id (int): ID of the stall.
+        key (str): Key of the presigned upload.
+    Raises:
+        HTTPException: If the upload is not the stall's or not a valid image.
+    Returns:
+        Stall: The updated stall object, or None if not found.
+    """
+    db_stall = db.query(Stall).filter(Stall.stallID == stall_id).first()
+    if not db_stall:
+        return None
+
+    image_url = ObjectStorage().confirm_stall_image(stall_id, key)
+    if image_url not in (db_stall.images or []):
+        db_stall.images = list(db_stall.images or []) + [image_url]
+        db.add(db_stall)
+        db.commit()
+        db.refresh(db_stall)
+        cache_services.invalidate(cache_services.STALLS, cache_services.stall_tag(stall_id))
     return db_stall
 
 
@@ -256,4 +507,12 @@ def delete_stall(db: Session, stallID: int) -> bool:
     db.delete(db_stall)
     db.commit()
 
+    search_services.remove_from_index("stalls", stallID)
+    cache_services.invalidate(
+        cache_services.STALLS,
+        cache_services.stall_tag(stallID),
+        cache_services.stall_dishes_tag(stallID),
+        cache_services.stall_reviews_tag(stallID),
+    )
+
     return True
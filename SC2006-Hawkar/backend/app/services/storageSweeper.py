@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from factory.database import use_primary
+from models.dish import Dish
+from models.stall import Stall
+from models.user import User
+from services.imageVariants import VARIANTS, split_object_url, variant_key
+from services.objectStorage import SWEEP_MIN_AGE, ObjectStorage
+
+
+# Buckets whose objects are referenced by database rows, and can be swept
+SWEEP_BUCKETS = ("profile-photo", "stall", "dish")
+# Objects younger than SWEEP_MIN_AGE seconds are kept, as the row referencing
+# them may not be committed yet, e.g. during a background upload. Uploads stop
+# reusing an object before it reaches that age, see services.objectStorage.
+# Seconds between background sweeps, 0 to disable them
+SWEEP_INTERVAL = int(os.environ.get("STORAGE_SWEEP_INTERVAL", "0"))
+# Objects listed, and deleted, per request (the S3 limit for deletes)
+SWEEP_BATCH_SIZE = 1000
+
+# Report of the last sweep, for monitoring
+last_sweep_report = None
+
+
+def referenced_objects(db: Session) -> dict:
+    """Collect the objects referenced by stall images, dish photos and profile photos.
+
+    Variants of a referenced image count as referenced too.
+
+    Args:
+        db (Session): Database session.
+    Returns:
+        dict: {bucket: set of object names}
+    """
+    urls = []
+    for (images,) in db.query(Stall.images).execution_options(yield_per=SWEEP_BATCH_SIZE):
+        urls.extend(images or [])
+    for column in (Dish.photo, User.profilePhoto):
+        query = db.query(column).filter(column.isnot(None))
+        urls.extend(url for (url,) in query.execution_options(yield_per=SWEEP_BATCH_SIZE))
+
+    referenced = {bucket: set() for bucket in SWEEP_BUCKETS}
+    for url in urls:
+        location = split_object_url(url)
+        if location is None or location[0] not in referenced:
+            continue
+        bucket, obj_name = location
+        referenced[bucket].add(obj_name)
+        referenced[bucket].update(variant_key(obj_name, variant) for variant in VARIANTS)
+    return referenced
+
+
+def sweep_orphaned_objects(
+    db: Session,
+    dry_run: bool = False,
+    min_age: int = SWEEP_MIN_AGE,
+    storage: ObjectStorage = None,
+) -> dict:
+    """Delete objects that no database row references anymore.
+
+    Objects are listed a page at a time and compared with the referenced
+    objects. References are collected again right before deleting, so
+    objects that became referenced during the listing are kept.
+
+    Args:
+        db (Session): Database session.
+        dry_run (bool, optional): Only count the orphaned objects.
+        min_age (int, optional): Seconds an object must have existed to be deleted.
+        storage (ObjectStorage, optional): Storage to sweep, ObjectStorage() by default.
+    Returns:
+        dict: Per-bucket number of objects scanned, orphaned and deleted,
+            bytes freed, errors, and the duration of the sweep.
+    """
+    global last_sweep_report
+
+    storage = storage or ObjectStorage()
+    started = time.perf_counter()
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=min_age)
+
+    referenced = referenced_objects(db)
+    orphans = {}
+    report = {"dryRun": dry_run, "buckets": {}}
+    for bucket in SWEEP_BUCKETS:
+        stats = {"scanned": 0, "orphaned": 0, "deleted": 0, "bytesFreed": 0, "errors": 0}
+        orphans[bucket] = {}
+        for page in storage.list_object_pages(bucket, SWEEP_BATCH_SIZE):
+            stats["scanned"] += len(page)
+            for obj in page:
+                if obj.object_name in referenced[bucket]:
+                    continue
+                if obj.last_modified is not None and obj.last_modified > cutoff:
+                    continue
+                orphans[bucket][obj.object_name] = obj.size or 0
+        report["buckets"][bucket] = stats
+
+    if not dry_run:
+        referenced = referenced_objects(db)
+    for bucket, bucket_orphans in orphans.items():
+        stats = report["buckets"][bucket]
+        names = [name for name in bucket_orphans if name not in referenced[bucket]]
+        stats["orphaned"] = len(names)
+        if dry_run:
+            stats["bytesFreed"] = sum(bucket_orphans[name] for name in names)
+            continue
+
+        for start in range(0, len(names), SWEEP_BATCH_SIZE):
+            batch = names[start : start + SWEEP_BATCH_SIZE]
+            failed = {error.name for error in storage.remove_objects(bucket, batch)}
+            deleted = [name for name in batch if name not in failed]
+            stats["deleted"] += len(deleted)
+            stats["bytesFreed"] += sum(bucket_orphans[name] for name in deleted)
+            stats["errors"] += len(failed)
+
+    report["durationSeconds"] = round(time.perf_counter() - started, 3)
+    last_sweep_report = report
+    print(
+        f"Storage sweep{' (dry run)' if dry_run else ''} in {report['durationSeconds']}s: "
+        + ", ".join(
+            f"{bucket} {stats['orphaned']}/{stats['scanned']} orphaned, "
+            f"{stats['deleted']} deleted, {stats['errors']} errors"
+            for bucket, stats in report["buckets"].items()
+        )
+    )
+    return report
+
+
+def start_storage_sweeper(session_factory, interval: int = SWEEP_INTERVAL):
+    """Sweep orphaned objects every interval seconds in a daemon thread.
+
+    Args:
+        session_factory: Callable returning a new database session, e.g. SessionLocal.
+        interval (int, optional): Seconds between sweeps; no thread is started if 0.
+    Returns:
+        threading.Thread: The sweeper thread, or None if disabled.
+    """
+    if interval <= 0:
+        return None
+
+    def run():
+        # Read the references on the primary, as a replica may not have the
+        # rows just committed. The thread has its own context.
+        use_primary.set(True)
+        while True:
+            time.sleep(interval)
+            try:
+                with session_factory() as db:
+                    sweep_orphaned_objects(db)
+            except Exception as e:
+                # Retried at the next interval, e.g. if MinIO is down
+                print(f"Error sweeping object storage: {str(e)}")
+
+    thread = threading.Thread(target=run, name="storage-sweeper", daemon=True)
+    thread.start()
+    return thread
@@ -2,7 +2,12 @@ from sqlalchemy.orm import Session
 
 import schemas.user as user_schemas
 from models.user import User
-from services.objectStorage import ObjectStorage
+from fastapi import UploadFile
+from services.objectStorage import ObjectStorage, check_image_upload
+from services.pagination import paginate
+import services.search as search_services
+import services.responseCache as cache_services
+import services.etag as etag_services
 from models.admin import Admin
 from models.consumer import Consumer
 from models.hawker import Hawker
@@ -50,6 +55,20 @@ def get_all_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(User).offset(skip).limit(limit).all()
 
 
+def get_users_page(db: Session, limit: int = 100, cursor: str = None):
+    """Retrieve one page of users in ID order.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned with the previous page.
+    Returns:
+        dict: Page of users and the cursor of the next page.
+    """
+    query = db.query(User)
+    return paginate(query, [(User.userID, False)], limit, cursor)
+
+
 def create_user(db: Session, user: user_schemas.UserCreate):
     """Create a new user with hashed password and optional profile photo.
 
@@ -101,10 +120,84 @@ def update_user(db: Session, updated_user: user_schemas.UserUpdate):
     updated_user_data = updated_user.model_dump(exclude_unset=True)
     for key, value in updated_user_data.items():
         setattr(db_user, key, value)
+    etag_services.touch_user(db, db_user.userID)
+
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+
+    search_services.index_user(db, db_user)
+    cache_services.invalidate_all()
+
+    return db_user
+
+
+def update_profile_photo(db: Session, userID: int, photo: UploadFile):
+    """Replace a user's profile photo with an uploaded file.
+
+    Args:
+        db (Session): Database session.
+        userID (int): ID of the user.
+        photo (UploadFile): Uploaded image, streamed to object storage.
+    Returns:
+        User: The updated user object, or None if not found.
+    """
+    db_user = db.query(User).filter(User.userID == userID).first()
+    if not db_user:
+        return None
+
+    check_image_upload(photo)
+    storage = ObjectStorage()
+    db_user.profilePhoto = storage.upload_profile_photo_stream(
+        db_user.emailAddress, photo.file, photo.size or -1, photo.content_type
+    )
+    etag_services.touch_user(db, userID)
+
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    cache_services.invalidate_all()
+    return db_user
+
+
+def presign_profile_photo(db: Session, userID: int):
+    """Mint a presigned URL to upload a user's profile photo to directly.
+
+    Args:
+        db (Session): Database session.
+        userID (int): ID of the user.
+    Returns:
+        dict: The presigned upload, or None if the user is not found.
+    """
+    db_user = db.query(User).filter(User.userID == userID).first()
+    if not db_user:
+        return None
+    return ObjectStorage().presign_profile_photo(db_user.emailAddress)
+
+
+def confirm_profile_photo(db: Session, userID: int, key: str):
+    """Replace a user's profile photo with an image uploaded with a presigned URL.
+
+    Args:
+        db (Session): Database session.
+        userID (int): ID of the user.
+        key (str): Key of the presigned upload.
+    Raises:
+        HTTPException: If the upload is not the user's or not a valid image.
+    Returns:
+        User: The updated user object, or None if not found.
+    """
+    db_user = db.query(User).filter(User.userID == userID).first()
+    if not db_user:
+        return None
+
+    db_user.profilePhoto = ObjectStorage().confirm_profile_photo(db_user.emailAddress, key)
+    etag_services.touch_user(db, userID)
 
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    cache_services.invalidate_all()
     return db_user
 
 
@@ -1,9 +1,121 @@
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
+from minio.error import S3Error
+from sqlalchemy import event
 
 from app.main import app
+from database import async_engine, engine
+import services.objectStorage as objectStorage_services
+from services.imageVariants import is_variant_key
+
+
+class QueryCounter:
+    """Context manager recording every SQL statement sent to the sync or async engine."""
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+class FakeMinio:
+    """MinIO object calls over a dict, failing to put the given contents."""
+
+    def __init__(self):
+        self.objects = {}
+        self.last_modified = {}
+        self.failing = set()
+        self.puts = []
+        self.stats = []
+
+    @property
+    def original_puts(self):
+        """(bucket, object name) of each original put, leaving out variants."""
+        return [key for key in self.puts if not is_variant_key(key[1])]
+
+    def _missing(self, bucket, obj_name):
+        return S3Error(None, "NoSuchKey", "Not found", obj_name, None, None, bucket, obj_name)
+
+    def stat_object(self, bucket, obj_name):
+        self.stats.append((bucket, obj_name))
+        if (bucket, obj_name) not in self.objects:
+            raise self._missing(bucket, obj_name)
+        return SimpleNamespace(
+            size=len(self.objects[(bucket, obj_name)]),
+            last_modified=self.last_modified[(bucket, obj_name)],
+        )
+
+    def put_object(self, bucket, obj_name, data, length, content_type, part_size=0):
+        content = data.read()
+        if content in self.failing:
+            raise ConnectionError("MinIO is down")
+        self.puts.append((bucket, obj_name))
+        self.objects[(bucket, obj_name)] = content
+        self.last_modified[(bucket, obj_name)] = objectStorage_services.datetime.now(timezone.utc)
+
+    def get_object(self, bucket, obj_name, offset=0, length=0):
+        if (bucket, obj_name) not in self.objects:
+            raise self._missing(bucket, obj_name)
+        content = self.objects[(bucket, obj_name)][offset:]
+        response = io.BytesIO(content[:length] if length else content)
+        response.release_conn = lambda: None
+        return response
+
+    def list_objects(self, bucket, recursive=False):
+        for (obj_bucket, obj_name), content in list(self.objects.items()):
+            if obj_bucket == bucket:
+                yield SimpleNamespace(
+                    object_name=obj_name,
+                    size=len(content),
+                    last_modified=self.last_modified[(bucket, obj_name)],
+                )
+
+    def remove_object(self, bucket, obj_name):
+        self.objects.pop((bucket, obj_name), None)
+
+
+@pytest.fixture
+def fake_minio(monkeypatch):
+    """In-memory MinIO client used by ObjectStorage for the test."""
+    client = FakeMinio()
+    storage = objectStorage_services.ObjectStorage()
+    monkeypatch.setattr(storage, "client", client)
+    monkeypatch.setattr(storage, "ready", True)
+    monkeypatch.setattr(storage, "known_objects", OrderedDict())
+    # Uploads left running by a failed request must not reach the next test
+    executors = [ThreadPoolExecutor(max_workers=4) for _ in range(2)]
+    monkeypatch.setattr(storage, "upload_executor", executors[0])
+    monkeypatch.setattr(storage, "background_executor", executors[1])
+    yield client
+    for executor in executors:
+        executor.shutdown(wait=True)
 
 
 @pytest.fixture
 def client():
     return TestClient(app)
+
+
+@pytest.fixture
+def query_counter():
+    return QueryCounter
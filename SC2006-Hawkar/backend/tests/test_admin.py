@@ -1,3 +1,16 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from database import SessionLocal
+from models.hawkerCenter import HawkerCenter
+from schemas.review import ReviewCreate
+import services.responseCache as cache_services
+import services.review as review_services
+from services.storageSweeper import referenced_objects, sweep_orphaned_objects
+
+
 def test_get_all_admins(client):
     response = client.get("/admins/")
     assert response.status_code == 200
@@ -35,3 +48,165 @@ def test_update_admin(client):
     )
     assert response.status_code == 200
     assert response.json()["user"]["name"] == "Test"
+
+
+def test_ignore_reported_review(client):
+    with SessionLocal() as db:
+        review = review_services.create_review(
+            db, ReviewCreate(reviewText="Reported", rating=1, consumerID=13, stallID=7)
+        )
+        review_id = review.reviewID
+
+    response = client.post(
+        f"/review/{review_id}/report",
+        json={"reviewID": review_id, "reportType": "spam", "reportText": "Advertising"},
+    )
+    assert response.status_code == 200
+
+    url = "/stall/7/reviews"
+    client.get(url)
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+    response = client.put(f"/admin/reports/{review_id}/ignore")
+    assert response.status_code == 200
+    response = client.get(url)
+    assert response.headers["X-Cache"] == "MISS"
+    reviews = {item["reviewID"]: item for item in response.json()}
+    assert reviews[review_id]["isReported"] is False
+
+    response = client.put("/admin/reports/100000/ignore")
+    assert response.status_code == 404
+
+    client.delete(f"/review/delete/{review_id}")
+
+
+def test_import_hawker_centers(client):
+    response = client.post("/admin/hawker-centers/import")
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] + report["updated"] + report["skipped"] == 125
+
+    response = client.post("/admin/hawker-centers/import")
+    assert response.json() == {"inserted": 0, "updated": 0, "skipped": 125}
+
+    centers = client.get("/hawker-centers", params={"limit": 1000}).json()
+    assert "Market Street Hawker Centre" in [center["name"] for center in centers]
+
+
+def test_import_hawker_centers_upload(client):
+    # Unique per run, as the database persists between runs
+    run = uuid.uuid4().hex[:8].upper()
+    name = f"Upload Test Centre {run}"
+
+    def feature(name, inc_crc, lng, lat):
+        return {
+            "type": "Feature",
+            "properties": {
+                "Description": {
+                    "NAME": name,
+                    "ADDRESS_MYENV": f"1 {name} Road, Singapore 000001",
+                    "INC_CRC": f"{inc_crc}{run}",
+                },
+                "geometry": {"type": "Point", "coordinates": [lng, lat, 0.0]},
+            },
+        }
+
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            feature(name, "UPLOADTEST0001", 103.8, 1.35),
+            feature(name, "UPLOADTEST0002", 103.9, 1.36),
+            {"type": "Feature", "properties": {}},
+        ],
+    }
+    files = {"file": ("centres.geojson", json.dumps(geojson), "application/geo+json")}
+    response = client.post("/admin/hawker-centers/import", files=files)
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 1, "updated": 0, "skipped": 2}
+
+    try:
+        # Only the first update of a hawker center is kept
+        geojson["features"] = [
+            feature(name, "UPLOADTEST0003", 103.9, 1.36),
+            feature(name, "UPLOADTEST0004", 103.7, 1.3),
+        ]
+        files = {"file": ("centres.geojson", json.dumps(geojson), "application/geo+json")}
+        response = client.post("/admin/hawker-centers/import", files=files)
+        assert response.json() == {"inserted": 0, "updated": 1, "skipped": 1}
+
+        params = {"lat": 1.36, "lng": 103.9, "radius": 0.1}
+        nearby = client.get("/hawker-centers/nearby", params=params).json()
+        assert name in [center["name"] for center in nearby]
+
+        files = {"file": ("centres.geojson", "not json", "application/geo+json")}
+        response = client.post("/admin/hawker-centers/import", files=files)
+        assert response.status_code == 400
+    finally:
+        # Delete through the session, whose events invalidate the nearby index
+        with SessionLocal() as db:
+            for center in db.query(HawkerCenter).filter(HawkerCenter.name == name):
+                db.delete(center)
+            db.commit()
+        cache_services.invalidate_all()
+
+
+class InMemoryStorage:
+    """Bucket listing and deletion of ObjectStorage over a dict."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+
+    def list_object_pages(self, bucket, page_size):
+        objects = list(self.buckets.get(bucket, {}).values())
+        for start in range(0, len(objects), page_size):
+            yield objects[start : start + page_size]
+
+    def remove_objects(self, bucket, obj_names):
+        for obj_name in obj_names:
+            del self.buckets[bucket][obj_name]
+        return []
+
+
+def test_sweep_orphaned_objects(client):
+    with SessionLocal() as db:
+        referenced = referenced_objects(db)
+    stall_image = client.get("/stall/7").json()["images"][0].rsplit("/", 1)[1]
+    assert stall_image in referenced["stall"]
+    assert f"{stall_image}_thumbnail.webp" in referenced["stall"]
+
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    new = datetime.now(timezone.utc)
+
+    def stored(name, last_modified=old):
+        return SimpleNamespace(object_name=name, size=100, last_modified=last_modified)
+
+    stall_objects = [
+        stall_image,
+        f"{stall_image}_medium.webp",
+        "orphan",
+        "orphan_thumbnail.webp",
+    ]
+    storage = InMemoryStorage(
+        {
+            "stall": {name: stored(name) for name in stall_objects},
+            "dish": {"just-uploaded": stored("just-uploaded", new)},
+        }
+    )
+
+    with SessionLocal() as db:
+        report = sweep_orphaned_objects(db, dry_run=True, storage=storage)
+    assert report["buckets"]["stall"] == {
+        "scanned": 4,
+        "orphaned": 2,
+        "deleted": 0,
+        "bytesFreed": 200,
+        "errors": 0,
+    }
+    assert report["buckets"]["dish"]["orphaned"] == 0
+    assert len(storage.buckets["stall"]) == 4
+
+    with SessionLocal() as db:
+        report = sweep_orphaned_objects(db, storage=storage)
+    assert report["buckets"]["stall"]["deleted"] == 2
+    assert sorted(storage.buckets["stall"]) == sorted(stall_objects[:2])
+    assert list(storage.buckets["dish"]) == ["just-uploaded"]
@@ -0,0 +1,76 @@
+from factory.cache import CacheFactory, MemoryCache
+import services.responseCache as cache_services
+
+
+def test_memory_cache():
+    cache = MemoryCache(maxEntries=2)
+    cache.set("a", b"1", ttl=60)
+    cache.set("b", b"2", ttl=60)
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3", ttl=60)  # evicts b, the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" and cache.get("c") == b"3"
+
+    cache.set("expired", b"4", ttl=0)
+    assert cache.get("expired") is None
+
+    assert cache.getVersions(["stalls", "stall:7"]) == [0, 0]
+    cache.invalidate(["stall:7"])
+    assert cache.getVersions(["stalls", "stall:7"]) == [0, 1]
+
+    assert CacheFactory.getCache("none") is None
+
+
+def test_cached_stall(client):
+    client.get("/stall/7")
+    response = client.get("/stall/7")
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "HIT"
+    stall = response.json()
+
+    wait_time = stall["estimatedWaitTime"]
+    response = client.put("/stall/update/7", json={"stallID": 7, "estimatedWaitTime": wait_time + 1})
+    assert response.status_code == 200
+    response = client.get("/stall/7")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["estimatedWaitTime"] == wait_time + 1
+
+    client.put("/stall/update/7", json={"stallID": 7, "estimatedWaitTime": wait_time})
+    assert client.get("/stall/7").json()["estimatedWaitTime"] == wait_time
+
+
+def test_cached_dishes_invalidated(client):
+    dishes = client.get("/stall/7/dishes").json()
+    assert client.get("/stall/7/dishes").headers["X-Cache"] == "HIT"
+    # Other stalls' dishes are cached separately
+    assert client.get("/stall/8/dishes").json() != dishes
+
+    response = client.post(
+        "/stall/7/add-dish", json={"stallID": 7, "dishName": "Cached Laksa", "price": 5.0}
+    )
+    assert response.status_code == 200
+    response = client.get("/stall/7/dishes")
+    assert response.headers["X-Cache"] == "MISS"
+    dish = next(dish for dish in response.json() if dish["dishName"] == "Cached Laksa")
+
+    client.delete(f"/dish/delete/{dish['dishID']}")
+    assert client.get("/stall/7/dishes").json() == dishes
+
+
+def test_cached_stalls_query_params(client):
+    client.get("/stalls?sortBy=averageRating&order=desc")
+    response = client.get("/stalls?order=desc&sortBy=averageRating")
+    assert response.headers["X-Cache"] == "HIT"
+    assert client.get("/stalls?sortBy=averageRating&order=asc").headers["X-Cache"] == "MISS"
+
+
+def test_cache_stats(client):
+    client.get("/hawker-centers")
+    client.get("/hawker-centers")
+
+    response = client.get("/admin/cache")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["backend"] == cache_services.CACHE_BACKEND
+    assert stats["routes"]["/hawker-centers"]["hits"] >= 1
+    assert stats["routes"]["/hawker-centers"]["misses"] >= 1
@@ -0,0 +1,116 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import column, insert, table, text
+
+from factory.database import DatabaseConfig, DatabaseFactory, SQLiteDatabase, use_primary
+
+
+def test_config_from_env():
+    config = DatabaseConfig.fromEnv(
+        {
+            "DATABASE_TYPE": "postgresql",
+            "DB_POOL_SIZE": "20",
+            "DB_POOL_PRE_PING": "false",
+            "SQLITE_SYNCHRONOUS": "full",
+            "PG_STATEMENT_TIMEOUT": "",
+        }
+    )
+    assert config.type == "postgresql"
+    assert config.poolSize == 20
+    assert config.poolPrePing is False
+    assert config.sqliteSynchronous == "FULL"
+    assert config.postgresStatementTimeout == 30000
+    assert DatabaseConfig.fromEnv({}) == DatabaseConfig()
+
+
+def test_config_invalid_pragma():
+    with pytest.raises(ValueError):
+        DatabaseConfig.fromEnv({"SQLITE_JOURNAL_MODE": "wal; DROP TABLE users"})
+
+
+def test_sqlite_pragmas(tmp_path):
+    database = DatabaseFactory.getDatabase(
+        DatabaseConfig(url=f"sqlite:///{tmp_path / 'test.db'}", poolSize=2, sqliteBusyTimeout=1234)
+    )
+    assert isinstance(database, SQLiteDatabase)
+    database.connect()
+
+    with database.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -64000
+    assert database.engine.pool.size() == 2
+    database.engine.dispose()
+
+
+def test_sqlite_pragmas_async(tmp_path):
+    import asyncio
+
+    database = SQLiteDatabase(DatabaseConfig(url=f"sqlite:///{tmp_path / 'test.db'}"))
+    database.connectAsync()
+
+    async def journal_mode():
+        async with database.asyncEngine.connect() as connection:
+            mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+        await database.asyncEngine.dispose()
+        return mode
+
+    assert asyncio.run(journal_mode()) == "wal"
+
+
+def test_replica_routing(tmp_path):
+    database = SQLiteDatabase(
+        DatabaseConfig(
+            url=f"sqlite:///{tmp_path / 'primary.db'}",
+            replicaUrls=(f"sqlite:///{tmp_path / 'replica.db'}",),
+        )
+    )
+    database.connect()
+    for engine, name in ((database.engine, "primary"), (database.replicaEngines[0], "replica")):
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE items (name TEXT)"))
+            connection.execute(text("INSERT INTO items VALUES (:name)"), {"name": name})
+
+    def read(db):
+        return db.execute(text("SELECT name FROM items")).scalars().all()
+
+    with database.SessionLocal() as db:
+        assert read(db) == ["replica"]
+
+    token = use_primary.set(True)
+    try:
+        with database.SessionLocal() as db:
+            assert read(db) == ["primary"]
+    finally:
+        use_primary.reset(token)
+
+    # After writing, the session keeps reading its own rows from the primary
+    with database.SessionLocal() as db:
+        db.execute(insert(table("items", column("name"))).values(name="written"))
+        db.commit()
+        assert read(db) == ["primary", "written"]
+
+    database.engine.dispose()
+    database.replicaEngines[0].dispose()
+
+
+def test_route_reads_middleware(monkeypatch):
+    import database
+
+    app = FastAPI()
+    app.middleware("http")(database.route_reads)
+
+    @app.api_route("/primary", methods=["GET", "POST"])
+    def primary():
+        return use_primary.get()
+
+    monkeypatch.setattr(database, "replica_engines", ["replica"])
+    client = TestClient(app)
+    assert client.get("/primary").json() is False
+
+    response = client.post("/primary")
+    assert response.json() is True
+    assert database.PRIMARY_UNTIL_COOKIE in response.cookies
+    assert client.get("/primary").json() is True  # read your writes
@@ -1,3 +1,6 @@
+from datetime import datetime, timedelta
+
+
 def test_get_all_dishes(client):
     response = client.get("/dishes/")
     assert response.status_code == 200
@@ -56,3 +59,94 @@ def test_delete_dish(client):
     assert response.json() == {
         "detail": "Dish deleted successfully"
     } or response.json() == {"detail": "Invalid dishID"}
+
+
+def test_get_stall_dishes_with_promotion(client):
+    end_date = (datetime.now() + timedelta(days=30)).replace(microsecond=0)
+    response = client.put(
+        "/dish/update/8",
+        json={
+            "dishID": 8,
+            "onPromotion": True,
+            "startDate": "2021-08-01T00:00:00",
+            "endDate": end_date.isoformat(),
+            "discountedPrice": 6.5,
+        },
+    )
+    assert response.status_code == 200
+
+    response = client.get("/stall/7/dishes")
+    assert response.status_code == 200
+    dishes = {dish["dishID"]: dish for dish in response.json()}
+    assert dishes[8]["onPromotion"] is True
+    assert dishes[8]["discountedPrice"] == 6.5
+    assert dishes[8]["endDate"] == end_date.isoformat()
+
+    client.put("/dish/update/8", json={"dishID": 8, "onPromotion": False})
+
+
+def test_get_stall_dishes_expired_promotion(client):
+    response = client.put(
+        "/dish/update/8",
+        json={
+            "dishID": 8,
+            "onPromotion": True,
+            "startDate": "2021-08-01T00:00:00",
+            "endDate": "2021-08-31T00:00:00",
+            "discountedPrice": 6.5,
+        },
+    )
+    assert response.status_code == 200
+
+    dishes = {dish["dishID"]: dish for dish in client.get("/stall/7/dishes").json()}
+    assert dishes[8]["promotionID"] is None
+    assert dishes[8]["discountedPrice"] is None
+    # onPromotion follows the promotion's dates
+    assert dishes[8]["onPromotion"] is False
+
+    client.put("/dish/update/8", json={"dishID": 8, "onPromotion": False})
+
+
+def test_update_dish_photo_not_image(client):
+    response = client.put(
+        "/dish/8/photo", files={"photo": ("menu.pdf", b"%PDF", "application/pdf")}
+    )
+    assert response.status_code == 415
+
+
+def test_presign_dish_photo(client):
+    response = client.post("/dish/8/photo/presign")
+    assert response.status_code == 200
+    key = response.json()["key"]
+    assert key.startswith("stall_7_dish_")
+
+    response = client.put("/dish/8/photo/confirm", json={"key": "stall_8_dish_abc"})
+    assert response.status_code == 400
+    assert client.post("/dish/100/photo/presign").status_code == 404
+
+
+def test_dish_etag(client):
+    response = client.get("/dish/8")
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    assert client.get("/dish/8", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/dish/8", headers={"If-Modified-Since": last_modified}).status_code == 304
+    # A stale If-None-Match wins over If-Modified-Since
+    response = client.get(
+        "/dish/8", headers={"If-None-Match": 'W/"stale"', "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 200
+
+    dish = response.json()
+    client.put("/dish/update", json={"dishID": 8, "price": dish["price"] + 1})
+    response = client.get("/dish/8", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["price"] == dish["price"] + 1
+    client.put("/dish/update", json={"dishID": 8, "price": dish["price"]})
+
+
+def test_dish_etag_not_found(client):
+    response = client.get("/dish/100", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
@@ -1,3 +1,11 @@
+import math
+from datetime import datetime, timedelta
+
+from database import SessionLocal
+from services.promotion import DEALS_CELL_SIZE
+from services.promotionScheduler import PromotionSchedule, refresh_promotions
+
+
 def test_get_all_promotions(client):
     response = client.get("/promotions/")
     assert response.status_code == 200
@@ -57,3 +65,100 @@ def test_delete_promotion(client):
     response = client.delete("/dish-controller/delete-promotion/6")
     assert response.status_code == 200
     assert response.json() == {"detail": "Promotion deleted successfully"}
+
+
+def test_promotion_schedule():
+    schedule = PromotionSchedule()
+    now = datetime(2026, 1, 1, 12)
+    schedule.push(now + timedelta(hours=2), 2, now)
+    schedule.push(now + timedelta(hours=1), 1, now)
+    schedule.push(now - timedelta(hours=1), 3, now)  # already passed
+    assert len(schedule) == 2
+    assert schedule.next_at() == now + timedelta(hours=1)
+
+    assert schedule.pop_due(now) == []
+    assert schedule.pop_due(now + timedelta(hours=1)) == [1]
+    assert schedule.next_at() == now + timedelta(hours=2)
+
+
+def test_promotion_starts_and_ends(client):
+    now = datetime.now().replace(microsecond=0)
+    response = client.post(
+        "/dish-controller/add-promotion",
+        json={
+            "dishID": 9,
+            "startDate": (now + timedelta(hours=1)).isoformat(),
+            "endDate": (now + timedelta(hours=2)).isoformat(),
+            "discountedPrice": 9.9,
+        },
+    )
+    assert response.status_code == 200
+    promotion = response.json()
+    assert promotion["isActive"] is False
+    assert client.get("/dish/9").json()["onPromotion"] is False
+    hawker_center_id = client.get("/stall/8").json()["hawkerCenterID"]
+
+    with SessionLocal() as db:
+        assert refresh_promotions(db, now + timedelta(hours=1))["dishes"] >= 1
+    assert client.get("/dish/9").json()["onPromotion"] is True
+    response = client.get(f"/promotions/hawkercenterid/{hawker_center_id}")
+    assert promotion["promotionID"] in [item["promotionID"] for item in response.json()]
+
+    with SessionLocal() as db:
+        refresh_promotions(db, now + timedelta(hours=2))
+    assert client.get("/dish/9").json()["onPromotion"] is False
+    response = client.get(f"/promotions/hawkercenterid/{hawker_center_id}")
+    assert promotion["promotionID"] not in [item["promotionID"] for item in response.json()]
+
+    client.delete(f"/dish-controller/delete-promotion/{promotion['promotionID']}")
+
+
+def test_active_deals_near_location(client):
+    now = datetime.now().replace(microsecond=0)
+    dish = client.get("/dish/8").json()
+    response = client.post(
+        "/dish-controller/add-promotion",
+        json={
+            "dishID": 8,
+            "startDate": (now - timedelta(hours=1)).isoformat(),
+            "endDate": (now + timedelta(hours=1)).isoformat(),
+            "discountedPrice": dish["price"] / 2,
+        },
+    )
+    assert response.status_code == 200
+    promotion = response.json()
+    hawker_center = client.get("/stall/7/hawker-center").json()
+    location = {"lat": hawker_center["latitude"], "lng": hawker_center["longitude"]}
+
+    response = client.get("/promotions/active", params={**location, "radius": 1})
+    assert response.status_code == 200
+    deal = next(
+        deal for deal in response.json() if deal["promotionID"] == promotion["promotionID"]
+    )
+    assert deal["discountPercent"] == 50.0
+    assert deal["stallID"] == 7 and deal["hawkerCenterID"] == hawker_center["hawkerCenterID"]
+    assert deal["distance"] == 0.0
+    discounts = [deal["discountPercent"] for deal in response.json()]
+    assert discounts == sorted(discounts, reverse=True)
+
+    response = client.get("/promotions/active", params={"lat": 0.0, "lng": 0.0, "radius": 1})
+    assert response.json() == []
+
+    client.delete(f"/dish-controller/delete-promotion/{promotion['promotionID']}")
+    response = client.get("/promotions/active", params={**location, "radius": 1})
+    assert promotion["promotionID"] not in [deal["promotionID"] for deal in response.json()]
+
+
+def test_active_deals_cached_per_cell(client):
+    hawker_center = client.get("/stall/7/hawker-center").json()
+    # Centre of the hawker center's cell, and another point of the same cell
+    lat = (math.floor(hawker_center["latitude"] / DEALS_CELL_SIZE) + 0.5) * DEALS_CELL_SIZE
+    lng = (math.floor(hawker_center["longitude"] / DEALS_CELL_SIZE) + 0.5) * DEALS_CELL_SIZE
+    nearby = {"lat": lat + DEALS_CELL_SIZE / 4, "lng": lng - DEALS_CELL_SIZE / 4, "radius": 3}
+
+    client.get("/promotions/active", params={"lat": lat, "lng": lng, "radius": 3})
+    hits = client.get("/admin/cache").json()["routes"]["/promotions/active"]["hits"]
+    response = client.get("/promotions/active", params=nearby)
+    assert response.status_code == 200
+    routes = client.get("/admin/cache").json()["routes"]
+    assert routes["/promotions/active"]["hits"] == hits + 1
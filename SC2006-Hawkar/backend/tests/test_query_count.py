@@ -0,0 +1,44 @@
+import pytest
+
+import services.responseCache as cache_services
+
+
+# Statement reading the version of an endpoint's rows for its ETag
+ETAG_QUERY = 1
+
+# Maximum number of SQL statements each endpoint may issue, regardless of how
+# many rows it returns.
+QUERY_BUDGETS = {
+    "/stalls": 1 + ETAG_QUERY,
+    "/stalls/page": 1 + ETAG_QUERY,
+    "/stalls?userID=13": 1 + ETAG_QUERY,
+    "/stall/7": 1 + ETAG_QUERY,
+    "/stall/7/reviews": 1 + ETAG_QUERY,
+    "/stall/7/dishes": 1 + ETAG_QUERY,
+    "/reviews": 1,
+    "/reviews/page": 1,
+    "/hawkers": 1,
+    "/consumers": 1,
+}
+
+
+@pytest.fixture
+def seeded_review(client):
+    response = client.post(
+        "/stall/7/add-review",
+        json={"reviewText": "Query count review", "rating": 4, "consumerID": 13, "stallID": 7},
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", QUERY_BUDGETS)
+def test_endpoint_query_budget(client, query_counter, seeded_review, path):
+    client.get(path)  # warm up the connection pool
+    cache_services.invalidate_all()  # measure the database, not the response cache
+
+    with query_counter() as counter:
+        response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.json() not in ([], {"items": [], "nextCursor": None})
+    assert counter.count <= QUERY_BUDGETS[path], counter.statements
@@ -1,3 +1,10 @@
+import pytest
+
+from database import SessionLocal
+from schemas.review import ReviewCreate
+import services.review as review_services
+
+
 def test_get_all_reviews(client):
     response = client.get("/reviews")
     print(response.json())
@@ -62,3 +69,60 @@ def test_update_review(client):
     )
     assert response.status_code == 200
     assert response.json()["reviewText"] == "This is a test edited review"
+
+
+def test_stall_rating_aggregates(client):
+    stall = client.get("/stall/8").json()
+    count, total = stall["ratingCount"], stall["averageRating"] * stall["ratingCount"]
+    histogram = stall["ratingHistogram"]
+
+    with SessionLocal() as db:
+        review = review_services.create_review(
+            db, ReviewCreate(reviewText="Great", rating=5, consumerID=13, stallID=8)
+        )
+        review_id = review.reviewID
+
+    stall = client.get("/stall/8").json()
+    assert stall["ratingCount"] == count + 1
+    assert stall["averageRating"] == pytest.approx((total + 5) / (count + 1))
+    assert stall["ratingHistogram"][4] == histogram[4] + 1
+    assert stall["lastReviewedAt"] is not None
+
+    response = client.put(
+        f"/review/update/{review_id}", json={"reviewID": review_id, "rating": 2}
+    )
+    assert response.status_code == 200
+    stall = client.get("/stall/8").json()
+    assert stall["ratingCount"] == count + 1
+    assert stall["averageRating"] == pytest.approx((total + 2) / (count + 1))
+    assert stall["ratingHistogram"][1] == histogram[1] + 1
+    assert stall["ratingHistogram"][4] == histogram[4]
+
+    response = client.delete(f"/review/delete/{review_id}")
+    assert response.status_code == 200
+    stall = client.get("/stall/8").json()
+    assert stall["ratingCount"] == count
+    assert stall["ratingHistogram"] == histogram
+
+
+def test_sort_stalls_by_rating(client):
+    with SessionLocal() as db:
+        review_id = review_services.create_review(
+            db, ReviewCreate(reviewText="Superb", rating=5, consumerID=13, stallID=7)
+        ).reviewID
+
+    response = client.get("/stalls", params={"sortBy": "averageRating", "order": "desc"})
+    assert response.status_code == 200
+    ratings = [stall["averageRating"] for stall in response.json()]
+    assert ratings == sorted(ratings, reverse=True)
+
+    response = client.get("/stalls/page", params={"sortBy": "averageRating", "limit": 1})
+    assert response.status_code == 200
+    assert response.json()["nextCursor"] is not None
+    response = client.get(
+        "/stalls/page",
+        params={"sortBy": "averageRating", "limit": 1, "cursor": response.json()["nextCursor"]},
+    )
+    assert response.status_code == 200
+
+    client.delete(f"/review/delete/{review_id}")
@@ -1,54 +1,174 @@
+from sqlalchemy import text
+
+from database import Base, SessionLocal, engine
+from factory.database import DatabaseConfig, SQLiteDatabase
+from factory.search import SQLiteFTSSearch
+from schemas.review import ReviewCreate
+import services.review as review_services
+import services.search as search_services
+
+
 def test_search(client):
-    response = client.get("/search/C")
+    response = client.get("/search/gourmet")
+    assert response.status_code == 200
+    assert response.json()["stalls"][0]["stallName"] == "Bob's Gourmet"
+    assert response.json()["dishes"][0]["dishName"] == "Gourmet Burger"
+
+
+def test_search_prefix(client):
+    response = client.get("/search/ali")
+    assert response.status_code == 200
+    assert response.json()["hawkers"][0]["user"]["name"] == "Alice Hawker"
+    assert response.json()["stalls"][0]["stallName"] == "Alice's Delights"
+
+
+def test_search_cuisine(client):
+    response = client.get("/search/korean")
+    assert response.status_code == 200
+    assert [stall["stallID"] for stall in response.json()["stalls"]] == [8]
+
+
+def test_search_typo(client):
+    response = client.get("/search/Gourmte Burgr")
     assert response.status_code == 200
-    assert response.json()["dishes"][0]["dishName"] == "Cai Fan"
-    assert response.json()["hawkers"][0]["businessName"] == "Chicken Rice Store (NTU)"
+    assert response.json()["dishes"][0]["dishName"] == "Gourmet Burger"
 
 
 def test_search_no_results(client):
     response = client.get("/search/ZZZ")
     assert response.status_code == 200
-    assert response.json() == {"hawkers": [], "dishes": []}
+    assert response.json() == {"hawkers": [], "stalls": [], "dishes": [], "reviews": []}
 
 
 def test_search_new_hawker(client):
     response = client.post(
         "/hawker-controller/add-hawker",
         json={
-            "name": "test",
-            "emailAddress": "test@example.com",
+            "name": "Zebrafish Hawker",
+            "emailAddress": "zebrafish@example.com",
             "password": "test",
             "role": "Hawker",
-            "profilePhoto": "test",
-            "address": "test",
-            "latitude": 1.3521,
-            "longitude": 103.8198,
+            "profilePhoto": "",
             "contactNumber": "12345678",
+            "address": "test",
+            "license": "test",
             "verifyStatus": True,
         },
     )
     assert response.status_code == 200 or response.status_code == 400
     assert (
         response.json() == {"detail": "Email already registered"}
-        or response.json()["emailAddress"] == "test@example.com"
+        or response.json()["user"]["emailAddress"] == "zebrafish@example.com"
     )
-    response = client.get("/search/test")
+    response = client.get("/search/zebrafish")
     assert response.status_code == 200
-    assert response.json()["hawkers"][0]["emailAddress"] == "test@example.com"
+    assert response.json()["hawkers"][0]["user"]["emailAddress"] == "zebrafish@example.com"
 
 
 def test_search_new_dish(client):
     response = client.post(
-        "/stall-controller/add-dish",
-        json={
-            "stallID": 1,
-            "dishName": "test",
-            "price": 1.0,
-            "photo": "test",
-        },
+        "/stall/7/add-dish",
+        json={"stallID": 7, "dishName": "Durian Pengat", "price": 4.5},
+    )
+    assert response.status_code == 200
+    response = client.get("/search/durian")
+    assert response.status_code == 200
+    dish = response.json()["dishes"][0]
+    assert dish["dishName"] == "Durian Pengat"
+
+    response = client.delete(f"/dish/delete/{dish['dishID']}")
+    assert response.status_code == 200
+    response = client.get("/search/durian")
+    assert response.json()["dishes"] == []
+
+
+def test_search_new_review(client):
+    with SessionLocal() as db:
+        review = review_services.create_review(
+            db,
+            ReviewCreate(
+                reviewText="Wonderfully smoky wok hei", rating=5, consumerID=13, stallID=7
+            ),
+        )
+        review_id = review.reviewID
+
+    response = client.get("/search/smoky")
+    assert response.status_code == 200
+    assert [review["reviewID"] for review in response.json()["reviews"]] == [review_id]
+
+    response = client.delete(f"/review/delete/{review_id}")
+    assert response.status_code == 200
+    response = client.get("/search/smoky")
+    assert response.json()["reviews"] == []
+
+
+def test_database_search():
+    search = SQLiteFTSSearch()
+    search.setup(engine)
+    search.setup(engine)  # idempotent
+
+    with SessionLocal() as db:
+        results = search.search(db, ["gourmet"], 10)
+        assert results["stalls"] == [8]
+        assert results["hawkers"] == []
+        assert search.search(db, ["ali", "hawk"], 10)["hawkers"] == [14]
+        assert search.search(db, ["korean"], 10)["stalls"] == [8]
+
+
+def test_database_search_triggers(client):
+    search = SQLiteFTSSearch()
+    search.setup(engine)
+
+    response = client.post(
+        "/stall/7/add-dish",
+        json={"stallID": 7, "dishName": "Chendol Supreme", "price": 3.0},
     )
     assert response.status_code == 200
-    assert response.json()["dishName"] == "test"
-    response = client.get("/search/test")
+    dish_id = client.get("/search/chendol").json()["dishes"][0]["dishID"]
+
+    with SessionLocal() as db:
+        assert search.search(db, ["chendol"], 10)["dishes"] == [dish_id]
+
+    response = client.put(
+        f"/dish/update/{dish_id}", json={"dishID": dish_id, "dishName": "Ice Kachang"}
+    )
+    assert response.status_code == 200
+    with SessionLocal() as db:
+        assert search.search(db, ["chendol"], 10)["dishes"] == []
+        assert search.search(db, ["kachang"], 10)["dishes"] == [dish_id]
+
+    response = client.delete(f"/dish/delete/{dish_id}")
     assert response.status_code == 200
-    assert response.json()["dishes"][0]["dishName"] == "test"
+    with SessionLocal() as db:
+        assert search.search(db, ["kachang"], 10)["dishes"] == []
+
+
+def test_database_search_setup_on_primary(tmp_path, monkeypatch):
+    database = SQLiteDatabase(
+        DatabaseConfig(
+            url=f"sqlite:///{tmp_path / 'primary.db'}",
+            replicaUrls=(f"sqlite:///{tmp_path / 'replica.db'}",),
+        )
+    )
+    database.connect()
+    for bind in (database.engine, database.replicaEngines[0]):
+        Base.metadata.create_all(bind=bind)
+    monkeypatch.setattr(search_services, "database_search", SQLiteFTSSearch())
+
+    # Without a request, the session's reads go to the replica
+    with database.SessionLocal() as db:
+        search_services.setup_search(db)
+
+    def triggers(bind):
+        with bind.connect() as connection:
+            return set(
+                connection.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+                ).scalars()
+            )
+
+    assert {"stalls_fts_ai", "stalls_fts_au", "dishes_fts_ad"} <= triggers(database.engine)
+    assert triggers(database.replicaEngines[0]) == set()
+
+    database.engine.dispose()
+    database.replicaEngines[0].dispose()
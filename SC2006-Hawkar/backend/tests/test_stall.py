@@ -1,3 +1,15 @@
+import io
+from datetime import datetime
+
+from PIL import Image
+
+from database import SessionLocal
+from models.stall import Stall
+import services.etag as etag_services
+import services.responseCache as cache_services
+from services.imageVariants import process_image, split_object_url, variant_urls
+
+
 def test_get_all_stalls(client):
     response = client.get("/stalls/")
     assert response.status_code == 200
@@ -65,3 +77,364 @@ def test_update_stall(client):
 #     assert response.json() == {
 #         "detail": "Stall deleted successfully"
 #     } or response.json() == {"detail": "Invalid stallID"}
+
+
+def test_stall_list_columns(client):
+    response = client.get("/stall/7")
+    assert response.status_code == 200
+    assert response.json()["cuisineType"] == ["Chinese", "Indian"]
+    assert len(response.json()["images"]) == 5
+
+
+def test_add_stall_without_images(client):
+    response = client.post(
+        "/stall/add",
+        json={
+            "stallName": "List Column Stall",
+            "hawkerID": 14,
+            "hawkerCenterID": 1,
+            "cuisineType": ["Thai", "Malay"],
+        },
+    )
+    assert response.status_code == 200
+
+    stalls = client.get("/stall/hawkerid/14").json()
+    stall = next(s for s in stalls if s["stallName"] == "List Column Stall")
+    assert stall["cuisineType"] == ["Thai", "Malay"]
+    assert stall["images"] == []
+
+
+def test_filter_stalls_by_cuisine_type(client):
+    response = client.get("/stalls", params={"cuisineType": ["Korean", "Thai"]})
+    assert response.status_code == 200
+    stalls = response.json()
+    assert 8 in [stall["stallID"] for stall in stalls]
+    assert 7 not in [stall["stallID"] for stall in stalls]
+    for stall in stalls:
+        assert {"Korean", "Thai"} & set(stall["cuisineType"])
+
+
+def test_filter_stalls_by_hawker_center_and_hygiene(client):
+    response = client.get("/stalls", params={"hawkerCenterID": 2, "hygieneRating": "A"})
+    assert response.status_code == 200
+    assert [stall["stallID"] for stall in response.json()] == [8]
+
+
+def test_filter_stalls_by_opening_hours_and_wait_time(client):
+    open_ids = [s["stallID"] for s in client.get("/stalls?openAt=10:00").json()]
+    assert {7, 8} <= set(open_ids)
+
+    closed_ids = [s["stallID"] for s in client.get("/stalls?openAt=22:30").json()]
+    assert not {7, 8} & set(closed_ids)
+
+    assert client.get("/stalls?maxWaitTime=10&priceRange=$5 - $8").json() == []
+
+
+def test_sort_stalls(client):
+    response = client.get("/stalls", params={"sortBy": "stallName", "order": "desc"})
+    assert response.status_code == 200
+    names = [stall["stallName"] for stall in response.json()]
+    assert names == sorted(names, reverse=True)
+
+
+def test_stalls_cursor_pagination(client):
+    params = {"sortBy": "stallName", "order": "desc"}
+    expected = [stall["stallID"] for stall in client.get("/stalls", params=params).json()]
+
+    stall_ids, cursor = [], None
+    while True:
+        response = client.get("/stalls/page", params={**params, "limit": 1, "cursor": cursor})
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 1
+        stall_ids += [stall["stallID"] for stall in page["items"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert stall_ids == expected
+
+
+def test_stalls_cursor_pagination_null_sort_value(client):
+    with SessionLocal() as db:
+        stall = db.get(Stall, 7)
+        start_time, stall.startTime = stall.startTime, None
+        db.commit()
+    cache_services.invalidate_all()
+
+    try:
+        for order in ("asc", "desc"):
+            params = {"sortBy": "startTime", "order": order}
+            stalls = client.get("/stalls", params=params).json()
+            expected = [stall["stallID"] for stall in stalls]
+            # NULLs sort last in either direction
+            start_times = [stall["startTime"] for stall in stalls]
+            assert start_times[start_times.index(None):] == [None] * start_times.count(None)
+            assert 7 in expected
+
+            stall_ids, cursor = [], None
+            while True:
+                response = client.get(
+                    "/stalls/page", params={**params, "limit": 1, "cursor": cursor}
+                )
+                assert response.status_code == 200
+                page = response.json()
+                stall_ids += [stall["stallID"] for stall in page["items"]]
+                cursor = page["nextCursor"]
+                if cursor is None:
+                    break
+
+            assert stall_ids == expected
+    finally:
+        with SessionLocal() as db:
+            db.get(Stall, 7).startTime = start_time
+            db.commit()
+        cache_services.invalidate_all()
+
+
+def test_stalls_cursor_pagination_invalid_cursor(client):
+    first_page = client.get("/stalls/page", params={"limit": 1}).json()
+    assert first_page["nextCursor"] is not None
+
+    response = client.get(
+        "/stalls/page",
+        params={"limit": 1, "sortBy": "stallName", "cursor": first_page["nextCursor"]},
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+    response = client.get("/stalls/page", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_nearby_hawker_centers(client):
+    # Bedok North Street 3 Blk 538 (hawker center 2)
+    params = {"lat": 1.331781251, "lng": 103.9248442, "radius": 2, "openAt": "10:00"}
+    response = client.get("/hawker-centers/nearby", params=params)
+    assert response.status_code == 200
+    centers = response.json()
+
+    assert centers[0]["hawkerCenterID"] == 2
+    assert centers[0]["distance"] == 0
+    assert [stall["stallID"] for stall in centers[0]["openStalls"]] == [8]
+    assert 3 in [center["hawkerCenterID"] for center in centers]
+
+    distances = [center["distance"] for center in centers]
+    assert distances == sorted(distances)
+    assert all(distance <= 2 for distance in distances)
+
+
+def test_nearby_hawker_centers_matches_full_scan(client):
+    from services.spatialIndex import haversine_km
+
+    lat, lng, radius = 1.3521, 103.8198, 5
+    all_centers = client.get("/hawker-centers", params={"limit": 1000}).json()
+    expected = sorted(
+        (haversine_km(lat, lng, c["latitude"], c["longitude"]), c["hawkerCenterID"])
+        for c in all_centers
+    )
+    expected = [center_id for distance, center_id in expected if distance <= radius][:10]
+
+    params = {"lat": lat, "lng": lng, "radius": radius, "k": 10}
+    centers = client.get("/hawker-centers/nearby", params=params).json()
+    assert [center["hawkerCenterID"] for center in centers] == expected
+
+
+def test_nearby_hawker_centers_closed_stalls(client):
+    params = {"lat": 1.331781251, "lng": 103.9248442, "k": 1, "openAt": "23:00"}
+    centers = client.get("/hawker-centers/nearby", params=params).json()
+    assert len(centers) == 1
+    assert centers[0]["openStalls"] == []
+
+    assert client.get("/hawker-centers/nearby", params={"lat": 91, "lng": 0}).status_code == 422
+
+
+def test_like_count_and_liked_by_me(client):
+    like_count = client.get("/stall/8").json()["likeCount"]
+
+    response = client.post("/stall/13/like/8")
+    assert response.status_code == 200
+    response = client.post("/stall/13/like/8")
+    assert response.status_code == 400
+    assert client.get("/stall/8").json()["likeCount"] == like_count + 1
+
+    response = client.get("/stalls", params={"userID": 13})
+    assert response.status_code == 200
+    liked = {stall["stallID"]: stall["likedByMe"] for stall in response.json()}
+    assert liked[8] is True
+    assert liked[7] is False
+    response = client.get("/stalls/page", params={"userID": 13})
+    assert {stall["stallID"] for stall in response.json()["items"] if stall["likedByMe"]} == {8}
+    assert client.get("/stalls").json()[0]["likedByMe"] is None
+
+    response = client.get("/stall/13/liked/ids", params={"stallID": [7, 8, 999]})
+    assert response.status_code == 200
+    assert response.json() == [8]
+
+    response = client.delete("/stall/13/unlike/8")
+    assert response.status_code == 200
+    assert client.get("/stall/8").json()["likeCount"] == like_count
+    assert client.get("/stall/13/liked/ids", params={"stallID": [7, 8]}).json() == []
+
+
+def test_add_stall_images_upload_validation(client):
+    response = client.post(
+        "/stall/7/images",
+        files=[
+            ("images", ("front.jpg", b"\xff\xd8", "image/jpeg")),
+            ("images", ("notes.txt", b"hello", "text/plain")),
+        ],
+    )
+    assert response.status_code == 415
+    assert response.json() == {"detail": "notes.txt is not an image"}
+
+    response = client.post(
+        "/stall/100/images", files=[("images", ("front.jpg", b"\xff\xd8", "image/jpeg"))]
+    )
+    assert response.status_code == 404
+
+
+def test_presign_stall_image(client):
+    response = client.post("/stall/7/images/presign")
+    assert response.status_code == 200
+    upload = response.json()
+    assert upload["key"].startswith("7_") and upload["key"].endswith("_stall-image")
+    assert upload["url"] == f"http://localhost:9000/stall/{upload['key']}"
+    assert upload["uploadUrl"].startswith(f"http://localhost:9000/stall/{upload['key']}?")
+    assert "X-Amz-Signature=" in upload["uploadUrl"]
+
+    # Another stall's upload cannot be claimed
+    response = client.post("/stall/8/images/confirm", json={"key": upload["key"]})
+    assert response.status_code == 400
+
+    assert client.post("/stall/100/images/presign").status_code == 404
+    response = client.post("/stall/100/images/confirm", json={"key": upload["key"]})
+    assert response.status_code == 404
+
+
+def test_stall_image_variants(client, fake_minio):
+    image = Image.new("RGB", (2000, 1000), "red")
+    data = io.BytesIO()
+    image.save(data, "PNG")
+    with SessionLocal() as db:
+        images = db.get(Stall, 7).images
+
+    try:
+        response = client.post(
+            "/stall/7/images", files=[("images", ("front.png", data.getvalue(), "image/png"))]
+        )
+        assert response.status_code == 200
+        uploaded = response.json()["imageVariants"][-1]
+
+        # A presigned upload's variants are rendered when it is confirmed
+        key = client.post("/stall/7/images/presign").json()["key"]
+        data = io.BytesIO()
+        image.resize((1000, 2000)).save(data, "JPEG")
+        data.seek(0)
+        fake_minio.put_object("stall", key, data, -1, "image/jpeg")
+        response = client.post("/stall/7/images/confirm", json={"key": key})
+        assert response.status_code == 200
+        confirmed = response.json()["imageVariants"][-1]
+
+        for variants, sizes in (
+            (uploaded, {"thumbnail": (320, 160), "medium": (1024, 512)}),
+            (confirmed, {"thumbnail": (160, 320), "medium": (512, 1024)}),
+        ):
+            for variant, url in variants.items():
+                stored = Image.open(io.BytesIO(fake_minio.objects[split_object_url(url)]))
+                assert (stored.format, stored.size) == ("WEBP", sizes[variant])
+    finally:
+        with SessionLocal() as db:
+            db.get(Stall, 7).images = images
+            db.commit()
+        cache_services.invalidate_all()
+
+
+def test_process_image():
+    image = Image.new("RGB", (2000, 1000), "red")
+    data = io.BytesIO()
+    image.save(data, "PNG")
+    data.seek(0)
+
+    content_type, variants = process_image(data)
+    assert content_type == "image/png"
+    sizes = {name: Image.open(io.BytesIO(variant)).size for name, variant in variants}
+    assert sizes == {"thumbnail": (320, 160), "medium": (1024, 512)}
+
+    assert process_image(io.BytesIO(b"not an image")) == (None, [])
+    assert variant_urls("https://lh3.googleusercontent.com/photo.jpg") is None
+
+
+def test_stall_etag(client):
+    response = client.get("/stall/7")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "Last-Modified" in response.headers
+
+    response = client.get("/stall/7", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    stall = client.get("/stall/7").json()
+    client.put(
+        "/stall/update/7",
+        json={"stallID": 7, "estimatedWaitTime": stall["estimatedWaitTime"] + 1},
+    )
+    response = client.get("/stall/7", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    client.put(
+        "/stall/update/7", json={"stallID": 7, "estimatedWaitTime": stall["estimatedWaitTime"]}
+    )
+
+
+def test_stall_etag_changes_with_hawker(client):
+    hawker = client.get("/hawker/14").json()
+    user = hawker.pop("user")
+    hawker.update(
+        {key: user[key] for key in ("name", "emailAddress", "profilePhoto", "contactNumber")}
+    )
+    etag = client.get("/stall/7").headers["ETag"]
+
+    response = client.put("/hawker/update", json={**hawker, "address": "101 Hawker Avenue"})
+    assert response.status_code == 200
+    response = client.get("/stall/7", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["hawker"]["address"] == "101 Hawker Avenue"
+
+    client.put("/hawker/update", json=hawker)
+
+
+def test_stalls_etag(client):
+    etag = client.get("/stalls", params={"sortBy": "averageRating"}).headers["ETag"]
+    response = client.get(
+        "/stalls", params={"sortBy": "averageRating"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    # Each query string has its own ETag
+    response = client.get("/stalls", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_stalls_etag_open_now(client, monkeypatch):
+    class Clock(datetime):
+        now_value = datetime(2024, 1, 1, 10, 0, 15)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_value
+
+    monkeypatch.setattr(etag_services, "datetime", Clock)
+    etag = client.get("/stalls/page", params={"openNow": True}).headers["ETag"]
+    response = client.get(
+        "/stalls/page", params={"openNow": True}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    # The stalls open now change with the time, unlike those open at a given time
+    Clock.now_value = datetime(2024, 1, 1, 10, 1)
+    response = client.get(
+        "/stalls/page", params={"openNow": True}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,201 @@
+import base64
+import io
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from services.imageVariants import VARIANTS, variant_key
+import services.objectStorage as objectStorage_services
+from services.objectStorage import REQUIRED_BUCKETS, ObjectStorage
+
+
+class FlakyBuckets:
+    """MinIO bucket calls failing until the given number of attempts."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.buckets = set()
+
+    def bucket_exists(self, bucket):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("MinIO is starting")
+        return bucket in self.buckets
+
+    def make_bucket(self, bucket):
+        self.buckets.add(bucket)
+
+
+def test_ensure_buckets_retries(monkeypatch):
+    storage = ObjectStorage()
+    client = FlakyBuckets(failures=2)
+    monkeypatch.setattr(storage, "client", client)
+    monkeypatch.setattr(storage, "ready", False)
+
+    assert storage.ensure_buckets(retries=2, delay=0) is False
+    assert storage.ensure_buckets(retries=2, delay=0) is True
+    assert client.buckets == set(REQUIRED_BUCKETS)
+
+    # Ready is cached, so MinIO is not asked again
+    client.failures = 1
+    assert storage.ensure_buckets(retries=1, delay=0) is True
+    storage._require_buckets()
+
+
+class SlowBuckets(FlakyBuckets):
+    """MinIO bucket calls blocking until released."""
+
+    def __init__(self):
+        super().__init__(failures=0)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def bucket_exists(self, bucket):
+        self.started.set()
+        self.release.wait(5)
+        return super().bucket_exists(bucket)
+
+
+def test_require_buckets_while_provisioning(monkeypatch):
+    storage = ObjectStorage()
+    client = SlowBuckets()
+    monkeypatch.setattr(storage, "client", client)
+    monkeypatch.setattr(storage, "ready", False)
+
+    thread = threading.Thread(target=storage.ensure_buckets, kwargs={"retries": 1})
+    thread.start()
+    assert client.started.wait(5)
+    # Uploads don't wait behind the startup requests to MinIO
+    with pytest.raises(HTTPException) as error:
+        storage._require_buckets()
+    assert error.value.status_code == 503
+
+    client.release.set()
+    thread.join(5)
+    assert storage.ready is True
+    storage._require_buckets()
+
+
+def png(color):
+    data = io.BytesIO()
+    Image.new("RGB", (40, 20), color).save(data, "PNG")
+    return data.getvalue()
+
+
+def encode(data):
+    return base64.b64encode(data).decode()
+
+
+def test_upload_stall_images(fake_minio):
+    storage = ObjectStorage()
+    red, blue = png("red"), png("blue")
+
+    images = [encode(red), "http://example.com/kept.jpg", encode(blue), encode(red)]
+    urls = storage.upload_stall_images(7, images, background=False)
+
+    assert urls[1] == "http://example.com/kept.jpg"
+    assert urls[0] == urls[3] != urls[2]
+    # The repeated image is uploaded once
+    assert sorted(fake_minio.original_puts) == sorted(
+        ("stall", url.rsplit("/", 1)[1]) for url in (urls[0], urls[2])
+    )
+    assert fake_minio.objects[("stall", urls[2].rsplit("/", 1)[1])] == blue
+
+
+def test_upload_stall_images_failure(fake_minio):
+    storage = ObjectStorage()
+    failing = png("blue")
+    fake_minio.failing.add(failing)
+
+    images = [encode(png("red")), encode(failing), encode(png("green"))]
+    with pytest.raises(ConnectionError):
+        storage.upload_stall_images(7, images, background=False)
+    assert failing not in fake_minio.objects.values()
+
+    with pytest.raises(HTTPException) as error:
+        storage.upload_stall_images(7, [encode(b"not an image")], background=False)
+    assert error.value.status_code == 415
+
+
+def test_upload_deduplicated(fake_minio):
+    storage = ObjectStorage()
+    image = png("red")
+
+    url = storage.upload_stall_image_stream(7, io.BytesIO(image))
+    key = ("stall", url.rsplit("/", 1)[1])
+    assert fake_minio.original_puts == [key]
+    assert fake_minio.objects[key] == image
+
+    # Known to exist, so neither uploaded nor looked up again
+    assert storage.upload_stall_image_stream(7, io.BytesIO(image)) == url
+    assert fake_minio.original_puts == [key]
+    assert fake_minio.stats == [key]
+
+
+def test_upload_deduplicated_after_eviction(fake_minio, monkeypatch):
+    storage = ObjectStorage()
+    monkeypatch.setattr(objectStorage_services, "KNOWN_OBJECTS_CACHE_SIZE", 1)
+
+    url = storage.upload_dish_photo_stream(7, "Laksa", io.BytesIO(png("orange")))
+    storage.upload_dish_photo_stream(7, "Mee Siam", io.BytesIO(png("red")))
+    key = ("dish", url.rsplit("/", 1)[1])
+    assert key not in storage.known_objects
+
+    # Evicted, so MinIO is asked whether the object exists
+    fake_minio.stats.clear()
+    assert storage.upload_dish_photo_stream(7, "Laksa", io.BytesIO(png("orange"))) == url
+    assert fake_minio.stats == [key]
+    assert len(fake_minio.original_puts) == 2
+    assert key in storage.known_objects
+
+
+def test_upload_after_sweep(fake_minio, monkeypatch):
+    class Clock(datetime):
+        now_value = datetime.now().astimezone()
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_value
+
+    monkeypatch.setattr(objectStorage_services, "datetime", Clock)
+    storage = ObjectStorage()
+    image = png("red")
+    url = storage.upload_stall_image_stream(7, io.BytesIO(image))
+    key = ("stall", url.rsplit("/", 1)[1])
+
+    # Once old enough to be swept, the object is deleted by another worker's
+    # sweeper, which can't clear this worker's cache
+    Clock.now_value += timedelta(seconds=objectStorage_services.SWEEP_MIN_AGE)
+    del fake_minio.objects[key]
+    assert storage.upload_stall_image_stream(7, io.BytesIO(image)) == url
+    assert fake_minio.original_puts == [key, key]
+    assert fake_minio.objects[key] == image
+
+    # An existing object too old to be reused is uploaded again, renewing its age
+    Clock.now_value += objectStorage_services.DEDUPE_MAX_AGE
+    assert storage.upload_stall_image_stream(7, io.BytesIO(image)) == url
+    assert fake_minio.original_puts == [key, key, key]
+    assert fake_minio.last_modified[key] == Clock.now_value
+
+
+def test_backfill_variants(fake_minio):
+    storage = ObjectStorage()
+    seeded = ("stall", "7_seeded_stall-image")
+    fake_minio.put_object(*seeded, io.BytesIO(png("red")), -1, "image/png")
+    fake_minio.put_object("dish", "not-an-image", io.BytesIO(b"text"), -1, "text/plain")
+    # Uploaded with its variants, so not rendered again
+    storage.upload_dish_photo_stream(7, "Laksa", io.BytesIO(png("orange")))
+    fake_minio.puts.clear()
+
+    report = storage.backfill_variants()
+    assert report == {"profile-photo": 0, "stall": 1, "dish": 0}
+    assert sorted(fake_minio.puts) == sorted(
+        ("stall", variant_key(seeded[1], variant)) for variant in VARIANTS
+    )
+
+    fake_minio.puts.clear()
+    assert storage.backfill_variants()["stall"] == 0
+    assert fake_minio.puts == []
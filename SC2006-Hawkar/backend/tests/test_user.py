@@ -4,6 +4,18 @@ def test_get_all_users(client):
     assert response.json() != []
 
 
+def test_get_users_page(client):
+    expected = [user["userID"] for user in client.get("/users").json()]
+
+    first_page = client.get("/users/page", params={"limit": 2}).json()
+    assert [user["userID"] for user in first_page["items"]] == expected[:2]
+
+    second_page = client.get(
+        "/users/page", params={"limit": 2, "cursor": first_page["nextCursor"]}
+    ).json()
+    assert [user["userID"] for user in second_page["items"]] == expected[2:4]
+
+
 def test_get_user_by_id(client):
     response = client.get("/user/1")
     assert response.status_code == 200
@@ -20,3 +32,28 @@ def test_get_user_by_email(client):
     response = client.get("/user/email/admin1@gmail.com")
     assert response.status_code == 200
     assert response.json()["emailAddress"] == "admin1@gmail.com"
+
+
+def test_update_profile_photo_not_image(client):
+    response = client.put(
+        "/user/1/profile-photo", files={"photo": ("notes.txt", b"hello", "text/plain")}
+    )
+    assert response.status_code == 415
+    assert response.json() == {"detail": "notes.txt is not an image"}
+
+
+def test_update_profile_photo_user_not_found(client):
+    response = client.put(
+        "/user/100/profile-photo", files={"photo": ("photo.jpg", b"\xff\xd8", "image/jpeg")}
+    )
+    assert response.status_code == 404
+
+
+def test_presign_profile_photo(client):
+    response = client.post("/user/13/profile-photo/presign")
+    assert response.status_code == 200
+    assert response.json()["key"].endswith("_profile-photo")
+
+    assert client.post("/user/100/profile-photo/presign").status_code == 404
+    response = client.put("/user/100/profile-photo/confirm", json={"key": "photo"})
+    assert response.status_code == 404